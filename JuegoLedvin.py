@@ -2,7 +2,6 @@
 
 import pygame
 import pygame.freetype
-import random
 import math
 import time
 import json
@@ -13,8 +12,13 @@ from datetime import datetime
 from powerups import PowerUp, ShieldPowerUp, DoubleScorePowerUp
 from score_manager import ScoreManager
 from keyboard_layout_manager import KeyboardLayoutManager
-from render_utils import render_text_gradient
+from render_utils import render_text_gradient, build_ring_frames, get_text_gradient_surface
+from font_registry import get_font
+from starfield import Starfield
+from particles import ParticleSystem
+from texture_backend import BackendTexturas
 from game_session import GameSession
+from save_service import SaveService
 
 # ========================
 # CONFIGURACIÓN INICIAL
@@ -24,10 +28,50 @@ pygame.freetype.init()
 pygame.mixer.init()
 clock = pygame.time.Clock()
 
+# Resolución lógica opcional ("resolucion_logica": [1280, 720] en config.json). Si está definida,
+# el juego se dibuja en una superficie fuera de pantalla de ese tamaño que se escala una sola
+# vez por frame a la ventana; así el coste de relleno no depende de la resolución del panel.
+# Backend de dibujo ("backend" en config.json): "surface" (por defecto) o "sdl2" (Renderer/Texture);
+# con "renderer_software": true el backend sdl2 usa el renderer por software de SDL.
+_config_inicial = {}
+try:
+    with open("config.json") as f: _config_inicial = json.load(f)
+except Exception: pass
+RESOLUCION_LOGICA = _config_inicial.get("resolucion_logica")
+BACKEND = _config_inicial.get("backend", "surface")
+
 info = pygame.display.Info()
-ANCHO, ALTO = info.current_w, info.current_h
-pantalla = pygame.display.set_mode((ANCHO, ALTO))
-pygame.display.set_caption("SpeedType Animated")
+ANCHO_VENTANA, ALTO_VENTANA = info.current_w, info.current_h
+if RESOLUCION_LOGICA: ANCHO, ALTO = int(RESOLUCION_LOGICA[0]), int(RESOLUCION_LOGICA[1])
+else: ANCHO, ALTO = ANCHO_VENTANA, ALTO_VENTANA
+
+backend_texturas = None
+if BACKEND == "sdl2":
+    try: backend_texturas = BackendTexturas("SpeedType Animated", (ANCHO_VENTANA, ALTO_VENTANA), (ANCHO, ALTO), _config_inicial.get("renderer_software", False))
+    except pygame.error as e: print(f"No se pudo iniciar el backend sdl2, se usa el de superficies: {e}")
+
+if backend_texturas:
+    # La ventana de pygame.display sólo hace falta para convert()/convert_alpha(): queda oculta
+    ventana = pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    pantalla = pygame.Surface((ANCHO, ALTO)).convert()
+    area_presentacion = pantalla.get_rect()
+elif RESOLUCION_LOGICA:
+    ventana = pygame.display.set_mode((ANCHO_VENTANA, ALTO_VENTANA))
+    pygame.display.set_caption("SpeedType Animated")
+    pantalla = pygame.Surface((ANCHO, ALTO)).convert()
+    # Zona de la ventana donde se muestra el juego escalado, conservando la proporción (bandas negras)
+    _escala = min(ANCHO_VENTANA / ANCHO, ALTO_VENTANA / ALTO)
+    area_presentacion = pygame.Rect(0, 0, round(ANCHO * _escala), round(ALTO * _escala))
+    area_presentacion.center = (ANCHO_VENTANA // 2, ALTO_VENTANA // 2)
+    ventana.fill((0, 0, 0))
+    _destino_escalado = ventana.subsurface(area_presentacion)
+else:
+    ventana = pygame.display.set_mode((ANCHO_VENTANA, ALTO_VENTANA))
+    pygame.display.set_caption("SpeedType Animated")
+    pantalla = ventana
+    area_presentacion = ventana.get_rect()
+# Con el backend sdl2 hay dos ventanas, así que SDL no envía QUIT al cerrar la visible
+EVENTOS_SALIDA = (pygame.QUIT, pygame.WINDOWCLOSE) if backend_texturas else (pygame.QUIT,)
 
 # ========================
 # COLORES Y FUENTES
@@ -60,14 +104,11 @@ try:
     fondo_img = pygame.transform.scale(fondo_img, (ANCHO, ALTO))
 except: fondo_img = pygame.Surface((ANCHO, ALTO)); fondo_img.fill(NEGRO)
 
-try:
-    ruta_fondo_pausa = os.path.join(os.path.dirname(__file__), "Fondo2.png")
-    fondo_pausa_img = pygame.image.load(ruta_fondo_pausa).convert()
-    fondo_pausa_img = pygame.transform.scale(fondo_pausa_img, (ANCHO, ALTO))
-except Exception as e: print(f"Error al cargar el fondo de pausa: {e}"); fondo_pausa_img = None
-
-estrellas = [[random.randint(0, ANCHO), random.randint(0, ALTO), random.uniform(0.5, 1.5)] for _ in range(100)]
-particulas = []
+# Capas de estrellas (de fondo a frente); se pueden añadir más para un parallax más denso
+CAPAS_ESTRELLAS = [{"cantidad": 100, "vel_min": 0.5, "vel_max": 1.5, "radio": 2, "color": BLANCO}]
+campo_estrellas = Starfield(ANCHO, ALTO, CAPAS_ESTRELLAS)
+MAX_PARTICULAS = 4096 # Tope del pool de partículas; las ráfagas que no caben se descartan
+sistema_particulas = ParticleSystem(MAX_PARTICULAS)
 music_loaded = False
 try:
     acierto_sound = pygame.mixer.Sound(os.path.join(os.path.dirname(__file__), "acierto.wav"))
@@ -107,32 +148,52 @@ except Exception as e:
     spawner_icons["avion"] = pygame.Surface(spawner_icon_size, pygame.SRCALPHA)
     spawner_icons["icono_lateral"] = pygame.Surface(spawner_icon_size, pygame.SRCALPHA)
 
+if backend_texturas:
+    backend_texturas.precargar([fondo_img, *powerup_icons.values(), *spawner_icons.values()])
+
 # ========================
 # FUNCIONES DE UI Y UTILIDADES
 # ========================
+def presentar(rects=None):
+    """
+    Muestra el frame dibujado en 'pantalla'. Con 'rects' sólo actualiza esas zonas.
+    Con resolución lógica se escala el frame completo a la ventana y los rects se ignoran.
+    """
+    if backend_texturas: backend_texturas.presentar_superficie(pantalla, rects)
+    elif pantalla is not ventana:
+        pygame.transform.scale(pantalla, area_presentacion.size, _destino_escalado)
+        pygame.display.flip()
+    elif rects is None: pygame.display.flip()
+    else: pygame.display.update(rects)
+
+def a_coordenadas_logicas(pos):
+    """Convierte una posición del ratón en la ventana a coordenadas de 'pantalla'."""
+    if pantalla is ventana or backend_texturas: return pos # El Renderer de sdl2 ya las escala
+    return ((pos[0] - area_presentacion.x) * ANCHO // area_presentacion.width,
+            (pos[1] - area_presentacion.y) * ALTO // area_presentacion.height)
+
+def capturar_frame():
+    """Retorna una copia del último frame mostrado (con el backend sdl2 incluye las texturas)."""
+    if backend_texturas: return backend_texturas.capturar()
+    return pantalla.copy()
+
 def dibujar_estrellas(velocidad=1):
-    for estrella in estrellas:
-        estrella[1] += estrella[2] * velocidad
-        if estrella[1] > ALTO:
-            estrella[0] = random.randint(0, ANCHO); estrella[1] = 0
-        pygame.draw.circle(pantalla, BLANCO, (int(estrella[0]), int(estrella[1])), 2)
-
-def crear_particulas(x, y, color):
-    for _ in range(10):
-        particulas.append({'x': x, 'y': y, 'vx': random.uniform(-2, 2), 'vy': random.uniform(-2, 2), 'radius': random.randint(2, 5), 'color': color, 'life': 30})
-
-def actualizar_y_dibujar_particulas():
-    global particulas
-    particulas_vivas = []
-    for p in particulas:
-        p['x'] += p['vx']; p['y'] += p['vy']; p['radius'] -= 0.1; p['life'] -= 1
-        if p['life'] > 0 and p['radius'] > 0:
-            pygame.draw.circle(pantalla, p['color'], (int(p['x']), int(p['y'])), int(p['radius']))
-            particulas_vivas.append(p)
-    particulas = particulas_vivas
+    campo_estrellas.actualizar(velocidad)
+    return campo_estrellas.dibujar(pantalla)
+
+def crear_particulas(x, y, color, emisor="acierto"):
+    sistema_particulas.emitir_rafaga(emisor, x, y, color)
+
+def actualizar_y_dibujar_particulas(destino=None):
+    """Dibuja las partículas sobre 'destino' (la pantalla o un renderer con blits) y retorna los rects."""
+    sistema_particulas.actualizar()
+    return sistema_particulas.dibujar(pantalla if destino is None else destino)
 
 def guardar_config(fuente, tam, color):
-    with open("config.json", "w") as f: json.dump({"fuente": fuente, "tam": tam, "color": list(color)}, f)
+    # Conserva las demás opciones del archivo (ej. "dirty_rects") que no se editan desde el menú
+    config = cargar_config() or {}
+    config.update({"fuente": fuente, "tam": tam, "color": list(color)})
+    with open("config.json", "w") as f: json.dump(config, f)
 
 def cargar_config():
     if os.path.exists("config.json"):
@@ -141,33 +202,17 @@ def cargar_config():
         except Exception: return None
     return None
 
+servicio_guardado = SaveService("partida_guardada.json") # Partidas en memoria, escritas en segundo plano
+
 def guardar_partida(estado_juego, game_mode, timestamp_a_actualizar=None):
-    saved_games = cargar_partida()
-    if timestamp_a_actualizar:
-        for game in saved_games:
-            if game.get("timestamp") == timestamp_a_actualizar:
-                game.update({"state": estado_juego, "timestamp": datetime.now().isoformat()}); break
-        else: timestamp_a_actualizar = None
-    if not timestamp_a_actualizar:
-        saved_games.append({"timestamp": datetime.now().isoformat(), "mode": game_mode, "state": estado_juego})
-    saved_games.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-    with open("partida_guardada.json", "w") as f: json.dump(saved_games[:5], f, indent=4)
+    """Guarda la partida en segundo plano (ver SaveService). Retorna un Future."""
+    return servicio_guardado.guardar(estado_juego, game_mode, timestamp_a_actualizar)
 
 def cargar_partida():
-    if os.path.exists("partida_guardada.json"):
-        try:
-            with open("partida_guardada.json", "r") as f:
-                content = f.read()
-                data = json.loads(content) if content else []
-                if isinstance(data, list): return [s for s in data if isinstance(s, dict) and 'timestamp' in s]
-                elif isinstance(data, dict): return [data] if 'timestamp' in data else []
-                return []
-        except Exception: return []
-    return []
+    return servicio_guardado.partidas()
 
 def eliminar_partida_guardada(timestamp_a_eliminar):
-    saved_games = [g for g in cargar_partida() if g.get("timestamp") != timestamp_a_eliminar]
-    with open("partida_guardada.json", "w") as f: json.dump(saved_games, f, indent=4)
+    return servicio_guardado.eliminar(timestamp_a_eliminar)
 
 def cargar_highscores():
     if not os.path.exists("highscores.json"): return []
@@ -192,22 +237,103 @@ class Button:
         self.is_hovered = False; self.use_logo_style = False
         self.logo_style_gradient_colors = [COLOR_GRADIENTE_TOP, COLOR_GRADIENTE_BOTTOM]
         self.logo_style_border_color, self.logo_style_border_thickness = COLOR_CONTORNO, 2
+        self._caras = {} # Superficies del botón ya compuestas (normal / hover)
     def set_logo_style(self, enable=True, **kwargs):
         self.use_logo_style = enable
         self.logo_style_gradient_colors=kwargs.get("gradient_colors", self.logo_style_gradient_colors)
+    def _cara(self):
+        """Compone una sola vez el fondo, el borde y el texto del botón en una superficie."""
+        clave = (self.is_hovered, self.text, self.use_logo_style, tuple(map(tuple, self.logo_style_gradient_colors)))
+        cara = self._caras.get(clave)
+        if cara is None:
+            if self.use_logo_style:
+                text_surface = get_text_gradient_surface(self.font, self.text, self.logo_style_gradient_colors, self.logo_style_border_color, self.logo_style_border_thickness)
+            else:
+                text_surface, _ = self.font.render(self.text, BLANCO)
+            text_rect = text_surface.get_rect(center=self.rect.center)
+            area = self.rect.union(text_rect) # El texto puede sobresalir del botón
+            surf = pygame.Surface(area.size, pygame.SRCALPHA)
+            local = self.rect.move(-area.x, -area.y)
+            current_color = self.hover_color if self.is_hovered else self.color
+            pygame.draw.rect(surf, current_color, local, border_radius=self.border_radius)
+            pygame.draw.rect(surf, self.border_color, local, self.border_thickness, border_radius=self.border_radius)
+            surf.blit(text_surface, text_rect.move(-area.x, -area.y))
+            cara = self._caras[clave] = (surf, area.topleft)
+        return cara
     def draw(self, surface):
-        current_color = self.hover_color if self.is_hovered else self.color
-        pygame.draw.rect(surface, current_color, self.rect, border_radius=self.border_radius)
-        pygame.draw.rect(surface, self.border_color, self.rect, self.border_thickness, border_radius=self.border_radius)
-        if self.use_logo_style:
-            render_text_gradient(self.font, self.text, self.rect, surface, self.logo_style_gradient_colors, self.logo_style_border_color, self.logo_style_border_thickness)
-        else:
-            text_surface, text_rect = self.font.render(self.text, BLANCO); text_rect.center = self.rect.center; surface.blit(text_surface, text_rect)
+        surf, pos = self._cara()
+        return surface.blit(surf, pos)
     def handle_event(self, event):
-        if event.type == pygame.MOUSEMOTION: self.is_hovered = self.rect.collidepoint(event.pos)
-        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and self.is_hovered: return True
+        if event.type == pygame.MOUSEMOTION: self.is_hovered = self.rect.collidepoint(a_coordenadas_logicas(event.pos))
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.is_hovered = self.rect.collidepoint(a_coordenadas_logicas(event.pos))
+            if self.is_hovered: return True
         return False
 
+# ========================
+# MODO DE BAJO CONSUMO
+# ========================
+BAJO_CONSUMO = False # Se activa con "bajo_consumo": true en config.json
+FPS_ANIMACION_BAJO_CONSUMO = 0 # Ticks de animación de las estrellas en bajo consumo (0 = estrellas quietas)
+
+class RitmoPantalla:
+    """
+    Decide cuándo redibujar una pantalla de menú.
+    En modo normal se redibuja a 60 FPS como siempre. En bajo consumo se bloquea en
+    pygame.event.wait hasta que llega una entrada o toca un tick de animación, y sólo se
+    redibuja si algo cambió (una tecla, un clic o el hover de algún botón).
+    """
+    def __init__(self, botones=()):
+        self.bajo_consumo = BAJO_CONSUMO
+        self.botones = list(botones)
+        self.intervalo_ms = 1000 // FPS_ANIMACION_BAJO_CONSUMO if FPS_ANIMACION_BAJO_CONSUMO > 0 else None
+        self._proximo_tick = 0
+        self._pendiente = True
+        self._hover = None
+        self._capa = None
+
+    def eventos(self):
+        """Retorna los eventos pendientes; en bajo consumo espera sin gastar CPU hasta que haya alguno."""
+        if not self.bajo_consumo:
+            clock.tick(60)
+            return pygame.event.get()
+        if self.intervalo_ms is None:
+            primero = pygame.event.wait()
+        else:
+            espera = self._proximo_tick - pygame.time.get_ticks()
+            primero = pygame.event.wait(espera) if espera > 0 else pygame.event.poll()
+            if pygame.time.get_ticks() >= self._proximo_tick:
+                self._pendiente = True; self._proximo_tick = pygame.time.get_ticks() + self.intervalo_ms
+        eventos = [] if primero.type == pygame.NOEVENT else [primero]
+        eventos.extend(pygame.event.get())
+        if any(e.type != pygame.MOUSEMOTION for e in eventos): self._pendiente = True
+        return eventos
+
+    def debe_redibujar(self):
+        """Llamar después de procesar los eventos (para que el hover de los botones esté al día)."""
+        if not self.bajo_consumo: return True
+        hover = tuple(b.is_hovered for b in self.botones)
+        if hover != self._hover: self._hover = hover; self._pendiente = True
+        pendiente = self._pendiente; self._pendiente = False
+        return pendiente
+
+    def invalidar(self):
+        """Descarta la capa estática y fuerza un redibujado (ej. cambió el contenido fijo)."""
+        self._capa = None; self._pendiente = True
+
+    def capa_estatica(self, dibujar):
+        """
+        Dibuja la capa estática (fondo, estrellas, título) llamando a 'dibujar()'.
+        Si las estrellas no se animan, se compone una sola vez y después es un único blit.
+        """
+        if self.bajo_consumo and self.intervalo_ms is None:
+            if self._capa is None:
+                dibujar(); self._capa = pantalla.copy()
+            else:
+                pantalla.blit(self._capa, (0, 0))
+        else:
+            dibujar()
+
 def pantalla_intro():
     start_time = time.time()
     if music_loaded: pygame.mixer.music.play(-1, 0.0)
@@ -217,7 +343,7 @@ def pantalla_intro():
     while True:
         elapsed_time = time.time() - start_time
         for evento in pygame.event.get():
-            if evento.type == pygame.QUIT: pygame.quit(); sys.exit()
+            if evento.type in EVENTOS_SALIDA: pygame.quit(); sys.exit()
             if evento.type == pygame.KEYDOWN and (evento.key == pygame.K_RETURN or evento.key == pygame.K_SPACE): return
         pantalla.blit(fondo_img, (0, 0))
         if elapsed_time > 4.5: return
@@ -225,24 +351,30 @@ def pantalla_intro():
         if elapsed_time < 1.5: alpha = int(255 * (elapsed_time / 1.5))
         elif elapsed_time > 3.0: alpha = int(255 * ((4.5 - elapsed_time) / 1.5))
         if logo_img: logo_img.set_alpha(max(0, min(255, alpha))); pantalla.blit(logo_img, (0, 0))
-        pygame.display.flip(); clock.tick(60)
+        presentar(); clock.tick(60)
 
 def pantalla_configuracion(config):
     tam = config["tam"]; nombre_fuente = config["fuente"]; color = tuple(config["color"])
     idx_fuente = fuentes_disponibles.index(nombre_fuente) if nombre_fuente in fuentes_disponibles else 0
     idx_color = colores_disponibles.index(color) if color in colores_disponibles else 0
-    fuente_guardar_btn = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 22)
+    fuente_guardar_btn = get_font(FUENTE_LOGO_STYLE, 22)
     btn_guardar = Button(ANCHO//2 - 130, ALTO - 100, 260, 60, "GUARDAR Y CONTINUAR", fuente_guardar_btn, GRIS_OSCURO, GRIS_CLARO); btn_guardar.set_logo_style(True)
     y_base_botones = 150
-    btn_tam_left = Button(ANCHO//2-200, y_base_botones+50, 40, 40, "<", pygame.freetype.SysFont("arial", 25), GRIS_OSCURO, GRIS_CLARO, border_radius=5)
-    btn_tam_right = Button(ANCHO//2+160, y_base_botones+50, 40, 40, ">", pygame.freetype.SysFont("arial", 25), GRIS_OSCURO, GRIS_CLARO, border_radius=5)
-    btn_fuente_left = Button(ANCHO//2-200, y_base_botones+100, 40, 40, "<", pygame.freetype.SysFont("arial", 25), GRIS_OSCURO, GRIS_CLARO, border_radius=5)
-    btn_fuente_right = Button(ANCHO//2+160, y_base_botones+100, 40, 40, ">", pygame.freetype.SysFont("arial", 25), GRIS_OSCURO, GRIS_CLARO, border_radius=5)
-    btn_color_left = Button(ANCHO//2-200, y_base_botones+150, 40, 40, "<", pygame.freetype.SysFont("arial", 25), GRIS_OSCURO, GRIS_CLARO, border_radius=5)
-    btn_color_right = Button(ANCHO//2+160, y_base_botones+150, 40, 40, ">", pygame.freetype.SysFont("arial", 25), GRIS_OSCURO, GRIS_CLARO, border_radius=5)
+    btn_tam_left = Button(ANCHO//2-200, y_base_botones+50, 40, 40, "<", get_font("arial", 25), GRIS_OSCURO, GRIS_CLARO, border_radius=5)
+    btn_tam_right = Button(ANCHO//2+160, y_base_botones+50, 40, 40, ">", get_font("arial", 25), GRIS_OSCURO, GRIS_CLARO, border_radius=5)
+    btn_fuente_left = Button(ANCHO//2-200, y_base_botones+100, 40, 40, "<", get_font("arial", 25), GRIS_OSCURO, GRIS_CLARO, border_radius=5)
+    btn_fuente_right = Button(ANCHO//2+160, y_base_botones+100, 40, 40, ">", get_font("arial", 25), GRIS_OSCURO, GRIS_CLARO, border_radius=5)
+    btn_color_left = Button(ANCHO//2-200, y_base_botones+150, 40, 40, "<", get_font("arial", 25), GRIS_OSCURO, GRIS_CLARO, border_radius=5)
+    btn_color_right = Button(ANCHO//2+160, y_base_botones+150, 40, 40, ">", get_font("arial", 25), GRIS_OSCURO, GRIS_CLARO, border_radius=5)
+    botones = [btn_tam_left, btn_tam_right, btn_fuente_left, btn_fuente_right, btn_color_left, btn_color_right, btn_guardar]
+    ritmo = RitmoPantalla(botones)
+    y_base=100; separacion=50
+    def dibujar_estatico():
+        pantalla.blit(fondo_img, (0, 0)); dibujar_estrellas()
+        render_text_gradient(get_font(FUENTE_LOGO_STYLE, 50), "CONFIGURACIÓN", pygame.Rect(0,y_base-50,ANCHO,50), pantalla, [COLOR_GRADIENTE_TOP, COLOR_GRADIENTE_BOTTOM], COLOR_CONTORNO, 3)
     while True:
-        for evento in pygame.event.get():
-            if evento.type == pygame.QUIT: pygame.quit(); sys.exit()
+        for evento in ritmo.eventos():
+            if evento.type in EVENTOS_SALIDA: pygame.quit(); sys.exit()
             if btn_tam_left.handle_event(evento): tam = max(30, tam - 5)
             elif btn_tam_right.handle_event(evento): tam = min(200, tam + 5)
             elif btn_fuente_left.handle_event(evento): idx_fuente=(idx_fuente-1)%len(fuentes_disponibles); nombre_fuente=fuentes_disponibles[idx_fuente]
@@ -251,42 +383,50 @@ def pantalla_configuracion(config):
             elif btn_color_right.handle_event(evento): idx_color=(idx_color+1)%len(colores_disponibles); color=colores_disponibles[idx_color]
             elif btn_guardar.handle_event(evento) or (evento.type==pygame.KEYDOWN and evento.key==pygame.K_RETURN):
                 return nombre_fuente, tam, color
-        pantalla.blit(fondo_img, (0, 0)); dibujar_estrellas()
-        y_base=100; separacion=50
-        render_text_gradient(pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 50), "CONFIGURACIÓN", pygame.Rect(0,y_base-50,ANCHO,50), pantalla, [COLOR_GRADIENTE_TOP, COLOR_GRADIENTE_BOTTOM], COLOR_CONTORNO, 3)
-        fuente_ui_text = pygame.freetype.SysFont("arial", 40)
+        if not ritmo.debe_redibujar(): continue
+        ritmo.capa_estatica(dibujar_estatico)
+        fuente_ui_text = get_font("arial", 40)
         texto_tam, _ = fuente_ui_text.render(f"Tamaño: {tam}", BLANCO); pantalla.blit(texto_tam, (ANCHO//2-texto_tam.get_width()//2, y_base+separacion))
         texto_fuente, _ = fuente_ui_text.render(f"Fuente: {nombre_fuente}", BLANCO); pantalla.blit(texto_fuente, (ANCHO//2-texto_fuente.get_width()//2, y_base+2*separacion))
         texto_color, _ = fuente_ui_text.render(f"Color:", color); pantalla.blit(texto_color, (ANCHO//2-texto_color.get_width()//2, y_base+3*separacion))
-        fuente_letras_preview = pygame.freetype.SysFont(nombre_fuente, tam)
+        fuente_letras_preview = get_font(nombre_fuente, tam)
         texto_prev_surf, texto_prev_rect = fuente_letras_preview.render("A", color)
         texto_prev_rect.center = (ANCHO//2, y_base + 4*separacion + 50); pantalla.blit(texto_prev_surf, texto_prev_rect)
         btn_tam_left.draw(pantalla); btn_tam_right.draw(pantalla); btn_fuente_left.draw(pantalla); btn_fuente_right.draw(pantalla)
         btn_color_left.draw(pantalla); btn_color_right.draw(pantalla); btn_guardar.draw(pantalla)
-        pygame.display.flip(); clock.tick(60)
+        presentar()
 
 def pantalla_menu_principal():
     if music_loaded and not pygame.mixer.music.get_busy():
         pygame.mixer.music.play(-1)
 
     btn_y_start, btn_spacing = ALTO // 2 - 50, 80
-    fuente_opciones = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 30)
+    fuente_opciones = get_font(FUENTE_LOGO_STYLE, 30)
     btn_modos_juego = Button(ANCHO//2-140, btn_y_start, 280, 60, "JUGAR", fuente_opciones, GRIS_OSCURO, GRIS_CLARO)
     btn_puntuaciones = Button(ANCHO//2-140, btn_y_start + btn_spacing, 280, 60, "PUNTUACIONES", fuente_opciones, GRIS_OSCURO, GRIS_CLARO)
     btn_cargar = Button(ANCHO//2-140, btn_y_start + 2 * btn_spacing, 280, 60, "CARGAR PARTIDA", fuente_opciones, GRIS_OSCURO, GRIS_CLARO)
     btn_config = Button(ANCHO//2-140, btn_y_start + 3 * btn_spacing, 280, 60, "CONFIGURACIÓN", fuente_opciones, GRIS_OSCURO, GRIS_CLARO)
     btn_salir = Button(ANCHO//2-140, btn_y_start + 4 * btn_spacing, 280, 60, "SALIR", fuente_opciones, GRIS_OSCURO, GRIS_CLARO)
     
-    btn_instrucciones = Button(ANCHO - 220, ALTO - 70, 200, 50, "Instrucciones", pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 20), GRIS_OSCURO, GRIS_CLARO)
+    btn_instrucciones = Button(ANCHO - 220, ALTO - 70, 200, 50, "Instrucciones", get_font(FUENTE_LOGO_STYLE, 20), GRIS_OSCURO, GRIS_CLARO)
     
     botones = [btn_modos_juego, btn_puntuaciones, btn_cargar, btn_config, btn_salir, btn_instrucciones]
     for btn in botones: btn.set_logo_style(True)
     logo_img = None
     try: logo_img = pygame.image.load(os.path.join(os.path.dirname(__file__), "remove.png")).convert_alpha()
     except Exception: pass
+    def dibujar_estatico():
+        pantalla.blit(fondo_img, (0, 0)); dibujar_estrellas(0.5)
+        if logo_img:
+            logo_rect = logo_img.get_rect(center=(ANCHO // 2, ALTO // 4)); pantalla.blit(logo_img, logo_rect)
+        else:
+            fuente_titulo = get_font(FUENTE_LOGO_STYLE, 80)
+            rect_titulo = pygame.Rect(0, ALTO // 4 - 50, ANCHO, 100)
+            render_text_gradient(fuente_titulo, "SPEEDTYPE", rect_titulo, pantalla, [COLOR_GRADIENTE_TOP, COLOR_GRADIENTE_BOTTOM], COLOR_CONTORNO, 4)
+    ritmo = RitmoPantalla(botones)
     while True:
-        for evento in pygame.event.get():
-            if evento.type == pygame.QUIT: pygame.quit(); sys.exit()
+        for evento in ritmo.eventos():
+            if evento.type in EVENTOS_SALIDA: pygame.quit(); sys.exit()
             if btn_modos_juego.handle_event(evento): return "seleccion_modo"
             if btn_puntuaciones.handle_event(evento): return "highscores"
             if btn_cargar.handle_event(evento): return "cargar_partida"
@@ -294,44 +434,50 @@ def pantalla_menu_principal():
             if btn_instrucciones.handle_event(evento): return "instrucciones"
             if btn_salir.handle_event(evento) or (evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE):
                 if confirmar_salida(): pygame.quit(); sys.exit()
-        pantalla.blit(fondo_img, (0, 0)); dibujar_estrellas(0.5)
-        if logo_img:
-            logo_rect = logo_img.get_rect(center=(ANCHO // 2, ALTO // 4)); pantalla.blit(logo_img, logo_rect)
-        else:
-            fuente_titulo = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 80)
-            rect_titulo = pygame.Rect(0, ALTO // 4 - 50, ANCHO, 100)
-            render_text_gradient(fuente_titulo, "SPEEDTYPE", rect_titulo, pantalla, [COLOR_GRADIENTE_TOP, COLOR_GRADIENTE_BOTTOM], COLOR_CONTORNO, 4)
+                ritmo.invalidar() # El diálogo de salida tapó la pantalla
+        if not ritmo.debe_redibujar(): continue
+        ritmo.capa_estatica(dibujar_estatico)
         for btn in botones: btn.draw(pantalla)
-        pygame.display.flip(); clock.tick(60)
+        presentar()
 
 def pantalla_seleccion_modo_juego():
-    fuente_opciones = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 30)
+    fuente_opciones = get_font(FUENTE_LOGO_STYLE, 30)
     btn_arcane = Button(ANCHO//2-150, ALTO//2-100, 300, 70, "MODO ARCANE (1P)", fuente_opciones, GRIS_OSCURO, GRIS_CLARO); btn_arcane.set_logo_style(True)
     btn_versus = Button(ANCHO//2-250, ALTO//2-10, 500, 70, "MANO IZQUIERDA VRS MANO DERECHA", fuente_opciones, GRIS_OSCURO, GRIS_CLARO); btn_versus.set_logo_style(True)
+    btn_enjambre = Button(ANCHO//2-150, ALTO//2+70, 300, 70, "MODO ENJAMBRE (1P)", fuente_opciones, GRIS_OSCURO, GRIS_CLARO); btn_enjambre.set_logo_style(True)
     btn_volver = Button(ANCHO//2-150, ALTO//2+150, 300, 70, "VOLVER", fuente_opciones, GRIS_OSCURO, GRIS_CLARO); btn_volver.set_logo_style(True)
+    def dibujar_estatico():
+        pantalla.blit(fondo_img, (0, 0)); dibujar_estrellas(0.5)
+        render_text_gradient(get_font(FUENTE_LOGO_STYLE, 60), "SELECCIONAR MODO", pygame.Rect(0, ALTO//4-50, ANCHO, 100), pantalla, [COLOR_GRADIENTE_TOP, COLOR_GRADIENTE_BOTTOM], COLOR_CONTORNO, 4)
+    ritmo = RitmoPantalla([btn_arcane, btn_versus, btn_enjambre, btn_volver])
     while True:
-        for evento in pygame.event.get():
-            if evento.type == pygame.QUIT: pygame.quit(); sys.exit()
+        for evento in ritmo.eventos():
+            if evento.type in EVENTOS_SALIDA: pygame.quit(); sys.exit()
             if btn_arcane.handle_event(evento): return "arcane"
             if btn_versus.handle_event(evento): return "versus"
+            if btn_enjambre.handle_event(evento): return "enjambre"
             if btn_volver.handle_event(evento) or (evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE): return "volver_menu"
-        pantalla.blit(fondo_img, (0, 0)); dibujar_estrellas(0.5)
-        render_text_gradient(pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 60), "SELECCIONAR MODO", pygame.Rect(0, ALTO//4-50, ANCHO, 100), pantalla, [COLOR_GRADIENTE_TOP, COLOR_GRADIENTE_BOTTOM], COLOR_CONTORNO, 4)
-        btn_arcane.draw(pantalla); btn_versus.draw(pantalla); btn_volver.draw(pantalla)
-        pygame.display.flip(); clock.tick(60)
+        if not ritmo.debe_redibujar(): continue
+        ritmo.capa_estatica(dibujar_estatico)
+        btn_arcane.draw(pantalla); btn_versus.draw(pantalla); btn_enjambre.draw(pantalla); btn_volver.draw(pantalla)
+        presentar()
 
 def pantalla_configuracion_arcane():
-    fuente_titulo_estilo = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 50)
-    fuente_opciones_estilo = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 30)
-    fuente_fallos_num = pygame.freetype.SysFont("arial", 60)
+    fuente_titulo_estilo = get_font(FUENTE_LOGO_STYLE, 50)
+    fuente_opciones_estilo = get_font(FUENTE_LOGO_STYLE, 30)
+    fuente_fallos_num = get_font("arial", 60)
     fallos_disponibles = [5, 10, 15, 20]; fallos_seleccionado_idx = 1
     btn_fallos_left = Button(ANCHO//2-200, ALTO//2-30, 40, 40, "<", fuente_opciones_estilo, GRIS_OSCURO, GRIS_CLARO, border_radius=5)
     btn_fallos_right = Button(ANCHO//2+160, ALTO//2-30, 40, 40, ">", fuente_opciones_estilo, GRIS_OSCURO, GRIS_CLARO, border_radius=5)
     btn_iniciar = Button(ANCHO//2-150, ALTO//2+100, 300, 70, "INICIAR ARCANE", fuente_opciones_estilo, GRIS_OSCURO, GRIS_CLARO); btn_iniciar.set_logo_style(True)
     btn_volver = Button(ANCHO//2-150, ALTO//2+200, 300, 70, "VOLVER", fuente_opciones_estilo, GRIS_OSCURO, GRIS_CLARO); btn_volver.set_logo_style(True)
+    def dibujar_estatico():
+        pantalla.blit(fondo_img, (0, 0)); dibujar_estrellas(0.5)
+        render_text_gradient(fuente_titulo_estilo, "LÍMITE DE FALLOS", pygame.Rect(0,ALTO//4-50,ANCHO,100), pantalla, [COLOR_GRADIENTE_TOP, COLOR_GRADIENTE_BOTTOM], COLOR_CONTORNO, 3)
+    ritmo = RitmoPantalla([btn_fallos_left, btn_fallos_right, btn_iniciar, btn_volver])
     while True:
-        for evento in pygame.event.get():
-            if evento.type == pygame.QUIT: pygame.quit(); sys.exit()
+        for evento in ritmo.eventos():
+            if evento.type in EVENTOS_SALIDA: pygame.quit(); sys.exit()
             if btn_fallos_left.handle_event(evento): fallos_seleccionado_idx = (fallos_seleccionado_idx - 1) % len(fallos_disponibles)
             if btn_fallos_right.handle_event(evento): fallos_seleccionado_idx = (fallos_seleccionado_idx + 1) % len(fallos_disponibles)
             if btn_iniciar.handle_event(evento): return fallos_disponibles[fallos_seleccionado_idx]
@@ -341,24 +487,28 @@ def pantalla_configuracion_arcane():
                 elif evento.key == pygame.K_RIGHT: fallos_seleccionado_idx = (fallos_seleccionado_idx + 1) % len(fallos_disponibles)
                 elif evento.key == pygame.K_RETURN: return fallos_disponibles[fallos_seleccionado_idx]
                 elif evento.key == pygame.K_ESCAPE: return "volver_seleccion_modo"
-        pantalla.blit(fondo_img, (0, 0)); dibujar_estrellas(0.5)
-        render_text_gradient(fuente_titulo_estilo, "LÍMITE DE FALLOS", pygame.Rect(0,ALTO//4-50,ANCHO,100), pantalla, [COLOR_GRADIENTE_TOP, COLOR_GRADIENTE_BOTTOM], COLOR_CONTORNO, 3)
+        if not ritmo.debe_redibujar(): continue
+        ritmo.capa_estatica(dibujar_estatico)
         fallos_texto, fallos_rect = fuente_fallos_num.render(f"{fallos_disponibles[fallos_seleccionado_idx]} fallos", BLANCO); fallos_rect.center = (ANCHO//2, ALTO//2-10); pantalla.blit(fallos_texto, fallos_rect)
         btn_fallos_left.draw(pantalla); btn_fallos_right.draw(pantalla); btn_iniciar.draw(pantalla); btn_volver.draw(pantalla)
-        pygame.display.flip(); clock.tick(60)
+        presentar()
 
 def pantalla_configuracion_versus():
-    fuente_titulo_estilo = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 50)
-    fuente_opciones_estilo = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 30)
-    fuente_tiempo_num = pygame.freetype.SysFont("arial", 60)
+    fuente_titulo_estilo = get_font(FUENTE_LOGO_STYLE, 50)
+    fuente_opciones_estilo = get_font(FUENTE_LOGO_STYLE, 30)
+    fuente_tiempo_num = get_font("arial", 60)
     tiempos_disponibles = [1, 2, 3, 5]; tiempo_seleccionado_idx = 0
     btn_tiempo_left = Button(ANCHO//2-200, ALTO//2-30, 40, 40, "<", fuente_opciones_estilo, GRIS_OSCURO, GRIS_CLARO, border_radius=5)
     btn_tiempo_right = Button(ANCHO//2+160, ALTO//2-30, 40, 40, ">", fuente_opciones_estilo, GRIS_OSCURO, GRIS_CLARO, border_radius=5)
     btn_iniciar = Button(ANCHO//2-150, ALTO//2+100, 300, 70, "INICIAR VERSUS", fuente_opciones_estilo, GRIS_OSCURO, GRIS_CLARO); btn_iniciar.set_logo_style(True)
     btn_volver = Button(ANCHO//2-150, ALTO//2+200, 300, 70, "VOLVER", fuente_opciones_estilo, GRIS_OSCURO, GRIS_CLARO); btn_volver.set_logo_style(True)
+    def dibujar_estatico():
+        pantalla.blit(fondo_img, (0, 0)); dibujar_estrellas(0.5)
+        render_text_gradient(fuente_titulo_estilo, "LÍMITE DE TIEMPO", pygame.Rect(0,ALTO//4-50,ANCHO,100), pantalla, [COLOR_GRADIENTE_TOP, COLOR_GRADIENTE_BOTTOM], COLOR_CONTORNO, 3)
+    ritmo = RitmoPantalla([btn_tiempo_left, btn_tiempo_right, btn_iniciar, btn_volver])
     while True:
-        for evento in pygame.event.get():
-            if evento.type == pygame.QUIT: pygame.quit(); sys.exit()
+        for evento in ritmo.eventos():
+            if evento.type in EVENTOS_SALIDA: pygame.quit(); sys.exit()
             if btn_tiempo_left.handle_event(evento): tiempo_seleccionado_idx = (tiempo_seleccionado_idx - 1) % len(tiempos_disponibles)
             if btn_tiempo_right.handle_event(evento): tiempo_seleccionado_idx = (tiempo_seleccionado_idx + 1) % len(tiempos_disponibles)
             if btn_iniciar.handle_event(evento): return tiempos_disponibles[tiempo_seleccionado_idx]
@@ -368,43 +518,46 @@ def pantalla_configuracion_versus():
                 elif evento.key == pygame.K_RIGHT: tiempo_seleccionado_idx = (tiempo_seleccionado_idx + 1) % len(tiempos_disponibles)
                 elif evento.key == pygame.K_RETURN: return tiempos_disponibles[tiempo_seleccionado_idx]
                 elif evento.key == pygame.K_ESCAPE: return "volver_seleccion_modo"
-        pantalla.blit(fondo_img, (0, 0)); dibujar_estrellas(0.5)
-        render_text_gradient(fuente_titulo_estilo, "LÍMITE DE TIEMPO", pygame.Rect(0,ALTO//4-50,ANCHO,100), pantalla, [COLOR_GRADIENTE_TOP, COLOR_GRADIENTE_BOTTOM], COLOR_CONTORNO, 3)
+        if not ritmo.debe_redibujar(): continue
+        ritmo.capa_estatica(dibujar_estatico)
         tiempo_texto, tiempo_rect = fuente_tiempo_num.render(f"{tiempos_disponibles[tiempo_seleccionado_idx]} min", BLANCO); tiempo_rect.center = (ANCHO//2, ALTO//2-10); pantalla.blit(tiempo_texto, tiempo_rect)
         btn_tiempo_left.draw(pantalla); btn_tiempo_right.draw(pantalla); btn_iniciar.draw(pantalla); btn_volver.draw(pantalla)
-        pygame.display.flip(); clock.tick(60)
+        presentar()
 
 def pantalla_de_pausa():
-    fuente_pausa_titulo = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 60)
-    btn_reanudar = Button(ANCHO//2-150, ALTO//2-100, 300, 70, "REANUDAR", pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 30), GRIS_OSCURO, GRIS_CLARO); btn_reanudar.set_logo_style(True)
-    btn_guardar_salir = Button(ANCHO//2-150, ALTO//2, 300, 70, "GUARDAR Y SALIR", pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 30), GRIS_OSCURO, GRIS_CLARO); btn_guardar_salir.set_logo_style(True)
-    btn_salir_sin_guardar = Button(ANCHO//2-150, ALTO//2+100, 300, 70, "SALIR SIN GUARDAR", pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 30), GRIS_OSCURO, GRIS_CLARO); btn_salir_sin_guardar.set_logo_style(True)
+    fuente_pausa_titulo = get_font(FUENTE_LOGO_STYLE, 60)
+    btn_reanudar = Button(ANCHO//2-150, ALTO//2-100, 300, 70, "REANUDAR", get_font(FUENTE_LOGO_STYLE, 30), GRIS_OSCURO, GRIS_CLARO); btn_reanudar.set_logo_style(True)
+    btn_guardar_salir = Button(ANCHO//2-150, ALTO//2, 300, 70, "GUARDAR Y SALIR", get_font(FUENTE_LOGO_STYLE, 30), GRIS_OSCURO, GRIS_CLARO); btn_guardar_salir.set_logo_style(True)
+    btn_salir_sin_guardar = Button(ANCHO//2-150, ALTO//2+100, 300, 70, "SALIR SIN GUARDAR", get_font(FUENTE_LOGO_STYLE, 30), GRIS_OSCURO, GRIS_CLARO); btn_salir_sin_guardar.set_logo_style(True)
     if music_loaded: pygame.mixer.music.pause()
+    # Congela el último frame de juego con el velo oscuro y el título: se compone una sola vez
     superficie_oscura = pygame.Surface((ANCHO, ALTO), pygame.SRCALPHA); superficie_oscura.fill((0, 0, 0, 180))
+    fondo_congelado = capturar_frame(); fondo_congelado.blit(superficie_oscura, (0,0))
+    render_text_gradient(fuente_pausa_titulo, "PAUSA", pygame.Rect(0, ALTO//2-200, ANCHO, 70), fondo_congelado, [BLANCO, (200,200,200)], COLOR_CONTORNO, 3)
+    ritmo = RitmoPantalla([btn_reanudar, btn_guardar_salir, btn_salir_sin_guardar])
     while True:
-        for evento in pygame.event.get():
-            if evento.type == pygame.QUIT: pygame.quit(); sys.exit()
+        for evento in ritmo.eventos():
+            if evento.type in EVENTOS_SALIDA: pygame.quit(); sys.exit()
             if btn_reanudar.handle_event(evento) or (evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE):
                 if music_loaded: pygame.mixer.music.unpause()
                 return "reanudar"
             if btn_guardar_salir.handle_event(evento): return "guardar_y_salir"
             if btn_salir_sin_guardar.handle_event(evento): return "salir_sin_guardar"
-        if fondo_pausa_img: pantalla.blit(fondo_pausa_img, (0,0))
-        pantalla.blit(superficie_oscura, (0,0))
-        render_text_gradient(fuente_pausa_titulo, "PAUSA", pygame.Rect(0, ALTO//2-200, ANCHO, 70), pantalla, [BLANCO, (200,200,200)], COLOR_CONTORNO, 3)
+        if not ritmo.debe_redibujar(): continue
+        pantalla.blit(fondo_congelado, (0,0))
         btn_reanudar.draw(pantalla); btn_guardar_salir.draw(pantalla); btn_salir_sin_guardar.draw(pantalla)
-        pygame.display.flip(); clock.tick(60)
+        presentar()
 
 def pantalla_fin_juego(score, aciertos, fallos, num_jugadores, scores_j1=None, scores_j2=None):
-    fuente_ui_go_text = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 40)
-    fuente_ui_go_stats = pygame.freetype.SysFont("arial", 30)
-    fuente_ui_go_btns = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 30)
+    fuente_ui_go_text = get_font(FUENTE_LOGO_STYLE, 40)
+    fuente_ui_go_stats = get_font("arial", 30)
+    fuente_ui_go_btns = get_font(FUENTE_LOGO_STYLE, 30)
     if num_jugadores == 1:
         btn_reiniciar = Button(ANCHO // 2 - 150, ALTO // 2 + 80, 140, 60, "REINICIAR", fuente_ui_go_btns, GRIS_OSCURO, GRIS_CLARO); btn_reiniciar.set_logo_style(True)
         btn_salir_go = Button(ANCHO // 2 + 10, ALTO // 2 + 80, 140, 60, "SALIR", fuente_ui_go_btns, GRIS_OSCURO, GRIS_CLARO); btn_salir_go.set_logo_style(True)
         while True:
             for evento in pygame.event.get():
-                if evento.type == pygame.QUIT: pygame.quit(); sys.exit()
+                if evento.type in EVENTOS_SALIDA: pygame.quit(); sys.exit()
                 if btn_reiniciar.handle_event(evento): return "reiniciar"
                 if btn_salir_go.handle_event(evento): return "menu_principal"
             pantalla.blit(fondo_img, (0, 0)); dibujar_estrellas()
@@ -413,11 +566,11 @@ def pantalla_fin_juego(score, aciertos, fallos, num_jugadores, scores_j1=None, s
             t2, r2 = fuente_ui_go_stats.render(f"Puntaje: {score}", BLANCO); r2.center = (ANCHO//2, ALTO//2 - 20); pantalla.blit(t2, r2)
             t3, r3 = fuente_ui_go_stats.render(f"Aciertos: {aciertos} Fallos: {fallos} Precisión: {prec:.2f}%", BLANCO); r3.center = (ANCHO//2, ALTO//2 + 20); pantalla.blit(t3, r3)
             btn_reiniciar.draw(pantalla); btn_salir_go.draw(pantalla)
-            pygame.display.flip(); clock.tick(60)
+            presentar(); clock.tick(60)
     else:
-        fuente_resultado_titulo = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 60)
-        fuente_resultado_texto = pygame.freetype.SysFont("arial", 40)
-        fuente_botones = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 30)
+        fuente_resultado_titulo = get_font(FUENTE_LOGO_STYLE, 60)
+        fuente_resultado_texto = get_font("arial", 40)
+        fuente_botones = get_font(FUENTE_LOGO_STYLE, 30)
         
         if scores_j1 > scores_j2: ganador, color_ganador = "MANO IZQUIERDA", VERDE
         elif scores_j2 > scores_j1: ganador, color_ganador = "MANO DERECHA", AMARILLO
@@ -427,7 +580,7 @@ def pantalla_fin_juego(score, aciertos, fallos, num_jugadores, scores_j1=None, s
         btn_menu = Button(ANCHO//2+10, ALTO-160, 150, 60, "MENÚ", fuente_botones, GRIS_OSCURO, GRIS_CLARO); btn_menu.set_logo_style(True)
         while True:
             for evento in pygame.event.get():
-                if evento.type == pygame.QUIT: pygame.quit(); sys.exit()
+                if evento.type in EVENTOS_SALIDA: pygame.quit(); sys.exit()
                 if btn_reiniciar.handle_event(evento): return "reiniciar"
                 if btn_menu.handle_event(evento) or (evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE): return "menu_principal"
             pantalla.blit(fondo_img, (0, 0)); dibujar_estrellas()
@@ -436,42 +589,46 @@ def pantalla_fin_juego(score, aciertos, fallos, num_jugadores, scores_j1=None, s
             surf_j1, _ = fuente_resultado_texto.render(f"MANO IZQUIERDA: {scores_j1} pts", VERDE); pantalla.blit(surf_j1, (ANCHO//4 - surf_j1.get_width()//2, 200))
             surf_j2, _ = fuente_resultado_texto.render(f"MANO DERECHA: {scores_j2} pts", AMARILLO); pantalla.blit(surf_j2, (3 * ANCHO//4 - surf_j2.get_width()//2, 200))
             
-            fuente_ganador = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 50)
+            fuente_ganador = get_font(FUENTE_LOGO_STYLE, 50)
             render_text_gradient(fuente_ganador, f"GANADOR: {ganador}", pygame.Rect(0, 320, ANCHO, 80), pantalla, [color_ganador, BLANCO], COLOR_CONTORNO, 3)
             btn_reiniciar.draw(pantalla); btn_menu.draw(pantalla)
-            pygame.display.flip(); clock.tick(60)
+            presentar(); clock.tick(60)
 
 def confirmar_salida():
     if music_loaded and pygame.mixer.music.get_busy(): pygame.mixer.music.pause()
     caja_rect = pygame.Rect((ANCHO - 400) // 2, (ALTO - 200) // 2, 400, 200)
-    btn_si = Button(caja_rect.x+50, caja_rect.y+140, 100, 40, "SÍ", pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 20), GRIS_OSCURO, GRIS_CLARO); btn_si.set_logo_style(True)
-    btn_no = Button(caja_rect.x+250, caja_rect.y+140, 100, 40, "NO", pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 20), GRIS_OSCURO, GRIS_CLARO); btn_no.set_logo_style(True)
+    btn_si = Button(caja_rect.x+50, caja_rect.y+140, 100, 40, "SÍ", get_font(FUENTE_LOGO_STYLE, 20), GRIS_OSCURO, GRIS_CLARO); btn_si.set_logo_style(True)
+    btn_no = Button(caja_rect.x+250, caja_rect.y+140, 100, 40, "NO", get_font(FUENTE_LOGO_STYLE, 20), GRIS_OSCURO, GRIS_CLARO); btn_no.set_logo_style(True)
+    def dibujar_estatico():
+        pantalla.blit(fondo_img, (0,0)); dibujar_estrellas()
+        pygame.draw.rect(pantalla, NEGRO, caja_rect, border_radius=15); pygame.draw.rect(pantalla, BLANCO, caja_rect, 3, border_radius=15)
+        mensaje_texto, mensaje_rect = get_font("arial", 25).render("¿Estás seguro de que quieres salir?", BLANCO); mensaje_rect.center = (caja_rect.centerx, caja_rect.y + 40); pantalla.blit(mensaje_texto, mensaje_rect)
+    ritmo = RitmoPantalla([btn_si, btn_no])
     while True:
-        for evento in pygame.event.get():
-            if evento.type == pygame.QUIT: pygame.quit(); sys.exit()
+        for evento in ritmo.eventos():
+            if evento.type in EVENTOS_SALIDA: pygame.quit(); sys.exit()
             if btn_si.handle_event(evento): return True
             if btn_no.handle_event(evento):
                 if music_loaded: pygame.mixer.music.unpause()
                 return False
-        pantalla.blit(fondo_img, (0,0)); dibujar_estrellas()
-        pygame.draw.rect(pantalla, NEGRO, caja_rect, border_radius=15); pygame.draw.rect(pantalla, BLANCO, caja_rect, 3, border_radius=15)
-        mensaje_texto, mensaje_rect = pygame.freetype.SysFont("arial", 25).render("¿Estás seguro de que quieres salir?", BLANCO); mensaje_rect.center = (caja_rect.centerx, caja_rect.y + 40); pantalla.blit(mensaje_texto, mensaje_rect)
+        if not ritmo.debe_redibujar(): continue
+        ritmo.capa_estatica(dibujar_estatico)
         btn_si.draw(pantalla); btn_no.draw(pantalla)
-        pygame.display.flip(); clock.tick(60)
+        presentar()
 
 def mostrar_conteo_regresivo(segundos, fuente_obj, color):
     superficie_oscura = pygame.Surface((ANCHO, ALTO), pygame.SRCALPHA); superficie_oscura.fill((0, 0, 0, 180))
-    fuente_conteo = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 100)
+    fuente_conteo = get_font(FUENTE_LOGO_STYLE, 100)
     for i in range(segundos, 0, -1):
         pantalla.blit(fondo_img, (0, 0)); dibujar_estrellas(0.5); pantalla.blit(superficie_oscura, (0,0))
         render_text_gradient(fuente_conteo, str(i), pygame.Rect(0,0,ANCHO,ALTO), pantalla, [COLOR_GRADIENTE_TOP, COLOR_GRADIENTE_BOTTOM], COLOR_CONTORNO, 5)
-        pygame.display.flip(); pygame.time.delay(1000)
+        presentar(); pygame.time.delay(1000)
 
 def pantalla_ingresar_nombre(score):
-    nombre_jugador = ""; fuente_titulo = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 50); fuente_input = pygame.freetype.SysFont("arial", 60); fuente_instr = pygame.freetype.SysFont("arial", 25)
+    nombre_jugador = ""; fuente_titulo = get_font(FUENTE_LOGO_STYLE, 50); fuente_input = get_font("arial", 60); fuente_instr = get_font("arial", 25)
     while True:
         for evento in pygame.event.get():
-            if evento.type == pygame.QUIT: pygame.quit(); sys.exit()
+            if evento.type in EVENTOS_SALIDA: pygame.quit(); sys.exit()
             if evento.type == pygame.KEYDOWN:
                 if evento.key == pygame.K_RETURN and len(nombre_jugador) > 0:
                     highscores = cargar_highscores(); highscores.append({"nombre": nombre_jugador.upper(), "score": score})
@@ -484,22 +641,15 @@ def pantalla_ingresar_nombre(score):
         caja_rect = pygame.Rect(ANCHO//2 - 100, ALTO//2 - 40, 200, 80)
         pygame.draw.rect(pantalla, GRIS_OSCURO, caja_rect, border_radius=10); pygame.draw.rect(pantalla, BLANCO, caja_rect, 3, border_radius=10)
         nombre_surf, nombre_rect = fuente_input.render(nombre_jugador, BLANCO); nombre_rect.center = caja_rect.center; pantalla.blit(nombre_surf, nombre_rect)
-        pygame.display.flip(); clock.tick(60)
+        presentar(); clock.tick(60)
 
 def pantalla_highscores():
-    fuente_titulo = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 60); fuente_score = pygame.freetype.SysFont("arial", 40)
-    fuente_btn = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 30)
+    fuente_titulo = get_font(FUENTE_LOGO_STYLE, 60); fuente_score = get_font("arial", 40)
+    fuente_btn = get_font(FUENTE_LOGO_STYLE, 30)
     highscores = cargar_highscores()
     btn_volver = Button(ANCHO//2-150, ALTO-100, 300, 70, "VOLVER", fuente_btn, GRIS_OSCURO, GRIS_CLARO); btn_volver.set_logo_style(True)
     btn_limpiar = Button(ANCHO//2-150, ALTO-180, 300, 70, "LIMPIAR PUNTUACIONES", fuente_btn, ROJO, (200,0,0)); btn_limpiar.set_logo_style(True, gradient_colors=[ROJO, (255,100,100)], border_color=NEGRO)
-    while True:
-        for evento in pygame.event.get():
-            if evento.type == pygame.QUIT: pygame.quit(); sys.exit()
-            if btn_volver.handle_event(evento) or (evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE): return
-            if btn_limpiar.handle_event(evento):
-                if os.path.exists("highscores.json"):
-                    os.remove("highscores.json"); highscores = []
-                    print("Archivo de puntuaciones eliminado.")
+    def dibujar_estatico():
         pantalla.blit(fondo_img, (0, 0)); dibujar_estrellas()
         render_text_gradient(fuente_titulo, "PUNTUACIONES MÁS ALTAS", pygame.Rect(0,100,ANCHO,100), pantalla, [AMARILLO, BLANCO], COLOR_CONTORNO, 4)
         if not highscores:
@@ -507,43 +657,58 @@ def pantalla_highscores():
         else:
             for i, entry in enumerate(highscores):
                 texto, rect = fuente_score.render(f"{i+1}. {entry['nombre']} - {entry['score']}", BLANCO); rect.center = (ANCHO//2, 200 + i*60); pantalla.blit(texto, rect)
+    ritmo = RitmoPantalla([btn_volver, btn_limpiar])
+    while True:
+        for evento in ritmo.eventos():
+            if evento.type in EVENTOS_SALIDA: pygame.quit(); sys.exit()
+            if btn_volver.handle_event(evento) or (evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE): return
+            if btn_limpiar.handle_event(evento):
+                if os.path.exists("highscores.json"):
+                    os.remove("highscores.json"); highscores.clear(); ritmo.invalidar()
+                    print("Archivo de puntuaciones eliminado.")
+        if not ritmo.debe_redibujar(): continue
+        ritmo.capa_estatica(dibujar_estatico)
         btn_volver.draw(pantalla); btn_limpiar.draw(pantalla)
-        pygame.display.flip(); clock.tick(60)
+        presentar()
 
 def pantalla_seleccionar_partida(saved_games):
-    fuente_titulo = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 50)
-    fuente_opciones = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 30)
+    fuente_titulo = get_font(FUENTE_LOGO_STYLE, 50)
+    fuente_opciones = get_font(FUENTE_LOGO_STYLE, 30)
     btn_volver = Button(ANCHO//2-150, ALTO-100, 300, 70, "VOLVER", fuente_opciones, GRIS_OSCURO, GRIS_CLARO); btn_volver.set_logo_style(True)
     btns = []
     for i, save in enumerate(saved_games):
         timestamp_dt = datetime.fromisoformat(save['timestamp']); display_time = timestamp_dt.strftime("%Y-%m-%d %H:%M")
         mode_display = "Arcane (1P)" if save['mode'] == "arcane" else "Versus (2P)"
         btn_text = f"{i+1}. {mode_display} - {display_time}"
-        load_btn = Button(ANCHO//2-250, 150+i*80, 500, 60, btn_text, pygame.freetype.SysFont("arial", 25), GRIS_OSCURO, GRIS_CLARO); load_btn.set_logo_style(False)
-        delete_btn = Button(load_btn.rect.right+10, 150+i*80, 60, 60, "X", pygame.freetype.SysFont("arial", 30), (150,0,0), (255,0,0)); delete_btn.set_logo_style(False)
+        load_btn = Button(ANCHO//2-250, 150+i*80, 500, 60, btn_text, get_font("arial", 25), GRIS_OSCURO, GRIS_CLARO); load_btn.set_logo_style(False)
+        delete_btn = Button(load_btn.rect.right+10, 150+i*80, 60, 60, "X", get_font("arial", 30), (150,0,0), (255,0,0)); delete_btn.set_logo_style(False)
         btns.append((load_btn, delete_btn, save))
+    def dibujar_estatico():
+        pantalla.blit(fondo_img, (0, 0)); dibujar_estrellas(0.5)
+        render_text_gradient(fuente_titulo, "CARGAR PARTIDA", pygame.Rect(0, 50, ANCHO, 100), pantalla, [COLOR_GRADIENTE_TOP, COLOR_GRADIENTE_BOTTOM], COLOR_CONTORNO, 4)
+        if not saved_games:
+            texto, rect = get_font("arial", 25).render("No hay partidas guardadas.", BLANCO); rect.center = (ANCHO//2, ALTO//2); pantalla.blit(texto, rect)
+    ritmo = RitmoPantalla([b for load_btn, delete_btn, _ in btns for b in (load_btn, delete_btn)] + [btn_volver])
     while True:
-        for evento in pygame.event.get():
-            if evento.type == pygame.QUIT: pygame.quit(); sys.exit()
+        for evento in ritmo.eventos():
+            if evento.type in EVENTOS_SALIDA: pygame.quit(); sys.exit()
             for load_btn, delete_btn, save_data in btns:
                 if load_btn.handle_event(evento): return save_data
                 if delete_btn.handle_event(evento): eliminar_partida_guardada(save_data['timestamp']); return "refresh"
             if btn_volver.handle_event(evento) or (evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE): return "volver_menu"
-        pantalla.blit(fondo_img, (0, 0)); dibujar_estrellas(0.5)
-        render_text_gradient(fuente_titulo, "CARGAR PARTIDA", pygame.Rect(0, 50, ANCHO, 100), pantalla, [COLOR_GRADIENTE_TOP, COLOR_GRADIENTE_BOTTOM], COLOR_CONTORNO, 4)
-        if not saved_games:
-            texto, rect = pygame.freetype.SysFont("arial", 25).render("No hay partidas guardadas.", BLANCO); rect.center = (ANCHO//2, ALTO//2); pantalla.blit(texto, rect)
+        if not ritmo.debe_redibujar(): continue
+        ritmo.capa_estatica(dibujar_estatico)
         for load_btn, delete_btn, _ in btns:
             load_btn.draw(pantalla); delete_btn.draw(pantalla)
         btn_volver.draw(pantalla)
-        pygame.display.flip(); clock.tick(60)
+        presentar()
 
 # --- NUEVA PANTALLA DE INSTRUCCIONES ---
 def pantalla_instrucciones():
-    fuente_titulo = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 60)
-    fuente_subtitulo = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 35)
-    fuente_texto = pygame.freetype.SysFont("arial", 24)
-    btn_volver = Button(ANCHO//2 - 150, ALTO - 100, 300, 70, "VOLVER", pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 30), GRIS_OSCURO, GRIS_CLARO)
+    fuente_titulo = get_font(FUENTE_LOGO_STYLE, 60)
+    fuente_subtitulo = get_font(FUENTE_LOGO_STYLE, 35)
+    fuente_texto = get_font("arial", 24)
+    btn_volver = Button(ANCHO//2 - 150, ALTO - 100, 300, 70, "VOLVER", get_font(FUENTE_LOGO_STYLE, 30), GRIS_OSCURO, GRIS_CLARO)
     btn_volver.set_logo_style(True)
 
     # --- Contenido dividido en dos columnas ---
@@ -570,12 +735,7 @@ def pantalla_instrucciones():
         ("- Gana el mejor al final del tiempo.", fuente_texto, BLANCO),
     ]
 
-    while True:
-        for evento in pygame.event.get():
-            if evento.type == pygame.QUIT: pygame.quit(); sys.exit()
-            if btn_volver.handle_event(evento) or (evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE):
-                return
-
+    def dibujar_estatico():
         pantalla.blit(fondo_img, (0, 0)); dibujar_estrellas(0.5)
         
         render_text_gradient(fuente_titulo, "INSTRUCCIONES", pygame.Rect(0, 80, ANCHO, 80), pantalla, [COLOR_GRADIENTE_TOP, COLOR_GRADIENTE_BOTTOM], COLOR_CONTORNO, 4)
@@ -601,9 +761,17 @@ def pantalla_instrucciones():
                 pantalla.blit(surf, rect)
             y_offset += 40
 
+    ritmo = RitmoPantalla([btn_volver])
+    while True:
+        for evento in ritmo.eventos():
+            if evento.type in EVENTOS_SALIDA: pygame.quit(); sys.exit()
+            if btn_volver.handle_event(evento) or (evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE):
+                return
+
+        if not ritmo.debe_redibujar(): continue
+        ritmo.capa_estatica(dibujar_estatico)
         btn_volver.draw(pantalla)
-        pygame.display.flip()
-        clock.tick(60)
+        presentar()
 
 
 # ========================
@@ -617,6 +785,8 @@ if __name__ == '__main__':
         config = {"fuente": fuentes_disponibles[0], "tam": 60, "color": colores_disponibles[0]}
     
     config["color"] = tuple(config["color"])
+    BAJO_CONSUMO = config.get("bajo_consumo", False)
+    FPS_ANIMACION_BAJO_CONSUMO = config.get("fps_animacion_bajo_consumo", 0)
 
     while True:
         accion = pantalla_menu_principal()
@@ -625,9 +795,10 @@ if __name__ == '__main__':
         
         if accion == "seleccion_modo":
             modo_seleccionado = pantalla_seleccion_modo_juego()
-            if modo_seleccionado == "arcane":
+            if modo_seleccionado in ("arcane", "enjambre"):
                 fallos_limit = pantalla_configuracion_arcane()
-                if fallos_limit != "volver_seleccion_modo": game_options = {"num_jugadores": 1, "initial_speed": 1.5, "count_wrong_key_faults": True, "time_limit_seconds": 0, "fallos_limit": fallos_limit}
+                if fallos_limit != "volver_seleccion_modo": game_options = {"num_jugadores": 1, "initial_speed": 1.5, "count_wrong_key_faults": True, "time_limit_seconds": 0, "fallos_limit": fallos_limit,
+                                                                            "swarm": modo_seleccionado == "enjambre"}
             elif modo_seleccionado == "versus":
                 time_limit_minutes = pantalla_configuracion_versus()
                 if time_limit_minutes != "volver_seleccion_modo": game_options = {"num_jugadores": 2, "initial_speed": 2.0, "count_wrong_key_faults": True, "time_limit_seconds": time_limit_minutes * 60, "fallos_limit": 999}
@@ -636,7 +807,7 @@ if __name__ == '__main__':
             continue
         elif accion == "configuracion":
             nombre_fuente, tam, color = pantalla_configuracion(config)
-            config = {"fuente": nombre_fuente, "tam": tam, "color": color}
+            config.update({"fuente": nombre_fuente, "tam": tam, "color": color})
             guardar_config(nombre_fuente, tam, color)
             continue
         elif accion == "instrucciones":
@@ -655,12 +826,18 @@ if __name__ == '__main__':
                         "initial_speed": initial_state.get("velocidad", 1.5),
                         "count_wrong_key_faults": True,
                         "fallos_limit": initial_state.get("fallos_limit", 10),
-                        "time_limit_seconds": initial_state.get("time_limit_seconds", 0)
+                        "time_limit_seconds": initial_state.get("time_limit_seconds", 0),
+                        "swarm": initial_state.get("swarm", False)
                     }
                 break
 
         if game_options:
-            current_config = {"fuente": config["fuente"], "tam": config["tam"], "color": config["color"]}
+            current_config = {"fuente": config["fuente"], "tam": config["tam"], "color": config["color"],
+                              "dirty_rects": config.get("dirty_rects", False), "sim_hz": config.get("sim_hz", 60),
+                              "medir_latencia": config.get("medir_latencia", False),
+                              "teclado": config.get("teclado", "en"), "letras_adaptativas": config.get("letras_adaptativas", False),
+                              "corpus": config.get("corpus"), "corpus_filtros": config.get("corpus_filtros"),
+                              "bigramas": config.get("bigramas", [])}
             game_session = GameSession(sys.modules[__name__], current_config, game_options, initial_state, save_timestamp)
             resultado_juego = game_session.run()
 
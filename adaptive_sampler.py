@@ -0,0 +1,96 @@
+# adaptive_sampler.py
+
+import random
+
+class FenwickTree:
+    """
+    Árbol de Fenwick (árbol binario indexado) de pesos: cambiar un peso y elegir un índice
+    con probabilidad proporcional a su peso cuestan O(log n).
+    """
+    def __init__(self, pesos):
+        self.n = len(pesos)
+        self.pesos = [float(p) for p in pesos]
+        self._arbol = [0.0] * (self.n + 1)
+        for i, peso in enumerate(self.pesos, 1): # Construcción en O(n)
+            self._arbol[i] += peso
+            padre = i + (i & -i)
+            if padre <= self.n: self._arbol[padre] += self._arbol[i]
+        self.total = sum(self.pesos)
+        self._paso_inicial = 1 << (self.n.bit_length() - 1) if self.n else 0
+
+    def fijar(self, i, peso):
+        """Cambia el peso del índice i."""
+        delta = peso - self.pesos[i]
+        self.pesos[i] = peso; self.total += delta
+        i += 1
+        while i <= self.n:
+            self._arbol[i] += delta; i += i & -i
+
+    def buscar(self, valor):
+        """Retorna el primer índice cuya suma acumulada de pesos supera 'valor' (0 <= valor < total)."""
+        pos, paso, arbol = 0, self._paso_inicial, self._arbol
+        while paso:
+            siguiente = pos + paso
+            if siguiente <= self.n and arbol[siguiente] <= valor:
+                pos = siguiente; valor -= arbol[siguiente]
+            paso >>= 1
+        return min(pos, self.n - 1) # Por redondeo 'valor' puede quedar justo en el total
+
+    def muestrear(self, rng=random):
+        return self.buscar(rng.random() * self.total)
+
+
+class AdaptiveSampler:
+    """
+    Elige objetivos (letras, la Ñ, bigramas...) con más probabilidad cuanto peor le van al jugador.
+    Por objetivo guarda aciertos, fallos y tiempos de reacción; su peso es
+        (PESO_BASE + tasa de fallos suavizada) * (reacción media / REACCION_REFERENCIA, acotada)
+    de modo que un objetivo nuevo pesa 1, uno dominado tiende a PESO_BASE y uno que siempre
+    se falla a PESO_BASE + 1. Cada resultado sólo cambia el peso de su objetivo (O(log n)).
+    """
+    PESO_BASE = 0.5
+    REACCION_REFERENCIA = 0.5 # Segundos
+    FACTOR_REACCION = (0.5, 2.0) # Límites del factor por tiempo de reacción
+
+    def __init__(self, objetivos, estadisticas=None):
+        self.objetivos = list(dict.fromkeys(objetivos))
+        self._indice = {obj: i for i, obj in enumerate(self.objetivos)}
+        # objetivo -> [aciertos, fallos, suma de tiempos de reacción, reacciones medidas]
+        self.estadisticas = {obj: [0, 0, 0.0, 0] for obj in self.objetivos}
+        for obj, datos in (estadisticas or {}).items():
+            if obj in self.estadisticas: self.estadisticas[obj] = list(datos)
+        self._arbol = FenwickTree([self._peso(obj) for obj in self.objetivos])
+
+    def _peso(self, obj):
+        aciertos, fallos, suma_reaccion, reacciones = self.estadisticas[obj]
+        tasa_fallos = (fallos + 1) / (aciertos + fallos + 2)
+        factor = 1.0
+        if reacciones:
+            minimo, maximo = self.FACTOR_REACCION
+            factor = min(maximo, max(minimo, suma_reaccion / reacciones / self.REACCION_REFERENCIA))
+        return (self.PESO_BASE + tasa_fallos) * factor
+
+    def __contains__(self, obj):
+        return obj in self._indice
+
+    def peso(self, obj):
+        return self._arbol.pesos[self._indice[obj]]
+
+    def registrar(self, obj, acierto, reaccion=None):
+        """Anota un acierto o un fallo de 'obj' (y su tiempo de reacción en segundos, si se conoce)."""
+        datos = self.estadisticas.get(obj)
+        if datos is None: return
+        datos[0 if acierto else 1] += 1
+        if reaccion is not None:
+            datos[2] += reaccion; datos[3] += 1
+        self._arbol.fijar(self._indice[obj], self._peso(obj))
+
+    def muestrear(self, rng=random):
+        return self.objetivos[self._arbol.muestrear(rng)]
+
+    def to_dict(self):
+        return {"objetivos": self.objetivos, "estadisticas": self.estadisticas}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("objetivos", []), data.get("estadisticas"))
@@ -0,0 +1,240 @@
+# corpus.py
+"""
+Corpus de palabras (o n-gramas) para el modo de palabras, pensado para listas de cientos de MB.
+
+El corpus se construye una vez a partir de una lista de palabras en texto (una por línea,
+opcionalmente "palabra<TAB>frecuencia"):
+
+    python corpus.py palabras.txt corpus.bin [--teclado es] [--ngramas 3]
+
+Se generan dos archivos:
+- corpus.bin: las palabras en mayúsculas, en UTF-8, cada una terminada en salto de línea;
+- corpus.bin.idx: una línea de cabecera JSON con los cubos (longitud, mano, dificultad)
+  y, alineado a 8 bytes, un array de desplazamientos uint64 agrupados por cubo.
+Corpus abre ambos con mmap: elegir una palabra al azar es elegir un cubo y un índice y leer
+desde su desplazamiento, sin cargar el archivo en memoria.
+"""
+
+import argparse
+import array
+import bisect
+import json
+import mmap
+import os
+import queue
+import random
+import shutil
+import sys
+import tempfile
+import threading
+
+from keyboard_layout_manager import KeyboardLayoutManager
+
+VERSION_INDICE = 1
+LETRAS_FRECUENTES = frozenset("ETAOINSHRDLU")
+
+def mano_de(palabra, izquierda, derecha):
+    """'izquierda' o 'derecha' si la palabra se escribe sólo con esa mano; si no, 'ambas'."""
+    if all(c in izquierda for c in palabra): return "izquierda"
+    if all(c in derecha for c in palabra): return "derecha"
+    return "ambas"
+
+def dificultad_de(palabra, frecuencia=None, cortes=None):
+    """
+    Dificultad de 1 (fácil) a 3. Con frecuencia y 'cortes' (frecuencias de los terciles) las
+    palabras comunes son fáciles; sin ella cuenta las letras poco frecuentes (fuera de ETAOINSHRDLU).
+    """
+    if frecuencia is not None and cortes:
+        return 1 if frecuencia >= cortes[0] else 2 if frecuencia >= cortes[1] else 3
+    raras = sum(1 for c in palabra if c not in LETRAS_FRECUENTES)
+    return min(3, 1 + raras)
+
+def _leer_origen(ruta, letras, ngramas=None):
+    """Genera (palabra, frecuencia o None) normalizadas y filtradas al alfabeto del teclado."""
+    with open(ruta, encoding="utf-8", errors="ignore") as f:
+        for linea in f:
+            partes = linea.strip().split("\t")
+            palabra = partes[0].upper()
+            if not palabra or any(c not in letras for c in palabra): continue
+            try: frecuencia = float(partes[1]) if len(partes) > 1 else None
+            except ValueError: frecuencia = None
+            if ngramas:
+                for i in range(len(palabra) - ngramas + 1): yield palabra[i:i + ngramas], frecuencia
+            else:
+                yield palabra, frecuencia
+
+def _cortes_frecuencia(ruta, letras, ngramas, muestra=100000):
+    """
+    Frecuencias que separan los terciles (una pasada extra, sólo si el origen las trae),
+    estimadas sobre una muestra de tamaño fijo (muestreo de reservorio).
+    """
+    rng, frecuencias, vistas = random.Random(0), [], 0
+    for _, frecuencia in _leer_origen(ruta, letras, ngramas):
+        if frecuencia is None: continue
+        vistas += 1
+        if len(frecuencias) < muestra: frecuencias.append(frecuencia)
+        else:
+            j = rng.randrange(vistas)
+            if j < muestra: frecuencias[j] = frecuencia
+    if not frecuencias: return None
+    ordenadas = sorted(frecuencias, reverse=True)
+    return ordenadas[len(ordenadas) // 3], ordenadas[2 * len(ordenadas) // 3]
+
+def construir_corpus(origen, destino, layout="en", ngramas=None, max_longitud=16):
+    """
+    Construye 'destino' y 'destino.idx' desde la lista de palabras 'origen'.
+    Los desplazamientos de cada cubo se vuelcan a archivos temporales en bloques, así que
+    la memoria usada no depende del tamaño de la lista. No se eliminan duplicados.
+    Retorna {cubo: cantidad}.
+    """
+    teclado = KeyboardLayoutManager(layout)
+    izquierda, derecha = frozenset(teclado.left_hand_keys), frozenset(teclado.right_hand_keys)
+    letras = izquierda | derecha
+    cortes = _cortes_frecuencia(origen, letras, ngramas)
+    temporal = tempfile.mkdtemp(prefix="corpus_")
+    pendientes, archivos, cantidades = {}, {}, {}
+    try:
+        with open(destino, "wb") as salida:
+            desplazamiento = 0
+            for palabra, frecuencia in _leer_origen(origen, letras, ngramas):
+                if len(palabra) > max_longitud: continue
+                cubo = f"{len(palabra)}:{mano_de(palabra, izquierda, derecha)}:{dificultad_de(palabra, frecuencia, cortes)}"
+                datos = palabra.encode("utf-8") + b"\n"
+                salida.write(datos)
+                bloque = pendientes.setdefault(cubo, array.array("Q"))
+                bloque.append(desplazamiento); desplazamiento += len(datos)
+                cantidades[cubo] = cantidades.get(cubo, 0) + 1
+                if len(bloque) >= 65536:
+                    if cubo not in archivos: archivos[cubo] = open(os.path.join(temporal, str(len(archivos))), "wb")
+                    bloque.tofile(archivos[cubo]); pendientes[cubo] = array.array("Q")
+
+        cubos, inicio = {}, 0
+        for cubo in sorted(cantidades):
+            cubos[cubo] = [inicio, cantidades[cubo]]; inicio += cantidades[cubo]
+        cabecera = json.dumps({"version": VERSION_INDICE, "teclado": layout, "cubos": cubos}).encode("utf-8") + b"\n"
+        with open(destino + ".idx", "wb") as indice:
+            indice.write(cabecera + b"\0" * (-len(cabecera) % 8))
+            for cubo in sorted(cantidades):
+                if cubo in archivos:
+                    archivos[cubo].close()
+                    with open(archivos[cubo].name, "rb") as f: shutil.copyfileobj(f, indice)
+                pendientes[cubo].tofile(indice)
+    finally:
+        for f in archivos.values(): f.close()
+        shutil.rmtree(temporal, ignore_errors=True)
+    return cantidades
+
+
+class Corpus:
+    """
+    Corpus construido con construir_corpus, abierto con mmap (corpus e índice).
+    muestrear() elige una palabra al azar entre los cubos que cumplen los filtros:
+    el cubo con bisect sobre las cantidades acumuladas y la palabra por su desplazamiento.
+    """
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._archivo = open(ruta, "rb"); self._indice = open(ruta + ".idx", "rb")
+        self._datos = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapa_indice = mmap.mmap(self._indice.fileno(), 0, access=mmap.ACCESS_READ)
+        fin_cabecera = self._mapa_indice.find(b"\n") + 1
+        cabecera = json.loads(self._mapa_indice[:fin_cabecera])
+        self.layout = cabecera.get("teclado", "en")
+        self.cubos = {cubo: tuple(rango) for cubo, rango in cabecera["cubos"].items()}
+        inicio = fin_cabecera + (-fin_cabecera % 8)
+        self._desplazamientos = memoryview(self._mapa_indice)[inicio:].cast("Q")
+        self._selecciones = {} # filtros -> (cubos, cantidades acumuladas)
+
+    def __len__(self):
+        return len(self._desplazamientos)
+
+    def cerrar(self):
+        self._desplazamientos.release()
+        self._datos.close(); self._mapa_indice.close()
+        self._archivo.close(); self._indice.close()
+
+    def palabra(self, i):
+        """La palabra i-ésima del índice."""
+        inicio = self._desplazamientos[i]
+        return self._datos[inicio:self._datos.find(b"\n", inicio)].decode("utf-8")
+
+    def _seleccion(self, longitud, mano, dificultad):
+        if isinstance(longitud, list): longitud = tuple(longitud) # Filtros leídos de un JSON
+        clave = (longitud, mano, dificultad)
+        seleccion = self._selecciones.get(clave)
+        if seleccion is None:
+            minimo, maximo = (longitud, longitud) if isinstance(longitud, int) else (longitud or (0, sys.maxsize))
+            elegidos, acumuladas, total = [], [], 0
+            for cubo, (inicio, cantidad) in self.cubos.items():
+                largo, mano_cubo, dificultad_cubo = cubo.split(":")
+                if not minimo <= int(largo) <= maximo: continue
+                if mano is not None and mano_cubo != mano: continue
+                if dificultad is not None and int(dificultad_cubo) != dificultad: continue
+                elegidos.append(inicio); total += cantidad; acumuladas.append(total)
+            seleccion = self._selecciones[clave] = (elegidos, acumuladas)
+        return seleccion
+
+    def cantidad(self, longitud=None, mano=None, dificultad=None):
+        acumuladas = self._seleccion(longitud, mano, dificultad)[1]
+        return acumuladas[-1] if acumuladas else 0
+
+    def muestrear(self, longitud=None, mano=None, dificultad=None, rng=random):
+        """
+        Retorna una palabra al azar (uniforme entre las que cumplen los filtros), o None si no hay.
+        :param longitud: Un entero o un rango (mínimo, máximo) inclusivo.
+        :param mano: "izquierda", "derecha" o "ambas".
+        :param dificultad: 1, 2 o 3.
+        """
+        inicios, acumuladas = self._seleccion(longitud, mano, dificultad)
+        if not acumuladas: return None
+        n = rng.randrange(acumuladas[-1])
+        i = bisect.bisect_right(acumuladas, n)
+        return self.palabra(inicios[i] + n - (acumuladas[i - 1] if i else 0))
+
+
+class PrefetchQueue:
+    """
+    Cola de palabras que un hilo en segundo plano mantiene llena leyendo del Corpus, para
+    que quien genera las letras nunca espere a una lectura de disco (un fallo de página del mmap).
+    """
+    def __init__(self, corpus, filtros=None, tam=64, seed=None):
+        self.corpus = corpus
+        self.filtros = dict(filtros or {})
+        self._cola = queue.Queue(maxsize=tam)
+        self._rng = random.Random(seed)
+        self._activo = True
+        self._hilo = threading.Thread(target=self._llenar, daemon=True)
+        self._hilo.start()
+
+    def _llenar(self):
+        while self._activo:
+            palabra = self.corpus.muestrear(rng=self._rng, **self.filtros)
+            if palabra is None: return # Ningún cubo cumple los filtros
+            try: self._cola.put(palabra, timeout=0.5)
+            except queue.Full: pass
+
+    def obtener(self):
+        """Retorna la siguiente palabra, o None si la cola está vacía en este momento (no bloquea)."""
+        try: return self._cola.get_nowait()
+        except queue.Empty: return None
+
+    def detener(self):
+        """Para el hilo y, cuando termina, cierra el corpus."""
+        self._activo = False
+        self._hilo.join(timeout=1.0)
+        if not self._hilo.is_alive(): self.corpus.cerrar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construye un corpus con índice para el modo de palabras.")
+    parser.add_argument("origen", help="Lista de palabras (una por línea, opcionalmente 'palabra<TAB>frecuencia')")
+    parser.add_argument("destino", help="Archivo de corpus a crear (el índice se guarda en destino.idx)")
+    parser.add_argument("--teclado", choices=["en", "es"], default="en")
+    parser.add_argument("--ngramas", type=int, default=None, help="Guardar los n-gramas de este tamaño en vez de las palabras")
+    parser.add_argument("--max-longitud", type=int, default=16)
+    args = parser.parse_args()
+
+    cantidades = construir_corpus(args.origen, args.destino, args.teclado, args.ngramas, args.max_longitud)
+    print(f"{sum(cantidades.values())} entradas en {len(cantidades)} cubos -> {args.destino} (+ .idx)")
+
+if __name__ == "__main__":
+    main()
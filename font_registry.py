@@ -0,0 +1,130 @@
+# font_registry.py
+
+import json
+import os
+import sys
+import pygame
+import pygame.freetype
+
+# Registro de fuentes del proceso: cada combinación (nombre, tamaño, estilo) se construye
+# una sola vez y se reutiliza. Las fuentes devueltas son compartidas, así que no se deben
+# modificar sus atributos (size, style, etc.) después de obtenerlas.
+_fuentes = {}
+_estadisticas = {"hits": 0, "misses": 0}
+
+# Fuentes incluidas con el juego: se usan directamente por ruta, sin buscar en el sistema.
+BUNDLED_FONTS = {
+    "pressstart2p": os.path.join(os.path.dirname(os.path.abspath(__file__)), "PressStart2P.ttf"),
+}
+
+# Caché en disco nombre -> ruta resuelta. Se invalida cuando cambia la fecha de
+# modificación de algún directorio de fuentes del sistema.
+FONT_CACHE_FILE = "font_cache.json"
+_cache_rutas = None # Se carga de disco la primera vez que hace falta
+
+def _directorios_fuentes():
+    """Directorios donde pygame busca fuentes del sistema en cada plataforma."""
+    home = os.path.expanduser("~")
+    if sys.platform.startswith("win"):
+        dirs = [os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts"),
+                os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Windows", "Fonts")]
+    elif sys.platform == "darwin":
+        dirs = ["/Library/Fonts", "/System/Library/Fonts", os.path.join(home, "Library", "Fonts")]
+    else:
+        dirs = ["/usr/share/fonts", "/usr/local/share/fonts", os.path.join(home, ".fonts"),
+                os.path.join(home, ".local", "share", "fonts")]
+    return [d for d in dirs if os.path.isdir(d)]
+
+def _firma_directorios():
+    """Fechas de modificación de los directorios de fuentes y de sus subdirectorios inmediatos."""
+    firma = {}
+    for base in _directorios_fuentes():
+        try:
+            firma[base] = os.stat(base).st_mtime
+            with os.scandir(base) as entradas:
+                for entrada in entradas:
+                    if entrada.is_dir():
+                        firma[entrada.path] = entrada.stat().st_mtime
+        except OSError:
+            continue
+    return firma
+
+def _cargar_cache_rutas():
+    global _cache_rutas
+    firma = _firma_directorios()
+    _cache_rutas = {"dirs": firma, "paths": {}}
+    if os.path.exists(FONT_CACHE_FILE):
+        try:
+            with open(FONT_CACHE_FILE) as f: data = json.load(f)
+            if data.get("dirs") == firma:
+                _cache_rutas["paths"] = data.get("paths", {})
+        except Exception: pass
+    return _cache_rutas
+
+def _guardar_cache_rutas():
+    try:
+        with open(FONT_CACHE_FILE, "w") as f: json.dump(_cache_rutas, f)
+    except OSError as e:
+        print(f"No se pudo guardar la caché de fuentes: {e}")
+
+def resolve_font_path(name):
+    """
+    Retorna la ruta del archivo de fuente para un nombre de fuente del sistema,
+    o None si no existe (en ese caso freetype usa su fuente por defecto, como SysFont).
+    Consulta primero las fuentes incluidas y la caché en disco; sólo si el nombre no
+    está en ninguna se hace la búsqueda completa de pygame (fc-list en Linux).
+    """
+    if name and os.path.isfile(name):
+        return name
+    clave = _normalizar_nombre(name)
+    if clave is None:
+        return None
+    if clave in BUNDLED_FONTS:
+        return BUNDLED_FONTS[clave]
+
+    cache = _cache_rutas if _cache_rutas is not None else _cargar_cache_rutas()
+    if clave in cache["paths"]:
+        return cache["paths"][clave]
+
+    ruta = pygame.font.match_font(name)
+    cache["paths"][clave] = ruta
+    _guardar_cache_rutas()
+    return ruta
+
+def _normalizar_nombre(name):
+    """Normaliza el nombre como lo hace SysFont ("Comic Sans MS" == "comicsansms")."""
+    if not name:
+        return None
+    return name.lower().replace(" ", "")
+
+def get_font(name, size, style=pygame.freetype.STYLE_DEFAULT):
+    """
+    Retorna la fuente freetype para (name, size, style), creándola sólo la primera vez.
+    :param name: Nombre de la fuente del sistema (ej. "arial", "Impact"), de una fuente
+                 incluida (ej. "PressStart2P") o ruta a un archivo de fuente.
+    :param size: Tamaño en puntos.
+    :param style: Estilo freetype (STYLE_DEFAULT, STYLE_STRONG, STYLE_OBLIQUE, ...).
+    """
+    key = (_normalizar_nombre(name), size, style)
+    font = _fuentes.get(key)
+    if font is not None:
+        _estadisticas["hits"] += 1
+        return font
+
+    _estadisticas["misses"] += 1
+    font = pygame.freetype.Font(resolve_font_path(name), size)
+    if style != pygame.freetype.STYLE_DEFAULT:
+        font.style = style
+    _fuentes[key] = font
+    return font
+
+def get_font_stats():
+    """Retorna los contadores de aciertos/fallos del registro y el número de fuentes creadas."""
+    stats = dict(_estadisticas)
+    stats["fonts"] = len(_fuentes)
+    return stats
+
+def clear_fonts():
+    """Vacía el registro (por ejemplo, tras reinicializar pygame.freetype)."""
+    _fuentes.clear()
+    for k in _estadisticas: _estadisticas[k] = 0
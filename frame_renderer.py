@@ -0,0 +1,160 @@
+# frame_renderer.py
+
+import pygame
+
+class FullFrameRenderer:
+    """
+    Renderizado tradicional: cada frame se pinta el fondo completo y se presenta la pantalla entera.
+    Comparte la interfaz de DirtyRectRenderer para que GameSession no tenga que distinguirlos.
+    """
+    def __init__(self, superficie, fondo, presentar):
+        self.superficie = superficie
+        self.fondo = fondo
+        self._presentar = presentar # Función que muestra el frame (ej. JuegoLedvin.presentar)
+
+    def begin_frame(self):
+        self.superficie.blit(self.fondo, (0, 0))
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        return self.superficie.blit(source, dest, area, special_flags)
+
+    def blits(self, blit_sequence):
+        return self.superficie.blits(blit_sequence)
+
+    def marcar(self, rect):
+        """Registra una zona dibujada directamente sobre la superficie (no hace falta aquí)."""
+        pass
+
+    def reservar(self, rect):
+        """Avisa de que se va a dibujar directamente sobre la superficie en 'rect' (no hace falta aquí)."""
+        pass
+
+    def marcar_varios(self, rects):
+        pass
+
+    def invalidar(self):
+        pass
+
+    def present(self):
+        self._presentar()
+
+
+class DirtyRectRenderer(FullFrameRenderer):
+    """
+    Renderizado por rectángulos sucios: sólo se restauran desde el fondo las zonas que se
+    dibujaron en el frame anterior y sólo se envían a la pantalla las zonas que cambiaron.
+    Si el área sucia supera 'umbral' (fracción de la pantalla), se presenta el frame completo.
+    """
+    def __init__(self, superficie, fondo, presentar, umbral=0.4):
+        super().__init__(superficie, fondo, presentar)
+        self.umbral = umbral
+        self.limites = superficie.get_rect()
+        self._rects_previos = []
+        self._rects_actuales = []
+        self._redibujo_completo = True # El primer frame siempre es completo
+
+    def begin_frame(self):
+        if self._redibujo_completo:
+            self.superficie.blit(self.fondo, (0, 0))
+        else:
+            for rect in self._rects_previos:
+                self.superficie.blit(self.fondo, rect, rect)
+        self._rects_actuales = []
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        rect = self.superficie.blit(source, dest, area, special_flags)
+        self._rects_actuales.append(rect)
+        return rect
+
+    def blits(self, blit_sequence):
+        rects = self.superficie.blits(blit_sequence)
+        self._rects_actuales.extend(rects)
+        return rects
+
+    def marcar(self, rect):
+        rect = pygame.Rect(rect).clip(self.limites)
+        if rect.width and rect.height:
+            self._rects_actuales.append(rect)
+
+    def marcar_varios(self, rects):
+        for rect in rects:
+            self.marcar(rect)
+
+    def invalidar(self):
+        """Fuerza un redibujado completo en el siguiente frame (ej. al volver de la pausa)."""
+        self._redibujo_completo = True
+
+    def present(self):
+        sucios = self._rects_previos + self._rects_actuales
+        area_sucia = sum(r.width * r.height for r in sucios) # Sobrestima si se solapan: cae antes al frame completo
+        if self._redibujo_completo or area_sucia > self.umbral * self.limites.width * self.limites.height:
+            self._presentar()
+        else:
+            self._presentar(sucios)
+        self._redibujo_completo = False
+        self._rects_previos = self._rects_actuales
+
+
+class TextureRenderer(DirtyRectRenderer):
+    """
+    Renderizado con el backend de texturas (ver texture_backend.BackendTexturas).
+    Las superficies que se reutilizan entre frames (glifos, iconos, anillos del escudo,
+    botones) se dibujan como copias de textura encima de la pantalla; lo demás se dibuja
+    por software en 'superficie' y sólo se suben a la GPU las zonas que cambiaron.
+    Para que el resultado sea el mismo que con las superficies, un dibujo por software que
+    pisa una copia pendiente (dibujada antes) la vuelca primero a 'superficie', junto con
+    las copias anteriores que la solapan: así cada cosa sigue quedando encima de lo que se
+    dibujó antes. Lo que se dibuja directamente sobre 'superficie' tras alguna copia tiene
+    que avisar antes con reservar(rect), o pasar por blit/blits.
+    """
+    def __init__(self, superficie, fondo, backend, umbral=0.4):
+        super().__init__(superficie, fondo, backend.presentar_superficie, umbral)
+        self.backend = backend
+        self._copias = []      # (textura, rect destino, superficie) en orden de dibujo
+        self._rects_copias = [] # Los rect de self._copias, para collidelistall
+
+    def begin_frame(self):
+        super().begin_frame()
+        self._copias = []; self._rects_copias = []
+
+    def _volcar_copias_bajo(self, rect):
+        """Pasa a 'superficie', en orden, las copias pendientes que quedarían encima de 'rect'."""
+        rects = self._rects_copias
+        solapadas = set(pygame.Rect(rect).collidelistall(rects))
+        if not solapadas: return
+        # Las copias anteriores que solapan a una volcada también tienen que quedar debajo de ella
+        for i in range(max(solapadas) - 1, -1, -1):
+            if i not in solapadas and any(j > i and rects[i].colliderect(rects[j]) for j in solapadas):
+                solapadas.add(i)
+        for i in sorted(solapadas):
+            _, destino, superficie = self._copias[i]
+            self._rects_actuales.append(self.superficie.blit(superficie, destino))
+        self._copias = [c for i, c in enumerate(self._copias) if i not in solapadas]
+        self._rects_copias = [r for i, r in enumerate(rects) if i not in solapadas]
+
+    def reservar(self, rect):
+        if self._copias: self._volcar_copias_bajo(rect)
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        tex = self.backend.textura_reutilizada(source) if area is None and not special_flags else None
+        if tex is None:
+            if self._copias:
+                self._volcar_copias_bajo(pygame.Rect(dest.topleft if isinstance(dest, pygame.Rect) else dest, pygame.Rect(area).size if area is not None else source.get_size()))
+            return super().blit(source, dest, area, special_flags)
+        rect = source.get_rect(topleft=dest.topleft if isinstance(dest, pygame.Rect) else dest)
+        self._copias.append((tex, rect, source)); self._rects_copias.append(rect)
+        return rect
+
+    def blits(self, blit_sequence):
+        return [self.blit(*item) for item in blit_sequence]
+
+    def present(self):
+        sucios = self._rects_previos + self._rects_actuales
+        area_sucia = sum(r.width * r.height for r in sucios)
+        if self._redibujo_completo or area_sucia > self.umbral * self.limites.width * self.limites.height:
+            self.backend.actualizar_lienzo(self.superficie)
+        else:
+            self.backend.actualizar_lienzo(self.superficie, sucios)
+        self.backend.presentar_frame([(tex, rect) for tex, rect, _ in self._copias])
+        self._redibujo_completo = False
+        self._rects_previos = self._rects_actuales
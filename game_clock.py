@@ -0,0 +1,82 @@
+# game_clock.py
+
+import heapq
+
+class GameClock:
+    """
+    Reloj de juego: segundos de partida que sólo avanzan cuando la simulación da un paso.
+    No depende del reloj de pared, así que no corre durante la pausa ni entre que se guarda
+    y se carga una partida (se guarda con to_dict y continúa desde el mismo instante).
+    Se lee como un atributo ('ahora') o llamándolo, para usarlo donde antes iba time.time.
+    """
+    def __init__(self, ahora=0.0):
+        self.ahora = ahora
+        self.pausado = False
+
+    def __call__(self):
+        return self.ahora
+
+    def avanzar(self, dt):
+        if not self.pausado: self.ahora += dt
+        return self.ahora
+
+    def pausar(self):
+        self.pausado = True
+
+    def reanudar(self):
+        self.pausado = False
+
+    def to_dict(self):
+        return {"ahora": self.ahora}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("ahora", 0.0))
+
+
+class TimerScheduler:
+    """
+    Temporizadores sobre un GameClock en un montículo ordenado por instante de disparo.
+    procesar() sólo mira la cima, así que cada paso cuesta en función de los temporizadores
+    que vencen y no de los que hay programados. Cancelar es O(1): la entrada se descarta
+    cuando llega a la cima.
+    """
+    def __init__(self, reloj):
+        self.reloj = reloj
+        self._monticulo = [] # (instante, secuencia, acción, argumentos)
+        self._pendientes = set() # Ids programados que no se han disparado ni cancelado
+        self._secuencia = 0
+
+    def __len__(self):
+        return len(self._pendientes)
+
+    def programar_en(self, instante, accion, *args):
+        """Programa accion(*args) para el instante 'instante' del reloj. Retorna un id para cancelarlo."""
+        self._secuencia += 1
+        heapq.heappush(self._monticulo, (instante, self._secuencia, accion, args))
+        self._pendientes.add(self._secuencia)
+        return self._secuencia
+
+    def programar(self, retraso, accion, *args):
+        """Programa accion(*args) dentro de 'retraso' segundos de juego."""
+        return self.programar_en(self.reloj.ahora + retraso, accion, *args)
+
+    def cancelar(self, id_temporizador):
+        self._pendientes.discard(id_temporizador)
+        # Si el montículo acumula demasiadas entradas canceladas, se reconstruye
+        if len(self._monticulo) > 2 * len(self._pendientes) + 32:
+            self._monticulo = [e for e in self._monticulo if e[1] in self._pendientes]
+            heapq.heapify(self._monticulo)
+
+    def procesar(self):
+        """Ejecuta, en orden, las acciones cuyo instante ya llegó. Retorna cuántas se ejecutaron."""
+        monticulo, ahora, n = self._monticulo, self.reloj.ahora, 0
+        while monticulo and monticulo[0][0] <= ahora:
+            _, secuencia, accion, args = heapq.heappop(monticulo)
+            if secuencia not in self._pendientes: continue
+            self._pendientes.discard(secuencia)
+            accion(*args); n += 1
+        return n
+
+    def limpiar(self):
+        self._monticulo.clear(); self._pendientes.clear()
@@ -1,144 +1,99 @@
-import pygame
-import time
-import math
-import pygame.freetype # Necesario para SysFont
+# game_level_manager.py
+
+import bisect
 
 class GameLevelManager:
     """
-    Gestiona la lógica de los niveles del juego, incluyendo la velocidad,
-    los umbrales de aciertos y la visualización de mensajes de nivel.
+    Progresión de niveles y velocidad dirigida por eventos de acierto.
+    Recibe la curva de dificultad {nivel: {"threshold": aciertos, "speed": velocidad}} con
+    cualquier número de niveles y la precalcula al crearse:
+    - los umbrales ordenados, de modo que cada acierto sólo se compara con el umbral
+      del siguiente nivel (O(1));
+    - para cada nivel, la rampa de velocidad hasta el siguiente: la velocidad sube de 0.1 en
+      0.1 repartida entre los aciertos que faltan, y llega a la del siguiente nivel justo
+      en su umbral.
+    La velocidad que guarda es la base; los power-ups (ralentizar) la multiplican aparte.
     """
+    NIVELES_POR_DEFECTO = {
+        1: {"threshold": 0, "speed": 2.0 + 2.0},
+        2: {"threshold": 30, "speed": 2.5 + 1.5},
+        3: {"threshold": 80, "speed": 3.0 + 1.5},
+        4: {"threshold": 150, "speed": 3.5 + 1.5}
+    }
+    INCREMENTO_VELOCIDAD = 0.1
 
-    def __init__(self, initial_speed_unused, screen_width, screen_height, # initial_speed_unused: se mantiene por compatibilidad, pero la velocidad del Nivel 1 es fija.
-                 logo_font_style, gradient_top_color, gradient_bottom_color, border_color,
-                 render_text_gradient_func): 
-        
-        self.current_level = 1
-        self.screen_width = screen_width
-        self.screen_height = screen_height
-
-        self.level_message_visible = False
-        self.level_message_start_time = 0
-        self.level_message_duration = 2.0 # segundos. (Ajustado a 2 segundos para la pausa de letras)
+    def __init__(self, level_data=None):
+        # Las claves pueden venir como texto si la curva se leyó de un JSON
+        curva = sorted((int(nivel), datos) for nivel, datos in (level_data or self.NIVELES_POR_DEFECTO).items())
+        self.niveles = [nivel for nivel, _ in curva]
+        self.umbrales = [datos["threshold"] for _, datos in curva]
+        self.velocidades = [datos["speed"] for _, datos in curva]
+        self._rampas = [self._calcular_rampa(i) for i in range(len(curva))]
+        self._indice = 0 # Posición del nivel actual en la curva
+        self._paso_rampa = 0 # Siguiente escalón de la rampa del nivel actual
+        self.total_aciertos = 0
+        self.speed = self.velocidades[0]
+        self.next_threshold = self._umbral_siguiente()
 
-        # Configuración de estilos para el renderizado del mensaje de nivel
-        self.logo_font_style = logo_font_style
-        self.gradient_top_color = gradient_top_color
-        self.gradient_bottom_color = gradient_bottom_color
-        self.border_color = border_color
-        
-        # Almacenar la función de renderizado de texto para usarla internamente
-        self._render_text_gradient_func = render_text_gradient_func 
+    def _calcular_rampa(self, i):
+        """Lista de (aciertos totales, velocidad) en los que sube la velocidad durante el nivel i."""
+        if i + 1 >= len(self.niveles): return []
+        desde, hasta = self.velocidades[i], self.velocidades[i + 1]
+        aciertos = self.umbrales[i + 1] - self.umbrales[i]
+        incrementos = round((hasta - desde) / self.INCREMENTO_VELOCIDAD)
+        if incrementos <= 0 or aciertos <= 0: return []
+        return [(self.umbrales[i] + (j * aciertos) // incrementos, min(hasta, desde + j * self.INCREMENTO_VELOCIDAD))
+                for j in range(1, incrementos + 1)]
 
-        # Velocidades y umbrales por nivel.
-        # Nivel 1 inicia con 2.0, y los siguientes son multiplicadores de esa BASE (2.0).
-        self.base_speed_level_1 = 2.0 # Velocidad fija para el Nivel 1.
+    def _umbral_siguiente(self):
+        return self.umbrales[self._indice + 1] if self._indice + 1 < len(self.umbrales) else None
 
-        self.level_speeds = {
-            1: self.base_speed_level_1,      # Nivel 1 empieza con velocidad 2.0
-            2: self.base_speed_level_1 * 1.25, # Nivel 2: 25% más rápido (2.0 * 1.25 = 2.5)
-            3: self.base_speed_level_1 * 1.5,  # Nivel 3: 50% más rápido (2.0 * 1.5 = 3.0)
-            4: self.base_speed_level_1 * 1.75, # Nivel 4: 75% más rápido (2.0 * 1.75 = 3.5)
-            5: self.base_speed_level_1 * 2.0,  # Nivel 5: Doble de velocidad (2.0 * 2.0 = 4.0)
-            # Puedes añadir más niveles si lo deseas
-        }
+    @property
+    def current_level(self):
+        return self.niveles[self._indice]
 
-        self.level_thresholds = {
-            1: 0,   # Nivel 1 se activa con 0 aciertos
-            2: 30,  # Nivel 2 se activa con 30 aciertos (solicitado)
-            3: 80,  # Nivel 3 se activa con 80 aciertos
-            4: 150, # Nivel 4 se activa con 150 aciertos
-            5: 250, # Nivel 5 se activa con 250 aciertos
-            # Añade más umbrales si tienes más niveles
-        }
+    def speed_schedule(self, level=None):
+        """Rampa de velocidad del nivel indicado (por defecto el actual): [(aciertos totales, velocidad), ...]."""
+        i = self._indice if level is None else self.niveles.index(level)
+        return list(self._rampas[i])
 
-    def update_level(self, total_correct_hits):
+    def register_hit(self):
         """
-        Actualiza el nivel actual basado en el número total de aciertos.
-        Retorna True si el nivel cambió, False en caso contrario.
+        Cuenta un acierto y aplica la rampa de velocidad.
+        Retorna el nuevo nivel si con este acierto se sube de nivel, o None.
         """
-        new_level_candidate = self.current_level 
+        self.total_aciertos += 1
+        rampa = self._rampas[self._indice]
+        while self._paso_rampa < len(rampa) and self.total_aciertos >= rampa[self._paso_rampa][0]:
+            self.speed = max(self.speed, rampa[self._paso_rampa][1]); self._paso_rampa += 1
+        if self.next_threshold is None or self.total_aciertos < self.next_threshold:
+            return None
+        self._ir_a(bisect.bisect_right(self.umbrales, self.total_aciertos) - 1)
+        return self.current_level
 
-        # Iterar en orden inverso para asegurar que se asigna el nivel más alto posible
-        for level, threshold in sorted(self.level_thresholds.items(), reverse=True):
-            if total_correct_hits >= threshold:
-                new_level_candidate = level
-                break 
-
-        if new_level_candidate > self.current_level:
-            self.current_level = new_level_candidate
-            self.level_message_visible = True
-            self.level_message_start_time = time.time()
-            print(f"¡Nivel {self.current_level} alcanzado! Nueva velocidad base: {self.get_current_level_speed():.2f}")
-            return True
-        return False
-
-    def get_current_level_speed(self):
-        """
-        Retorna la velocidad base del juego para el nivel actual.
-        """
-        # Asegura que siempre se retorne una velocidad, usando la velocidad del Nivel 1 como fallback
-        return self.level_speeds.get(self.current_level, self.level_speeds[1])
-
-    def draw_level_message(self, surface):
-        """
-        Dibuja el mensaje de 'NIVEL X' en la pantalla si está visible.
-        """
-        if self.level_message_visible:
-            elapsed_time = time.time() - self.level_message_start_time
-            if elapsed_time < self.level_message_duration:
-                # Animación de tamaño para el mensaje de nivel (más grande y animado)
-                # Tamaño base 80, oscilación de 20.
-                font_size_anim = int(80 + 20 * math.sin(time.time() * 6)) 
-                font_level = pygame.freetype.SysFont(self.logo_font_style, font_size_anim)
-                
-                text_rect = pygame.Rect(0, 0, self.screen_width, 100)
-                text_rect.center = (self.screen_width // 2, self.screen_height // 2)
-                
-                # Usamos la función de renderizado de texto con degradado
-                self._render_text_gradient_func(font_level, f"NIVEL {self.current_level}", text_rect, surface,
-                                                 [self.gradient_top_color, self.gradient_bottom_color],
-                                                 self.border_color, 3)
-            else:
-                self.level_message_visible = False
-
-    def is_level_message_showing(self):
-        """
-        Retorna True si el mensaje de cambio de nivel está visible, False en caso contrario.
-        """
-        if self.level_message_visible:
-            # Re-verificar si el tiempo ya pasó para actualizar el estado
-            if time.time() - self.level_message_start_time >= self.level_message_duration:
-                self.level_message_visible = False
-                return False
-            return True
-        return False
+    def _ir_a(self, indice):
+        """Pasa al nivel 'indice' de la curva con, al menos, su velocidad."""
+        self._indice = indice
+        self.speed = max(self.speed, self.velocidades[indice])
+        rampa = self._rampas[indice]
+        self._paso_rampa = bisect.bisect_right([aciertos for aciertos, _ in rampa], self.total_aciertos)
+        self.next_threshold = self._umbral_siguiente()
 
     def to_dict(self):
-        """Serializa el estado del GameLevelManager a un diccionario."""
-        return {
-            "current_level": self.current_level,
-            "level_message_visible": self.level_message_visible,
-            "level_message_start_time": self.level_message_start_time,
-            # No guardamos screen_width/height, colores/fuente, ni la función de renderizado
-            # ya que son estáticos o se re-inicializan al cargar.
-        }
+        """Serializa el progreso (no la curva, que viene de las opciones de partida)."""
+        return {"nivel": self.current_level, "aciertos": self.total_aciertos, "velocidad": self.speed}
 
     @classmethod
-    def from_dict(cls, data, initial_speed_unused, screen_width, screen_height,
-                  logo_font_style, gradient_top_color, gradient_bottom_color, border_color,
-                  render_text_gradient_func): 
-        """Deserializa el estado de un diccionario a una instancia de GameLevelManager."""
-        instance = cls(initial_speed_unused, screen_width, screen_height,
-                       logo_font_style, gradient_top_color, gradient_bottom_color, border_color,
-                       render_text_gradient_func) 
-        instance.current_level = data.get("current_level", 1)
-        instance.level_message_visible = data.get("level_message_visible", False)
-        instance.level_message_start_time = data.get("level_message_start_time", 0)
-        
-        # Al cargar, si el mensaje estaba visible y su tiempo ya expiró, lo ocultamos.
-        # Esto evita que aparezca un mensaje viejo al cargar una partida.
-        if instance.level_message_visible and \
-           (time.time() - instance.level_message_start_time >= instance.level_message_duration):
-             instance.level_message_visible = False
-        return instance
\ No newline at end of file
+    def from_dict(cls, data, level_data=None):
+        instance = cls(level_data)
+        instance.restore(data.get("aciertos", 0), data.get("velocidad"))
+        return instance
+
+    def restore(self, total_aciertos, speed=None):
+        """Sitúa la progresión en 'total_aciertos' aciertos; 'speed' conserva una rampa a medio recorrer."""
+        self.total_aciertos = total_aciertos
+        self.speed = self.velocidades[0]
+        self._ir_a(max(0, bisect.bisect_right(self.umbrales, total_aciertos) - 1))
+        rampa = self._rampas[self._indice]
+        if self._paso_rampa: self.speed = max(self.speed, rampa[self._paso_rampa - 1][1])
+        if speed is not None: self.speed = speed
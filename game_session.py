@@ -4,18 +4,51 @@ import pygame
 import pygame.freetype
 import random
 import math
-import time
 import sys
+import time
+from datetime import datetime
 
 from powerups import PowerUp, ShieldPowerUp
 from score_manager import ScoreManager
 from keyboard_layout_manager import KeyboardLayoutManager
+from glyph_atlas import GlyphAtlas
+from letter_index import LetterIndex, tiempo_hasta_salir
+from letter_store import LetterStore
+from game_level_manager import GameLevelManager
+from game_clock import GameClock, TimerScheduler
+from corpus import Corpus, PrefetchQueue
+from word_matcher import MultiTargetMatcher
+from font_registry import get_font
+from render_utils import get_text_surface
+from frame_renderer import FullFrameRenderer, DirtyRectRenderer, TextureRenderer
 
 class GameSession:
     """ Encapsula toda la lógica y el estado de una sesión de juego activa. """
-    def __init__(self, main_module, config, game_options, initial_state=None, save_timestamp=None):
+    NIVELES_ALFA_ESCUDO = 32 # Cuantización del pulso del escudo activo
+    FPS_PANTALLA = 60 # Frecuencia de dibujado; la simulación va a su propio ritmo ("sim_hz")
+    MAX_PASOS_SIM = 5 # Pasos de simulación que se recuperan como máximo tras un tirón
+    # Código de tecla -> letra (la 'Ñ' sólo se usa con la distribución "es", ver teclas_letras)
+    TECLAS_LETRAS = {**{tecla: chr(tecla).upper() for tecla in range(pygame.K_a, pygame.K_z + 1)}, ord('ñ'): 'Ñ'}
+    EVENTOS_PARTIDA = (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION) # Además de EVENTOS_SALIDA
+    # Curva de dificultad y duraciones de power-ups por defecto; se pueden sustituir con
+    # game_options["level_data"] y game_options["powerup_durations"] (ver sweep.py)
+    NIVELES_POR_DEFECTO = GameLevelManager.NIVELES_POR_DEFECTO
+    DURACIONES_POWERUP = {"ralentizar": 10, "escudo": 10, "doble_puntuacion": 5}
+    # Modo enjambre (game_options["swarm"]): letras simultáneas buscadas por nivel, ritmo de aparición
+    # y factor de velocidad para que decenas de letras a la vez sigan siendo jugables
+    ENJAMBRE_DENSIDAD = {1: 12, 2: 24, 3: 48, 4: 96}
+    ENJAMBRE_APARICIONES_POR_SEGUNDO = 8
+    ENJAMBRE_FACTOR_VELOCIDAD = 0.35
+
+    def __init__(self, main_module, config, game_options, initial_state=None, save_timestamp=None, headless=False):
+        """
+        :param main_module: Módulo principal (JuegoLedvin) o, sin pantalla, un anfitrión como headless.AnfitrionHeadless.
+        :param headless: Si es True no se crean fuentes, botones, atlas ni renderizador: sólo se usan
+                         _update_state y los manejadores de teclas (ver headless.simular_sesion).
+        """
         # Referencias al módulo principal
         self.main = main_module
+        self.headless = headless
         self.pantalla = self.main.pantalla
         self.clock = self.main.clock
         
@@ -25,81 +58,108 @@ class GameSession:
         self.save_timestamp = save_timestamp
         self.game_mode = "arcane" if self.game_options["num_jugadores"] == 1 else "versus"
         
-        # Fuentes
-        self.fuente_letras = pygame.freetype.SysFont(self.config["fuente"], self.config["tam"])
-        self.fuente_ui = pygame.freetype.SysFont("arial", 30)
-        
-        # Botón de Pausa
-        fuente_btn_pausa = pygame.freetype.SysFont(self.main.FUENTE_LOGO_STYLE, 20)
-        self.btn_pausa = self.main.Button(self.main.ANCHO - 120, 10, 110, 40, "PAUSA", fuente_btn_pausa, self.main.GRIS_OSCURO, self.main.GRIS_CLARO)
-        self.btn_pausa.set_logo_style(True)
+        # Simulación de paso fijo: el tiempo de juego sólo avanza en pasos de 'paso_sim' segundos
+        self.paso_sim = 1.0 / self.config.get("sim_hz", 60)
+        # Reloj de la partida (no corre en pausa y se guarda con ella) y temporizadores sobre él:
+        # vencimiento de power-ups, mensaje de nivel y límite de tiempo del versus
+        self.reloj = GameClock()
+        self.temporizador = TimerScheduler(self.reloj)
+        self._y_activa_previa = None
+        self._alfa_render = 1.0 # Fracción del paso actual que se interpola al dibujar
+        self.latencias_ms = [] # Desde cada pulsación (o su lectura) hasta que se presenta el frame que la refleja
+        self.origen_latencia = "pulsación" # "lectura" si algún evento no traía 'timestamp' y se midió desde que se leyó
+
+        if headless:
+            self.fuente_letras = None
+        else:
+            # Fuentes
+            self.fuente_letras = get_font(self.config["fuente"], self.config["tam"])
+            self.fuente_ui = get_font("arial", 30)
+
+            # Botón de Pausa
+            fuente_btn_pausa = get_font(self.main.FUENTE_LOGO_STYLE, 20)
+            self.btn_pausa = self.main.Button(self.main.ANCHO - 120, 10, 110, 40, "PAUSA", fuente_btn_pausa, self.main.GRIS_OSCURO, self.main.GRIS_CLARO)
+            self.btn_pausa.set_logo_style(True)
+
+            # Renderizador del frame: texturas (backend sdl2), completo (por defecto) o por rectángulos sucios
+            if self.main.backend_texturas is not None:
+                self.lienzo = TextureRenderer(self.pantalla, self.main.fondo_img, self.main.backend_texturas)
+            else:
+                renderer_cls = DirtyRectRenderer if self.config.get("dirty_rects", False) else FullFrameRenderer
+                self.lienzo = renderer_cls(self.pantalla, self.main.fondo_img, self.main.presentar)
+
+        # Anillos del escudo pre-renderizados (ver _get_shield_frames)
+        self._shield_frames = None; self._shield_frames_tam = None
         
         # Managers
-        self.powerup_manager = PowerUp()
-        self.keyboard_manager = KeyboardLayoutManager()
+        self.powerup_manager = PowerUp(reloj=self.reloj, temporizador=self.temporizador)
+        self.keyboard_manager = KeyboardLayoutManager(self.config.get("teclado", "en"), self.config.get("letras_adaptativas", False), self.config.get("bigramas") or ())
         self.player_managers = {}
 
+        # Atlas de glifos: las letras y los iconos se renderizan una sola vez por sesión
+        if not headless:
+            colores_atlas = [self.config["color"]] if self.game_options["num_jugadores"] == 1 else [self.main.VERDE, self.main.AMARILLO]
+            self.atlas = GlyphAtlas(self.fuente_letras, self.keyboard_manager.all_game_letters + self.keyboard_manager.bigramas, colores_atlas, self.main.spawner_icons)
+            if self.main.backend_texturas is not None: self.main.backend_texturas.precargar(self.atlas.superficies())
+
         # Estado del Juego
-        self.letras_en_pantalla = []
+        self.enjambre = self.game_options["num_jugadores"] == 1 and self.game_options.get("swarm", False)
+        self.densidad_enjambre = {int(n): d for n, d in self.game_options.get("swarm_density", self.ENJAMBRE_DENSIDAD).items()}
+        self._credito_enjambre = 0.0 # Apariciones pendientes acumuladas entre pasos
+        self.letras = LetterStore() # Datos de las letras que caen, por ranura
+        self.letras_en_pantalla = LetterIndex() # Ranuras de self.letras en pantalla, indexadas por su texto
+        # Modo de palabras (1P con "corpus" en la configuración): caen palabras del corpus en vez de letras
+        self.palabras = None
+        if self.game_options["num_jugadores"] == 1 and self.config.get("corpus"):
+            try: self.palabras = PrefetchQueue(Corpus(self.config["corpus"]), self.config.get("corpus_filtros"))
+            except (OSError, ValueError, KeyError) as e: print(f"No se pudo abrir el corpus, se juega con letras: {e}")
+        # Con objetivos de varias letras (palabras o bigramas) las teclas se emparejan con MultiTargetMatcher
+        self.emparejador = None; self._preparar_emparejador()
         self.jugadores = {}
         
         # Lógica de Velocidad y Niveles
-        self.level_data = {
-            1: {"threshold": 0, "speed": 2.0 + 2.0},
-            2: {"threshold": 30, "speed": 2.5 + 1.5},
-            3: {"threshold": 80, "speed": 3.0 + 1.5},
-            4: {"threshold": 150, "speed": 3.5 + 1.5}
-        }
-        self.nivel_actual = 1
-        self.velocidad = self.level_data[1]["speed"]
-        self.target_speed = 0
-        self.hits_since_levelup = 0
-        self.hits_for_increment = 0
+        self.niveles = GameLevelManager(self.game_options.get("level_data"))
+        self.factor_velocidad = 1.0 # 0.5 mientras dura "ralentizar"
+        self.duraciones_powerup = {**self.DURACIONES_POWERUP, **self.game_options.get("powerup_durations", {})}
         
         self.nivel_mostrado = False
-        self.tiempo_mostrar_nivel = 0
+        self._timer_nivel = None
         self.duracion_mensaje_nivel = 2
 
         # Timers y Flags
         self.run_flag = True
-        self.tiempo_inicio_juego = time.time()
-        self.tiempo_pausado_total = 0
-        self.tiempo_transcurrido_cargado = 0
         
         if initial_state:
             self._load_state(initial_state)
         else:
             self._setup_new_game()
             self.main.mostrar_conteo_regresivo(3, self.fuente_letras, self.config["color"])
-            self.tiempo_inicio_juego = time.time()
-        
-        self._calculate_gradual_speed_steps()
+        self.teclas_letras = {tecla: letra for tecla, letra in self.TECLAS_LETRAS.items() if letra in self.keyboard_manager.all_game_letters}
+        if self.game_options.get("time_limit_seconds", 0) > 0:
+            self.temporizador.programar_en(self.game_options["time_limit_seconds"], self._fin_de_tiempo)
 
-    def _calculate_gradual_speed_steps(self):
-        next_level = self.nivel_actual + 1
-        if next_level not in self.level_data:
-            self.hits_for_increment = 0; return
+    @property
+    def tiempo_sim(self):
+        """Segundos de juego de la partida (incluye los de antes de guardarla)."""
+        return self.reloj.ahora
 
-        next_level_info = self.level_data[next_level]
-        self.target_speed = next_level_info["speed"]
-        
-        total_aciertos_actual = sum(m.get_aciertos() for m in self.player_managers.values())
-        hits_to_next_level = next_level_info["threshold"] - total_aciertos_actual
-        speed_diff = self.target_speed - self.velocidad
-        
-        if speed_diff <= 0.01:
-            self.hits_for_increment = 0; return
-            
-        increments_needed = round(speed_diff / 0.1)
-        if increments_needed > 0 and hits_to_next_level > 0:
-            self.hits_for_increment = hits_to_next_level // increments_needed
-        else:
-            self.hits_for_increment = 0
+    tiempo_transcurrido = tiempo_sim
+
+    @property
+    def nivel_actual(self):
+        return self.niveles.current_level
+
+    @property
+    def velocidad(self):
+        """Velocidad efectiva: la base de la progresión de niveles por el factor de los power-ups."""
+        return self.niveles.speed * self.factor_velocidad
 
     def _spawn_new_letters(self, count=1):
         if self.game_options["num_jugadores"] != 1: return
+        velocidad = self.velocidad * self.ENJAMBRE_FACTOR_VELOCIDAD if self.enjambre else self.velocidad
         for _ in range(count):
-            char = self.keyboard_manager.obtener_nueva_letra(player_id="J1", num_jugadores=1)
+            # Si la cola del corpus está vacía en este momento cae una letra: nunca se espera al disco
+            char = (self.palabras.obtener() if self.palabras else None) or self.keyboard_manager.obtener_nueva_letra(player_id="J1", num_jugadores=1)
             letra = {'char': char, 'color': self.config["color"], 'anim_offset': random.uniform(0, 2 * math.pi)}
 
             spawn_type = ''
@@ -120,31 +180,63 @@ class GameSession:
             if spawn_type == 'left':
                 letra.update({
                     'x': -icon_surface.get_width(), 'y': random.randint(50, self.main.ALTO - 150),
-                    'vx': self.velocidad * 0.75, 'vy': self.velocidad * 0.1
+                    'vx': velocidad * 0.75, 'vy': velocidad * 0.1
                 })
             elif spawn_type == 'right':
                 letra.update({
                     'x': self.main.ANCHO + icon_surface.get_width(), 'y': random.randint(50, self.main.ALTO - 150),
-                    'vx': -self.velocidad * 0.75, 'vy': self.velocidad * 0.1
+                    'vx': -velocidad * 0.75, 'vy': velocidad * 0.1
                 })
             elif spawn_type == 'bottom':
                 letra.update({
                     'x': random.randint(self.config["tam"], self.main.ANCHO - self.config["tam"]), 'y': self.main.ALTO + icon_surface.get_height(),
-                    'vx': 0, 'vy': -self.velocidad
+                    'vx': 0, 'vy': -velocidad
                 })
             else:  # top
                 letra.update({
                     'x': random.randint(self.config["tam"], self.main.ANCHO - self.config["tam"]), 'y': -icon_surface.get_height(),
-                    'vx': 0, 'vy': self.velocidad
+                    'vx': 0, 'vy': velocidad
                 })
 
-            self.letras_en_pantalla.append(letra)
+            self._agregar_letra(letra)
+
+    def _agregar_letra(self, letra):
+        """Añade una letra en el formato de diccionario de las partidas guardadas."""
+        slot = self.letras.agregar(letra)
+        self.letras.aparicion[slot] = self.tiempo_sim
+        instante_salida = self.tiempo_sim + tiempo_hasta_salir(letra['x'], letra['y'], letra['vx'], letra['vy'], self.main.ANCHO, self.main.ALTO) / 60
+        self.letras_en_pantalla.agregar(slot, letra['char'], instante_salida)
+        if self.emparejador is not None: self.emparejador.agregar(slot, letra['char'])
+
+    def _quitar_letra(self, slot):
+        self.letras_en_pantalla.quitar(slot); self.letras.quitar(slot)
+        if self.emparejador is not None: self.emparejador.quitar(slot)
+
+    def _preparar_emparejador(self):
+        if self.emparejador is None and self.game_options["num_jugadores"] == 1 and (self.palabras is not None or self.keyboard_manager.bigramas):
+            self.emparejador = MultiTargetMatcher() # Objetivos en pantalla, por ranura
+
+    def _limpiar_letras(self):
+        self.letras.limpiar(); self.letras_en_pantalla.limpiar()
+        if self.emparejador is not None: self.emparejador.limpiar()
+
+    def _reponer_letras(self, count):
+        """En el modo clásico, cuando no quedan letras aparecen 'count' nuevas (el enjambre se repone solo)."""
+        if not self.enjambre and not self.letras_en_pantalla:
+            self._spawn_new_letters(count=count)
+
+    def _alimentar_enjambre(self, dt):
+        objetivo = self.densidad_enjambre.get(self.nivel_actual, max(self.densidad_enjambre.values()))
+        self._credito_enjambre = min(self._credito_enjambre + dt * self.ENJAMBRE_APARICIONES_POR_SEGUNDO, objetivo)
+        n = min(int(self._credito_enjambre), objetivo - len(self.letras_en_pantalla))
+        if n > 0:
+            self._spawn_new_letters(count=n); self._credito_enjambre -= n
 
 
     def _setup_new_game(self):
         if self.game_options["num_jugadores"] == 1:
             self.player_managers["J1"] = ScoreManager()
-            self.letras_en_pantalla = []
+            self._limpiar_letras()
             self._spawn_new_letters(count=1)
         else:
             self.player_managers["J1"] = ScoreManager(); self.player_managers["J2"] = ScoreManager()
@@ -153,97 +245,186 @@ class GameSession:
             self.active_letter = self.keyboard_manager.obtener_nueva_letra(player_id="J1", num_jugadores=2)
             self.active_letter_y = 0
             self.active_letter_x = random.randint(self.config["tam"], self.main.ANCHO // 2 - self.config["tam"])
+            self._aparicion_activa = self.tiempo_sim
             
     def _load_state(self, state):
-        self.velocidad = state.get("velocidad", self.game_options["initial_speed"])
-        self.tiempo_transcurrido_cargado = state.get("tiempo_transcurrido", 0)
-        self.keyboard_manager = KeyboardLayoutManager.from_dict(state.get("keyboard_layout_manager", {}))
-        self.powerup_manager.activos = state.get("power_ups_activos", {})
+        self.reloj.ahora = state.get("reloj", {}).get("ahora", state.get("tiempo_transcurrido", 0))
+        activos = state.get("power_ups_activos", {})
+        # Sin "reloj", la partida se guardó con los power-ups en tiempo de pared
+        self.powerup_manager.restaurar(activos if "reloj" in state else self._convertir_powerups_antiguos(activos))
+        self.keyboard_manager = KeyboardLayoutManager.from_dict(state.get("keyboard_layout_manager", {}), self.keyboard_manager.layout, self.keyboard_manager.adaptativo)
+        self._preparar_emparejador() # La partida guardada puede traer bigramas
         self.player_managers["J1"] = ScoreManager.from_dict(state.get("score_manager_j1", {}))
         if self.game_options["num_jugadores"] == 2: self.player_managers["J2"] = ScoreManager.from_dict(state.get("score_manager_j2", {}))
-        if self.game_options["num_jugadores"] == 1: self.letras_en_pantalla = state.get("letras_en_pantalla", [])
+        if self.game_options["num_jugadores"] == 1:
+            self._limpiar_letras()
+            for letra in state.get("letras_en_pantalla", []): self._agregar_letra(letra)
         else:
             self.jugadores = {"J1": {"color": self.main.VERDE}, "J2": {"color": self.main.AMARILLO}}
             self.current_turn_player = state.get("current_turn_player", "J1")
             self.active_letter = state.get("active_letter"); self.active_letter_x = state.get("active_letter_x"); self.active_letter_y = state.get("active_letter_y")
+            self._aparicion_activa = self.tiempo_sim
         if self.powerup_manager.esta_activo("doble_puntuacion"):
             for manager in self.player_managers.values(): manager.activate_double_score()
+        if self.powerup_manager.esta_activo("ralentizar"): self.factor_velocidad = 0.5
+        if "progresion" in state:
+            self.niveles = GameLevelManager.from_dict(state["progresion"], self.game_options.get("level_data"))
+        else: # Partidas guardadas antes de guardar la progresión: se deduce de los aciertos y la velocidad
+            velocidad = state.get("velocidad", self.game_options["initial_speed"]) / self.factor_velocidad
+            self.niveles.restore(sum(m.get_aciertos() for m in self.player_managers.values()), velocidad)
         self.main.mostrar_conteo_regresivo(3, self.fuente_letras, self.config["color"])
-        self.tiempo_inicio_juego = time.time()
+
+    def _convertir_powerups_antiguos(self, activos):
+        """
+        Pasa los instantes de activación guardados con time.time() al reloj de la partida,
+        descontando sólo el tiempo de juego que transcurrió hasta que se guardó.
+        """
+        guardado = datetime.fromisoformat(self.save_timestamp).timestamp() if self.save_timestamp else time.time()
+        return {tipo: {**info, "tiempo_activado": self.reloj.ahora - (guardado - info["tiempo_activado"])} for tipo, info in activos.items()}
+
+    def _fin_de_tiempo(self):
+        self.run_flag = False
 
     def _create_save_state(self):
-        tiempo_transcurrido = (time.time()-self.tiempo_inicio_juego-self.tiempo_pausado_total)+self.tiempo_transcurrido_cargado
-        state = {"velocidad": self.velocidad, "tiempo_transcurrido": tiempo_transcurrido,
+        state = {"velocidad": self.velocidad, "tiempo_transcurrido": self.tiempo_transcurrido, "reloj": self.reloj.to_dict(),
                  "fallos_limit": self.game_options["fallos_limit"], "score_manager_j1": self.player_managers["J1"].to_dict(),
-                 "keyboard_layout_manager": self.keyboard_manager.to_dict(), "power_ups_activos": self.powerup_manager.activos}
-        if self.game_options["num_jugadores"] == 1: state["letras_en_pantalla"] = self.letras_en_pantalla
+                 "keyboard_layout_manager": self.keyboard_manager.to_dict(), "power_ups_activos": self.powerup_manager.activos,
+                 "progresion": self.niveles.to_dict()}
+        if self.game_options["num_jugadores"] == 1: state.update({"letras_en_pantalla": [self.letras.a_dict(s) for s in self.letras_en_pantalla], "swarm": self.enjambre})
         else: state.update({"score_manager_j2": self.player_managers["J2"].to_dict(), "time_limit_seconds": self.game_options["time_limit_seconds"],
                               "current_turn_player": self.current_turn_player, "active_letter": self.active_letter,
                               "active_letter_x": self.active_letter_x, "active_letter_y": self.active_letter_y})
         return state
 
+    def _filtrar_eventos(self, activo):
+        """Durante la partida sólo llegan a la cola los eventos que se atienden (activo=False los permite todos)."""
+        if activo:
+            pygame.event.set_blocked(None); pygame.event.set_allowed(list(self.main.EVENTOS_SALIDA) + list(self.EVENTOS_PARTIDA))
+        else:
+            pygame.event.set_allowed(None)
+
     def _handle_pause(self):
-        tiempo_inicio_pausa = time.time()
+        self.reloj.pausar(); self._filtrar_eventos(False)
         accion_pausa = self.main.pantalla_de_pausa()
-        self.tiempo_pausado_total += time.time() - tiempo_inicio_pausa
+        self.reloj.reanudar(); self._filtrar_eventos(True)
+        self.lienzo.invalidar() # La pausa pintó toda la pantalla
+        self.clock.tick() # El tiempo en pausa no cuenta para la simulación
         if accion_pausa == "guardar_y_salir":
             self.main.guardar_partida(self._create_save_state(), self.game_mode, self.save_timestamp)
             self.run_flag = False; return "menu_principal"
         elif accion_pausa == "salir_sin_guardar":
             self.run_flag = False; return "menu_principal"
-        elif accion_pausa == "reanudar":
-            tiempo_actual = time.time(); self.tiempo_transcurrido_cargado += (tiempo_actual - self.tiempo_inicio_juego - self.tiempo_pausado_total)
-            self.tiempo_inicio_juego = tiempo_actual; self.tiempo_pausado_total = 0
 
-    def _handle_events(self):
+    def _handle_events(self, pulsaciones):
+        """
+        Atiende los eventos de la cola. Las letras no se juzgan aquí: se añaden a 'pulsaciones'
+        como (timestamp del evento en ms de pygame.time o None, instante desde el que se mide su
+        latencia, letra) para aplicarlas en el paso de simulación en que se pulsaron (ver run).
+        pygame 2.6 no pone 'timestamp' en los eventos: entonces la latencia se mide desde la lectura.
+        """
         for evento in pygame.event.get():
-            if evento.type == pygame.QUIT: self.run_flag = False; return "quit"
-            if self.btn_pausa.handle_event(evento) or (evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE): return self._handle_pause()
-            if evento.type == pygame.KEYDOWN and pygame.K_a <= evento.key <= pygame.K_z: self._handle_keypress(pygame.key.name(evento.key).upper())
+            if evento.type in self.main.EVENTOS_SALIDA: self.run_flag = False; return "quit"
+            if evento.type == pygame.KEYDOWN:
+                letra = self.teclas_letras.get(evento.key)
+                if letra:
+                    marca = getattr(evento, "timestamp", None)
+                    if marca is None: self.origen_latencia = "lectura"
+                    pulsaciones.append((marca, marca if marca is not None else pygame.time.get_ticks(), letra)); continue
+            if self.btn_pausa.handle_event(evento) or (evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE):
+                # Lo pulsado antes de la pausa cuenta, pero su latencia no (incluiría la pausa)
+                for _, _, letra in pulsaciones: self._handle_keypress(letra)
+                pulsaciones.clear()
+                return self._handle_pause()
         return None
 
     def _handle_keypress(self, typed_letter):
         acierto = False
         if self.game_options["num_jugadores"] == 1: acierto = self._handle_keypress_j1(typed_letter)
         else: acierto = self._handle_keypress_j2(typed_letter)
-        if acierto: self._check_gradual_speed_increase()
-
-    def _check_gradual_speed_increase(self):
-        self.hits_since_levelup += 1
-        if self.hits_for_increment > 0 and self.hits_since_levelup >= self.hits_for_increment:
-            if self.velocidad < self.target_speed:
-                self.velocidad = min(self.target_speed, self.velocidad + 0.1)
-                self.hits_since_levelup = 0
+        if acierto and self.niveles.register_hit() is not None: self._subir_nivel()
+
+    def _registrar_tecla(self, jugador, letra, acierto, reaccion=None):
+        """Estadísticas por tecla del jugador y pesos del muestreo adaptativo de letras."""
+        self.player_managers[jugador].registrar_tecla(letra, acierto, reaccion)
+        self.keyboard_manager.registrar_resultado(letra, acierto, reaccion)
+
+    def _subir_nivel(self):
+        self.nivel_mostrado = True
+        self.temporizador.cancelar(self._timer_nivel)
+        self._timer_nivel = self.temporizador.programar(self.duracion_mensaje_nivel, setattr, self, "nivel_mostrado", False)
+        self.main.crear_particulas(self.main.ANCHO//2, self.main.ALTO//2, self.main.AMARILLO, emisor="nivel")
     
     def _handle_keypress_j1(self, typed_letter):
-        j1_manager = self.player_managers["J1"]; letra_acertada = None
-        for letra in self.letras_en_pantalla:
-            if typed_letter == letra['char']: letra_acertada = letra; break
+        if self.emparejador is not None: return self._handle_keypress_emparejador(typed_letter)
+        letra_acertada = self.letras_en_pantalla.primera_con(typed_letter)
         
-        if letra_acertada:
-            j1_manager.add_score(); self.main.acierto_sound.play()
-            self.main.crear_particulas(letra_acertada["x"], letra_acertada["y"], letra_acertada["color"])
-            self.letras_en_pantalla.remove(letra_acertada)
-            if not self.letras_en_pantalla:
-                self._spawn_new_letters(count=2 if self.nivel_actual >= 3 else 1)
-            if j1_manager.get_aciertos()%10==0 and not self.powerup_manager.activos: self._spawn_powerup()
+        if letra_acertada is not None:
+            self._registrar_tecla("J1", self.letras.char[letra_acertada], True, self.tiempo_sim - self.letras.aparicion[letra_acertada])
+            self._acertar_letra(letra_acertada)
             return True
         else:
-            # --- NUEVA LÓGICA DE FALLO PARA 1P ---
+            self._fallar_letra()
+            return False
+
+    def _acertar_letra(self, slot):
+        j1_manager = self.player_managers["J1"]
+        j1_manager.add_score()
+        if self.main.acierto_sound: self.main.acierto_sound.play()
+        self.main.crear_particulas(self.letras.x[slot], self.letras.y[slot], self.letras.color[slot])
+        self._quitar_letra(slot)
+        self._reponer_letras(2 if self.nivel_actual >= 3 else 1)
+        if j1_manager.get_aciertos()%10==0 and not self.powerup_manager.activos: self._spawn_powerup()
+
+    def _fallar_letra(self):
+        # --- NUEVA LÓGICA DE FALLO PARA 1P ---
+        j1_manager = self.player_managers["J1"]
+        if self.letras_en_pantalla:
+            # Penaliza eliminando la letra más peligrosa (la que antes saldría de la pantalla)
+            letra_a_eliminar = self.letras_en_pantalla.mas_peligrosa()
+            self._registrar_tecla("J1", self._objetivo_estadisticas(letra_a_eliminar), False)
+            self._handle_miss(j1_manager, (self.letras.x[letra_a_eliminar], self.letras.y[letra_a_eliminar]))
+            self._quitar_letra(letra_a_eliminar)
+            self._reponer_letras(1)
+        else:
             self._handle_miss(j1_manager)
-            if self.letras_en_pantalla:
-                # Penaliza eliminando la letra más baja (más peligrosa)
-                letra_a_eliminar = max(self.letras_en_pantalla, key=lambda l: l['y'])
-                self.letras_en_pantalla.remove(letra_a_eliminar)
-                if not self.letras_en_pantalla:
-                    self._spawn_new_letters(count=1)
+
+    def _objetivo_estadisticas(self, slot):
+        """
+        Lo que se anota en las estadísticas por la letra de 'slot': el objetivo entero (letra o
+        bigrama, para que cuente en el muestreo adaptativo) o, en el modo de palabras, su primera letra.
+        """
+        return self.letras.char[slot][0] if self.palabras is not None else self.letras.char[slot]
+
+    def _handle_keypress_emparejador(self, typed_letter):
+        """
+        Palabras o bigramas: cada tecla avanza a la vez todos los objetivos en pantalla que
+        empiezan por lo escrito (ver MultiTargetMatcher) y, al completar un texto, se acierta
+        el objetivo más antiguo con ese texto. Equivocarse a mitad de uno cuenta como fallo y
+        obliga a empezar de nuevo (los objetivos siguen cayendo); pulsar una letra con la que no
+        empieza ninguno penaliza como en el modo de letras. Retorna True al completar un objetivo.
+        En el modo de palabras las estadísticas van por tecla; si no, por objetivo.
+        """
+        emparejador, por_tecla = self.emparejador, self.palabras is not None
+        candidata, escritas = emparejador.candidato(), len(emparejador.escrito)
+        resultado, slot = emparejador.pulsar(typed_letter)
+        if resultado == emparejador.FALLO:
+            if candidata is None:
+                self._fallar_letra(); return False
+            objetivo = self.letras.char[candidata]
+            self._registrar_tecla("J1", objetivo[escritas] if por_tecla else objetivo, False)
+            self._handle_miss(self.player_managers["J1"], (self.letras.x[candidata], self.letras.y[candidata]))
             return False
+        if por_tecla: self._registrar_tecla("J1", typed_letter, True)
+        if resultado == emparejador.AVANCE: return False
+        if not por_tecla: self._registrar_tecla("J1", self.letras.char[slot], True, self.tiempo_sim - self.letras.aparicion[slot])
+        self._acertar_letra(slot)
+        return True
 
     def _change_turn_versus(self):
         """Función auxiliar para cambiar de turno en modo versus."""
         self.current_turn_player = "J2" if self.current_turn_player == "J1" else "J1"
         self.active_letter = self.keyboard_manager.obtener_nueva_letra(player_id=self.current_turn_player, num_jugadores=2)
-        self.active_letter_y = 0; margen = self.config["tam"]
+        self.active_letter_y = 0; self._y_activa_previa = None; self._aparicion_activa = self.tiempo_sim; margen = self.config["tam"]
         if self.current_turn_player == "J1":
             self.active_letter_x = random.randint(margen, self.main.ANCHO//2 - margen)
         else:
@@ -252,116 +433,145 @@ class GameSession:
     def _handle_keypress_j2(self, typed_letter):
         current_manager = self.player_managers[self.current_turn_player]
         if typed_letter == self.active_letter:
-            current_manager.add_score(); self.main.acierto_sound.play()
+            current_manager.add_score()
+            self._registrar_tecla(self.current_turn_player, typed_letter, True, self.tiempo_sim - self._aparicion_activa)
+            if self.main.acierto_sound: self.main.acierto_sound.play()
             if current_manager.get_aciertos()%10==0 and not self.powerup_manager.activos: self._spawn_powerup()
             self._change_turn_versus()
             return True
         else:
             # --- NUEVA LÓGICA DE FALLO PARA 2P ---
-            self._handle_miss(current_manager)
+            self._registrar_tecla(self.current_turn_player, self.active_letter, False)
+            self._handle_miss(current_manager, (self.active_letter_x, self.active_letter_y))
             self._change_turn_versus() # También cambia de turno al fallar
             return False
 
-    def _handle_miss(self, manager):
+    def _handle_miss(self, manager, pos=None):
         shielded_hit = self.powerup_manager.esta_activo("escudo")
         manager.handle_miss(shielded=shielded_hit)
+        if shielded_hit and pos: self.main.crear_particulas(pos[0], pos[1], (20, 200, 255), emisor="escudo")
         if shielded_hit and self.main.shield_hit_sound: self.main.shield_hit_sound.play()
         elif not shielded_hit and self.main.fallo_sound: self.main.fallo_sound.play()
             
     def _spawn_powerup(self):
-        effects = {"ralentizar": {"d": 10, "s": self.main.powerup_activate_sound, "e": lambda: setattr(self, 'velocidad', self.velocidad/2)},
-                   "escudo": {"d": 10, "s": self.main.powerup_activate_sound, "e": None},
-                   "doble_puntuacion": {"d": 5, "s": self.main.double_score_activate_sound, "e": lambda: [m.activate_double_score() for m in self.player_managers.values()]}}
+        d = self.duraciones_powerup
+        effects = {"ralentizar": {"d": d["ralentizar"], "s": self.main.powerup_activate_sound, "e": lambda: setattr(self, 'factor_velocidad', 0.5)},
+                   "escudo": {"d": d["escudo"], "s": self.main.powerup_activate_sound, "e": None},
+                   "doble_puntuacion": {"d": d["doble_puntuacion"], "s": self.main.double_score_activate_sound, "e": lambda: [m.activate_double_score() for m in self.player_managers.values()]}}
         tipo = random.choice(list(effects.keys())); info = effects[tipo]
         self.powerup_manager.activar(tipo, info["d"])
         if info["s"]: info["s"].play()
         if info["e"]: info["e"]()
 
+    def _guardar_posiciones_previas(self):
+        """Guarda las posiciones al inicio de un paso para interpolar el dibujo entre pasos."""
+        if self.game_options["num_jugadores"] == 1:
+            self.letras.guardar_previas()
+        else:
+            self._y_activa_previa = self.active_letter_y
+
+    def _y_activa_interpolada(self):
+        if self._y_activa_previa is None: return self.active_letter_y
+        return self._y_activa_previa + (self.active_letter_y - self._y_activa_previa) * self._alfa_render
+
+    def simular_paso(self):
+        """Avanza la simulación un paso fijo (lo usan run() y el motor sin pantalla)."""
+        self._guardar_posiciones_previas()
+        self._update_state(self.paso_sim)
+
     def _update_state(self, dt):
-        tiempo_actual = time.time()
-        self.tiempo_transcurrido = (tiempo_actual-self.tiempo_inicio_juego-self.tiempo_pausado_total)+self.tiempo_transcurrido_cargado
+        """Avanza la simulación 'dt' segundos (en run() siempre es un paso fijo 'paso_sim')."""
+        self.reloj.avanzar(dt)
+        self.temporizador.procesar()
         terminados = self.powerup_manager.actualizar()
         for tipo in terminados:
-            if tipo == "ralentizar": self.velocidad *= 2
+            if tipo == "ralentizar": self.factor_velocidad = 1.0
             elif tipo == "doble_puntuacion": [m.deactivate_double_score() for m in self.player_managers.values()]
         
-        total_aciertos = sum(m.get_aciertos() for m in self.player_managers.values())
-        nuevo_nivel = self.nivel_actual
-        for level, data in sorted(self.level_data.items(), reverse=True):
-            if total_aciertos >= data["threshold"]: nuevo_nivel = level; break
-        if nuevo_nivel != self.nivel_actual:
-            self.nivel_actual = nuevo_nivel; self.nivel_mostrado = True
-            self.tiempo_mostrar_nivel = time.time(); self.hits_since_levelup = 0
-            self._calculate_gradual_speed_steps()
-        if self.nivel_mostrado and (time.time()-self.tiempo_mostrar_nivel > self.duracion_mensaje_nivel): self.nivel_mostrado = False
         
         if self.game_options["num_jugadores"] == 1:
-            for letra in list(self.letras_en_pantalla):
-                letra['x'] += letra['vx'] * 60 * dt
-                letra['y'] += letra['vy'] * 60 * dt
-
-                if (letra['y'] > self.main.ALTO + 100 or letra['y'] < -100 or letra['x'] > self.main.ANCHO + 100 or letra['x'] < -100):
-                    self._handle_miss(self.player_managers["J1"])
-                    self.letras_en_pantalla.remove(letra)
-                    if not self.letras_en_pantalla:
-                        self._spawn_new_letters(count=2 if self.nivel_actual >= 3 else 1)
+            self.letras.integrar(60 * dt)
+            for slot in self.letras.fuera_de_limites(-100, -100, self.main.ANCHO + 100, self.main.ALTO + 100):
+                self._handle_miss(self.player_managers["J1"])
+                self._registrar_tecla("J1", self._objetivo_estadisticas(slot), False)
+                self._quitar_letra(slot)
+                self._reponer_letras(2 if self.nivel_actual >= 3 else 1)
+            if self.enjambre: self._alimentar_enjambre(dt)
         else:
             self.active_letter_y += self.velocidad * 60 * dt
             if self.active_letter_y > self.main.ALTO:
                 self._handle_miss(self.player_managers[self.current_turn_player])
+                self._registrar_tecla(self.current_turn_player, self.active_letter, False)
                 self._change_turn_versus() # También cambia de turno si la letra se va de la pantalla
         
-        if self.game_options.get("time_limit_seconds",0)>0 and self.tiempo_transcurrido >= self.game_options["time_limit_seconds"]: self.run_flag=False
         if any(m.get_fallos() >= self.game_options.get("fallos_limit",999) for m in self.player_managers.values()): self.run_flag=False
             
-    def _draw_elements(self):
-        self.pantalla.blit(self.main.fondo_img, (0, 0)); self.main.dibujar_estrellas(1)
-        if self.game_options["num_jugadores"] == 2: pygame.draw.line(self.pantalla, self.main.BLANCO, (self.main.ANCHO // 2, 0), (self.main.ANCHO // 2, self.main.ALTO), 2)
+    def _draw_elements(self, alfa=1.0):
+        """Dibuja el frame interpolando las posiciones una fracción 'alfa' entre el paso anterior y el actual."""
+        self._alfa_render = alfa
+        self.lienzo.begin_frame(); self.lienzo.marcar_varios(self.main.dibujar_estrellas(1))
+        if self.game_options["num_jugadores"] == 2: self.lienzo.marcar(pygame.draw.line(self.pantalla, self.main.BLANCO, (self.main.ANCHO // 2, 0), (self.main.ANCHO // 2, self.main.ALTO), 2))
         
-        tiempo_actual = time.time(); anim_amplitud = 15; anim_frecuencia = 5
+        tiempo_actual = self.tiempo_sim + alfa * self.paso_sim; anim_amplitud = 15; anim_frecuencia = 5
         if self.game_options["num_jugadores"] == 1:
-            for letra in self.letras_en_pantalla:
+            letras = self.letras
+            xs, ys = letras.posiciones_interpoladas(alfa)
+            for slot in self.letras_en_pantalla:
                 
-                pos_letra_x = letra['x']
-                pos_letra_y = letra['y']
+                centro_x, centro_y = xs[slot], ys[slot]
+                pos_letra_x = centro_x
+                pos_letra_y = centro_y
                 
-                if letra.get('has_icon', False):
-                    icon_surface = self.main.spawner_icons[letra['icon_type']]
-                    
-                    if letra['icon_type'] == 'icono_lateral' and letra['vx'] < 0:
-                        icon_surface = pygame.transform.flip(icon_surface, True, False)
+                icon_type = letras.icon_type[slot]
+                if icon_type is not None:
+                    vx = letras.vx[slot]
+                    icon_surface = self.atlas.get_icon(icon_type, flipped=(icon_type == 'icono_lateral' and vx < 0))
                     
-                    icon_rect = icon_surface.get_rect(center=(letra['x'], letra['y']))
+                    icon_rect = icon_surface.get_rect(center=(centro_x, centro_y))
                     
                     distancia_remolque = 20
-                    if letra['icon_type'] == 'avion':
+                    if icon_type == 'avion':
                         pos_letra_y = icon_rect.bottom + distancia_remolque
                     else: # icono_lateral
-                        if letra['vx'] > 0:
+                        if vx > 0:
                            pos_letra_x = icon_rect.left - distancia_remolque
                         else:
                            pos_letra_x = icon_rect.right + distancia_remolque
                     
-                    self.pantalla.blit(icon_surface, icon_rect)
-
-                desplazamiento_x_sin = math.sin(tiempo_actual * anim_frecuencia + letra['anim_offset']) * anim_amplitud
-                letra_surf, letra_rect = self.fuente_letras.render(letra["char"], letra["color"])
-                letra_rect.center = (pos_letra_x + desplazamiento_x_sin, pos_letra_y)
-                self.pantalla.blit(letra_surf, letra_rect)
+                    self.lienzo.blit(icon_surface, icon_rect)
+
+                desplazamiento_x_sin = math.sin(tiempo_actual * anim_frecuencia + letras.anim_offset[slot]) * anim_amplitud
+                letra_surf = self._superficie_objetivo(letras.char[slot], letras.color[slot])
+                letra_rect = letra_surf.get_rect(center=(pos_letra_x + desplazamiento_x_sin, pos_letra_y))
+                self.lienzo.blit(letra_surf, letra_rect)
+                escritas = self.emparejador.progreso(slot) if self.emparejador is not None else 0
+                if escritas: # Resalta lo ya escrito de la palabra
+                    # Los prefijos no son un conjunto fijo: caché LRU de render_utils, no el atlas
+                    prefijo_surf = get_text_surface(self.fuente_letras, letras.char[slot][:escritas], self.main.AMARILLO)
+                    self.lienzo.blit(prefijo_surf, prefijo_surf.get_rect(midleft=letra_rect.midleft))
 
         else:
             desplazamiento_x_sin = math.sin(tiempo_actual * anim_frecuencia) * anim_amplitud
-            self.fuente_letras.render_to(self.pantalla, (self.active_letter_x + desplazamiento_x_sin, self.active_letter_y), self.active_letter, self.jugadores[self.current_turn_player]["color"])
+            letra_surf = self.atlas.get_glyph(self.active_letter, self.jugadores[self.current_turn_player]["color"])
+            self.lienzo.blit(letra_surf, (self.active_letter_x + desplazamiento_x_sin, self._y_activa_interpolada()))
 
-        self.main.actualizar_y_dibujar_particulas(); self._draw_hud(); self._draw_shield_effect()
+        self.main.actualizar_y_dibujar_particulas(self.lienzo); self._draw_hud(); self._draw_shield_effect(tiempo_actual)
         
         if self.nivel_mostrado:
-            fuente_nivel = pygame.freetype.SysFont(self.main.FUENTE_LOGO_STYLE, int(60 + 10 * math.sin(tiempo_actual * 6)))
+            fuente_nivel = get_font(self.main.FUENTE_LOGO_STYLE, int(60 + 10 * math.sin(tiempo_actual * 6)))
             rect_nivel = pygame.Rect(0, 0, self.main.ANCHO, 100); rect_nivel.center = (self.main.ANCHO//2, self.main.ALTO//2)
-            self.main.render_text_gradient(fuente_nivel, f"NIVEL {self.nivel_actual}", rect_nivel, self.pantalla, [self.main.AMARILLO, self.main.BLANCO], self.main.COLOR_CONTORNO, 3)
+            self.main.render_text_gradient(fuente_nivel, f"NIVEL {self.nivel_actual}", rect_nivel, self.lienzo, [self.main.AMARILLO, self.main.BLANCO], self.main.COLOR_CONTORNO, 3)
 
-        self.btn_pausa.draw(self.pantalla)
-        pygame.display.flip()
+        self.btn_pausa.draw(self.lienzo)
+        self.lienzo.present()
+
+    def _superficie_objetivo(self, texto, color):
+        """
+        Superficie de una letra o bigrama (del GlyphAtlas) o de una palabra del corpus. Las palabras
+        no se guardan en el atlas, que duraría toda la sesión: pasan por la caché LRU de render_utils.
+        """
+        if self.palabras is None: return self.atlas.get_glyph(texto, color)
+        return get_text_surface(self.fuente_letras, texto, color)
 
     def _draw_hud(self):
         if self.game_options["num_jugadores"] == 2:
@@ -371,72 +581,132 @@ class GameSession:
             texto_j1 = f"M. Izquierda: {self.player_managers['J1'].get_score()} (Fallos: {self.player_managers['J1'].get_fallos()})"
             surf_j1, rect_j1 = self.fuente_ui.render(texto_j1, p1_color)
             rect_j1.center = (self.main.ANCHO // 4, 25)
-            self.pantalla.blit(surf_j1, rect_j1)
+            self.lienzo.blit(surf_j1, rect_j1)
 
             texto_j2 = f"M. Derecha: {self.player_managers['J2'].get_score()} (Fallos: {self.player_managers['J2'].get_fallos()})"
             surf_j2, rect_j2 = self.fuente_ui.render(texto_j2, p2_color)
             rect_j2.center = (self.main.ANCHO * 3 // 4, 25)
-            self.pantalla.blit(surf_j2, rect_j2)
+            self.lienzo.blit(surf_j2, rect_j2)
             
-            pygame.draw.circle(self.pantalla, self.jugadores[self.current_turn_player]['color'], (self.main.ANCHO//4 if self.current_turn_player=='J1' else 3*self.main.ANCHO//4, 60), 10)
+            centro_turno = (self.main.ANCHO//4 if self.current_turn_player=='J1' else 3*self.main.ANCHO//4, 60)
+            self.lienzo.reservar(pygame.Rect(centro_turno[0] - 10, centro_turno[1] - 10, 21, 21))
+            self.lienzo.marcar(pygame.draw.circle(self.pantalla, self.jugadores[self.current_turn_player]['color'], centro_turno, 10))
         else:
             p1_color = self.config["color"]
-            self.fuente_ui.render_to(self.pantalla, (10, 10), f"Puntaje: {self.player_managers['J1'].get_score()} (Fallos: {self.player_managers['J1'].get_fallos()})", p1_color)
+            self._texto_hud((10, 10), f"Puntaje: {self.player_managers['J1'].get_score()} (Fallos: {self.player_managers['J1'].get_fallos()})", p1_color)
 
         if self.game_options["time_limit_seconds"] > 0:
             tiempo_restante = max(0, self.game_options["time_limit_seconds"]-int(self.tiempo_transcurrido))
             minutos, segundos = divmod(int(tiempo_restante), 60)
-            self.fuente_ui.render_to(self.pantalla, (self.main.ANCHO//2-70, 50), f"Tiempo: {minutos:02d}:{segundos:02d}", self.main.BLANCO)
+            self._texto_hud((self.main.ANCHO//2-70, 50), f"Tiempo: {minutos:02d}:{segundos:02d}", self.main.BLANCO)
         
         if self.game_options["num_jugadores"] == 1 and self.player_managers["J1"].get_racha() > 1:
             racha = self.player_managers["J1"].get_racha(); combo_text = f"COMBO x{racha}"
             combo_color = self.main.ROJO if racha>=20 else self.main.AMARILLO if racha>=10 else self.main.BLANCO
-            fuente_combo = pygame.freetype.SysFont("arial", 40)
+            fuente_combo = get_font("arial", 40)
             texto_surf, texto_rect = fuente_combo.render(combo_text, combo_color)
             offset_x = random.randint(-2, 2) if racha>=15 else 0; offset_y = random.randint(-2, 2) if racha>=15 else 0
             pos_x = (self.main.ANCHO - texto_rect.width)//2+offset_x; pos_y = 20+offset_y
-            self.pantalla.blit(texto_surf, (pos_x, pos_y))
+            self.lienzo.blit(texto_surf, (pos_x, pos_y))
 
         y_pu_hud = self.main.ALTO-self.main.icon_size-50; x_pu_hud = self.main.ANCHO-self.main.icon_size-50
         for tipo in self.powerup_manager.activos:
-            self.pantalla.blit(self.main.powerup_icons[tipo], (x_pu_hud, y_pu_hud))
+            self.lienzo.blit(self.main.powerup_icons[tipo], (x_pu_hud, y_pu_hud))
             tiempo_restante_pu = int(self.powerup_manager.get_remaining_time(tipo))
-            font_time = pygame.freetype.SysFont("arial", 18)
+            font_time = get_font("arial", 18)
             time_surf, time_rect = font_time.render(f"{tiempo_restante_pu}s", self.main.BLANCO)
-            time_rect.midright = (x_pu_hud-5, y_pu_hud+self.main.icon_size//2); self.pantalla.blit(time_surf, time_rect)
+            time_rect.midright = (x_pu_hud-5, y_pu_hud+self.main.icon_size//2); self.lienzo.blit(time_surf, time_rect)
             y_pu_hud -= (self.main.icon_size + 10)
 
-    def _draw_shield_effect(self):
+    def _texto_hud(self, pos, texto, color):
+        """Escribe 'texto' con la fuente del HUD directamente en la pantalla, con la esquina superior izquierda en 'pos'."""
+        rect = self.fuente_ui.get_rect(texto); rect.topleft = pos
+        self.lienzo.reservar(rect)
+        self.lienzo.marcar(self.fuente_ui.render_to(self.pantalla, pos, texto, color))
+
+    def _get_shield_frames(self):
+        """
+        Retorna (anillo inactivo, lista de anillos activos por nivel de alfa).
+        Sólo se vuelven a renderizar si cambia config["tam"].
+        """
+        if self._shield_frames_tam != self.config["tam"]:
+            radio_circulo = self.config["tam"]//2 + 10
+            inactivo = self.main.build_ring_frames(radio_circulo, (50, 50, 50), 50, 50, 1)[0]
+            activos = self.main.build_ring_frames(radio_circulo, (20, 200, 255), 100, 255, self.NIVELES_ALFA_ESCUDO)
+            self._shield_frames = (inactivo, activos); self._shield_frames_tam = self.config["tam"]
+        return self._shield_frames
+
+    def _draw_shield_effect(self, tiempo_actual):
         letras_a_proteger = []
         if self.game_options["num_jugadores"] == 1:
-            if self.letras_en_pantalla:
-                letra_mas_cercana = min(self.letras_en_pantalla, key=lambda l: (self.main.ALTO - l['y']) if l.get('vx', 0) == 0 else (self.main.ANCHO - l['x'] if l.get('vx', 0) > 0 else l['x']))
-                letras_a_proteger.append(letra_mas_cercana)
+            letra_mas_cercana = self.letras_en_pantalla.mas_peligrosa()
+            if letra_mas_cercana is not None:
+                letras_a_proteger.append((self.letras.char[letra_mas_cercana], self.letras.posicion_interpolada(letra_mas_cercana, self._alfa_render)))
         else:
-            letras_a_proteger.append({'char': self.active_letter, 'x': self.active_letter_x, 'y': self.active_letter_y})
+            letras_a_proteger.append((self.active_letter, (self.active_letter_x, self._y_activa_interpolada())))
+
+        if self.powerup_manager.esta_activo("escudo"):
+            frames_activo = self._get_shield_frames()[1]
+            pulso = 0.5+0.5*math.sin(tiempo_actual*8) # 0..1, mismo pulso que el alfa 100..255 original
+            shield_surf = frames_activo[round(pulso * (len(frames_activo) - 1))]
+        else:
+            shield_surf = self._get_shield_frames()[0]
+
+        for char, centro in letras_a_proteger:
+            letra_rect = self.atlas.get_rect(char) if self.palabras is None else self.fuente_letras.get_rect(char)
+            letra_rect.center = centro
+            self.lienzo.blit(shield_surf, shield_surf.get_rect(center=letra_rect.center))
 
-        for letra in letras_a_proteger:
-            pos_x, pos_y = letra.get('x'), letra.get('y')
-            letra_rect = self.fuente_letras.get_rect(letra['char']); letra_rect.center = (pos_x, pos_y)
-            radio_circulo = self.config["tam"]//2 + 10
-            if self.powerup_manager.esta_activo("escudo"):
-                alfa = int(100+155*(0.5+0.5*math.sin(time.time()*8))); color_escudo = (20, 200, 255, alfa)
-            else:
-                color_escudo = (50, 50, 50, 50)
-            shield_surf = pygame.Surface((radio_circulo*2, radio_circulo*2), pygame.SRCALPHA)
-            pygame.draw.circle(shield_surf, color_escudo, (radio_circulo, radio_circulo), radio_circulo, 3)
-            self.pantalla.blit(shield_surf, shield_surf.get_rect(center=letra_rect.center))
 
+    def informe_latencia(self):
+        """
+        Percentiles (ms) de la latencia hasta la presentación medida durante la partida, desde la
+        pulsación o, si los eventos no traen 'timestamp', desde su lectura (ver origen_latencia).
+        """
+        latencias = sorted(self.latencias_ms)
+        if not latencias: return {}
+        percentil = lambda p: latencias[min(len(latencias) - 1, int(p * len(latencias)))]
+        return {"n": len(latencias), "p50": percentil(0.5), "p90": percentil(0.9), "p99": percentil(0.99), "max": latencias[-1]}
 
     def run(self):
         if self.main.music_loaded and not pygame.mixer.music.get_busy(): pygame.mixer.music.play(-1, 0.0)
+        self.clock.tick() # Descarta el tiempo de los menús y de la cuenta regresiva
+        self._filtrar_eventos(True)
+        acumulador = 0.0
         while self.run_flag:
-            dt = self.clock.tick(60)/1000.0
-            resultado_pausa = self._handle_events()
-            if resultado_pausa == "quit": pygame.quit(); sys.exit()
-            if resultado_pausa: return resultado_pausa
-            self._update_state(dt)
-            self._draw_elements()
+            dt = self.clock.tick(self.FPS_PANTALLA)/1000.0
+            pulsaciones = []
+            resultado_pausa = self._handle_events(pulsaciones)
+            if resultado_pausa == "quit":
+                if self.palabras: self.palabras.detener()
+                pygame.quit(); sys.exit()
+            if resultado_pausa:
+                self._filtrar_eventos(False)
+                if self.palabras: self.palabras.detener()
+                return resultado_pausa
+            # Tras un tirón se pierde tiempo en vez de adelantar las letras de golpe
+            acumulador = min(acumulador + dt, self.MAX_PASOS_SIM * self.paso_sim)
+            # Instante (ms) al que corresponde el estado actual de la simulación: cada pulsación con
+            # timestamp se juzga antes del primer paso que empieza después de ella, no al final del
+            # frame. Sin timestamp no se sabe cuándo se pulsó y se juzga antes de los pasos del frame.
+            instante_sim = pygame.time.get_ticks() - acumulador * 1000
+            i = 0
+            while acumulador >= self.paso_sim and self.run_flag:
+                while i < len(pulsaciones) and (pulsaciones[i][0] is None or pulsaciones[i][0] <= instante_sim):
+                    self._handle_keypress(pulsaciones[i][2]); i += 1
+                self.simular_paso()
+                acumulador -= self.paso_sim; instante_sim += self.paso_sim * 1000
+            for _, _, letra in pulsaciones[i:]: self._handle_keypress(letra)
+            self._draw_elements(acumulador / self.paso_sim)
+            if pulsaciones:
+                presentado = pygame.time.get_ticks()
+                self.latencias_ms.extend(presentado - t for _, t, _ in pulsaciones)
+
+        self._filtrar_eventos(False)
+        if self.palabras: self.palabras.detener()
+        if self.config.get("medir_latencia") and self.latencias_ms:
+            informe = self.informe_latencia()
+            print(f"Latencia {self.origen_latencia} -> pantalla (ms): " + ", ".join(f"{k} {v}" for k, v in informe.items()))
 
         if self.main.game_over_sound: self.main.game_over_sound.play()
         if self.main.music_loaded: pygame.mixer.music.stop()
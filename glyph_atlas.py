@@ -0,0 +1,56 @@
+# glyph_atlas.py
+
+import pygame
+import pygame.freetype
+
+class GlyphAtlas:
+    """
+    Guarda pre-renderizadas las letras del juego (y los iconos de los generadores)
+    para una configuración de sesión, de modo que dibujarlas cada frame sea sólo un blit.
+    """
+    def __init__(self, font, letters, colors, icons=None):
+        self.font = font
+        self._glyphs = {}  # (char, color) -> superficie de la letra
+        self._metrics = {} # char -> Rect de la letra (como font.get_rect)
+        self._icons = {}   # (icon_type, flipped) -> superficie del icono
+
+        for color in colors:
+            for char in letters:
+                self._render_glyph(char, tuple(color))
+
+        for icon_type, surface in (icons or {}).items():
+            self._icons[(icon_type, False)] = surface
+            self._icons[(icon_type, True)] = pygame.transform.flip(surface, True, False)
+
+    def _render_glyph(self, char, color):
+        surf, rect = self.font.render(char, color)
+        self._glyphs[(char, color)] = surf
+        if char not in self._metrics:
+            self._metrics[char] = self.font.get_rect(char)
+        return surf
+
+    def get_glyph(self, char, color):
+        """
+        Retorna la superficie de la letra en el color pedido.
+        Si la combinación no estaba en el atlas (p. ej. una partida cargada), se renderiza una vez y se guarda.
+        """
+        color = tuple(color)
+        surf = self._glyphs.get((char, color))
+        if surf is None:
+            surf = self._render_glyph(char, color)
+        return surf
+
+    def get_rect(self, char):
+        """Retorna una copia del Rect de la letra, equivalente a font.get_rect(char)."""
+        rect = self._metrics.get(char)
+        if rect is None:
+            rect = self._metrics[char] = self.font.get_rect(char)
+        return rect.copy()
+
+    def get_icon(self, icon_type, flipped=False):
+        """Retorna el icono del generador, ya volteado horizontalmente si flipped es True."""
+        return self._icons[(icon_type, flipped)]
+
+    def superficies(self):
+        """Retorna todas las superficies del atlas (glifos e iconos), p. ej. para subirlas como texturas."""
+        return list(self._glyphs.values()) + list(self._icons.values())
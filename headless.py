@@ -0,0 +1,128 @@
+# headless.py
+
+import math
+import random
+import pygame
+
+from game_session import GameSession
+from keyboard_layout_manager import KeyboardLayoutManager
+
+# Opciones de partida equivalentes a las que arma el menú principal
+OPCIONES_ARCANE = {"num_jugadores": 1, "initial_speed": 1.5, "count_wrong_key_faults": True, "time_limit_seconds": 0, "fallos_limit": 10}
+OPCIONES_VERSUS = {"num_jugadores": 2, "initial_speed": 2.0, "count_wrong_key_faults": True, "time_limit_seconds": 60, "fallos_limit": 999}
+
+_TECLADO = KeyboardLayoutManager()
+_TECLAS_IZQUIERDA = frozenset(_TECLADO.left_hand_keys)
+_TODAS_LAS_LETRAS = sorted(_TECLADO.all_game_letters)
+
+class AnfitrionHeadless:
+    """
+    Sustituye al módulo principal (JuegoLedvin) para una GameSession sin pantalla:
+    mismas dimensiones y colores, iconos vacíos, sin sonidos, sin partículas y sin cuenta regresiva.
+    """
+    NEGRO = (0, 0, 0); BLANCO = (255, 255, 255); ROJO = (255, 0, 0); VERDE = (0, 255, 0); AMARILLO = (255, 255, 0)
+    EVENTOS_SALIDA = (pygame.QUIT,)
+
+    def __init__(self, ancho=1280, alto=720):
+        self.ANCHO, self.ALTO = ancho, alto
+        self.pantalla = None; self.clock = None; self.backend_texturas = None
+        self.music_loaded = False
+        self.acierto_sound = self.fallo_sound = self.game_over_sound = None
+        self.powerup_activate_sound = self.shield_hit_sound = self.double_score_activate_sound = None
+        # Sólo se usan sus tamaños para colocar las letras con icono
+        self.spawner_icons = {"avion": pygame.Surface((80, 80)), "icono_lateral": pygame.Surface((80, 80))}
+
+    def crear_particulas(self, x, y, color, emisor="acierto"):
+        pass
+
+    def mostrar_conteo_regresivo(self, segundos, fuente_obj, color):
+        pass
+
+
+class BotMecanografo:
+    """
+    Mecanógrafo simulado para partidas sin pantalla.
+    :param reaccion_media: Tiempo medio (s) entre que aparece el objetivo y se pulsa la tecla.
+    :param reaccion_desv: Desviación del tiempo de reacción (distribución lognormal).
+    :param precision: Probabilidad de pulsar la tecla correcta.
+    :param sesgo_mano: Entre -1 y 1. Con valores positivos la mano derecha es más lenta y falla más
+                       (y la izquierda mejora); con negativos, al revés.
+    :param seed: Semilla del generador propio del bot.
+    """
+    def __init__(self, reaccion_media=0.45, reaccion_desv=0.12, precision=0.95, sesgo_mano=0.0, seed=None):
+        self.precision = precision
+        self.sesgo_mano = sesgo_mano
+        self.rng = random.Random(seed)
+        sigma2 = math.log(1 + (reaccion_desv / reaccion_media) ** 2)
+        self._mu, self._sigma = math.log(reaccion_media) - sigma2 / 2, math.sqrt(sigma2)
+
+    def _factor_mano(self, letra):
+        factor = 1 - self.sesgo_mano if letra in _TECLAS_IZQUIERDA else 1 + self.sesgo_mano
+        return max(0.1, factor)
+
+    def tiempo_reaccion(self, letra):
+        """Segundos que tarda en pulsar 'letra' desde que decide ir a por ella."""
+        return self.rng.lognormvariate(self._mu, self._sigma) * self._factor_mano(letra)
+
+    def pulsar(self, letra):
+        """Retorna la tecla que pulsa al intentar escribir 'letra' (puede equivocarse)."""
+        if self.rng.random() < (1 - self.precision) * self._factor_mano(letra):
+            return self.rng.choice([c for c in _TODAS_LAS_LETRAS if c != letra])
+        return letra
+
+
+def _objetivo(sesion):
+    """Retorna (jugador, letra, referencia) de la próxima tecla que conviene pulsar, o None."""
+    if sesion.game_options["num_jugadores"] == 1:
+        emparejador = sesion.emparejador
+        slot = emparejador.candidato() if emparejador is not None else None # Palabra a medio escribir
+        escritas = len(emparejador.escrito) if slot is not None else 0
+        if slot is None: slot = sesion.letras_en_pantalla.mas_peligrosa()
+        return ("J1", sesion.letras.char[slot][escritas], (slot, sesion.letras.generacion[slot], escritas)) if slot is not None else None
+    return sesion.current_turn_player, sesion.active_letter, None
+
+def _sigue_vigente(sesion, plan):
+    jugador, char, referencia = plan[1:]
+    if referencia is not None:
+        slot, generacion, escritas = referencia # La ranura pudo reutilizarse para otra letra
+        if not (slot in sesion.letras_en_pantalla and sesion.letras.generacion[slot] == generacion): return False
+        return (sesion.emparejador.progreso(slot) if sesion.emparejador is not None else 0) == escritas
+    return sesion.current_turn_player == jugador and sesion.active_letter == char
+
+def simular_sesion(game_options, bot=None, config=None, ancho=1280, alto=720, max_tiempo=600.0, seed=None):
+    """
+    Juega una partida completa sin pantalla, audio ni reloj real, tan rápido como permita la CPU.
+    :param game_options: Opciones de partida (ver OPCIONES_ARCANE / OPCIONES_VERSUS).
+    :param bot: Un BotMecanografo, o un diccionario {"J1": bot, "J2": bot} para versus.
+    :param config: Configuración de la sesión ("tam", "color", "sim_hz"...).
+    :param max_tiempo: Tope de tiempo simulado (s), por si el bot nunca pierde.
+    :param seed: Semilla del módulo random, del que salen las letras y los power-ups.
+    Retorna las estadísticas de los ScoreManager de cada jugador, el tiempo, nivel y velocidad finales
+    y los segundos que estuvo activo cada power-up.
+    """
+    if seed is not None: random.seed(seed)
+    if bot is None: bot = BotMecanografo(seed=seed)
+    bots = bot if isinstance(bot, dict) else {"J1": bot, "J2": bot}
+    config = {"fuente": None, "tam": 60, "color": AnfitrionHeadless.BLANCO, **(config or {})}
+
+    sesion = GameSession(AnfitrionHeadless(ancho, alto), config, game_options, headless=True)
+    uptime = {tipo: 0.0 for tipo in GameSession.DURACIONES_POWERUP} # Segundos con cada power-up activo
+    plan = None # (instante de la pulsación, jugador, letra, referencia)
+    try:
+        while sesion.run_flag and sesion.tiempo_sim < max_tiempo:
+            if plan is not None and not _sigue_vigente(sesion, plan): plan = None
+            if plan is None:
+                objetivo = _objetivo(sesion)
+                if objetivo is not None:
+                    jugador, char, _ = objetivo
+                    plan = (sesion.tiempo_sim + bots[jugador].tiempo_reaccion(char),) + objetivo
+            if plan is not None and sesion.tiempo_sim >= plan[0]:
+                sesion._handle_keypress(bots[plan[1]].pulsar(plan[2])); plan = None
+            sesion.simular_paso()
+            for tipo in sesion.powerup_manager.activos: uptime[tipo] = uptime.get(tipo, 0.0) + sesion.paso_sim
+    finally:
+        if sesion.palabras: sesion.palabras.detener() # Hilo de precarga y mmap del corpus
+
+    return {"jugadores": {j: m.to_dict() for j, m in sesion.player_managers.items()},
+            "tiempo_sim": sesion.tiempo_sim, "nivel": sesion.nivel_actual, "velocidad": sesion.velocidad,
+            "uptime_powerups": uptime}
@@ -1,8 +1,19 @@
 import random
 import json
+from adaptive_sampler import AdaptiveSampler
 
 class KeyboardLayoutManager:
-    def __init__(self):
+    # Teclas que añade cada distribución a las del teclado base, por mano
+    TECLAS_EXTRA = {"es": {"right_hand_keys": ['Ñ']}}
+
+    def __init__(self, layout="en", adaptativo=False, bigramas=()):
+        """
+        :param layout: Distribución del teclado ("en", o "es" para añadir la 'Ñ').
+        :param adaptativo: Si es True las letras no salen de bolsas barajadas sino de un
+                           AdaptiveSampler que favorece las teclas que el jugador falla o tarda en pulsar.
+        :param bigramas: Objetivos de dos letras (ej. "TH") que se añaden al muestreo adaptativo
+                         del modo 1P. Se descartan los que usan letras fuera de la distribución.
+        """
         self.left_hand_keys = [
             'Q', 'W', 'E', 'R', 'T',
             'A', 'S', 'D', 'F', 'G',
@@ -14,7 +25,17 @@ class KeyboardLayoutManager:
             'N', 'M'
         ]
         
-        self.all_game_letters = list(set(self.left_hand_keys + self.right_hand_keys))
+        self.layout = layout
+        for mano, extra in self.TECLAS_EXTRA.get(layout, {}).items():
+            getattr(self, mano).extend(extra)
+        
+        # Orden estable (no el de un set) para que las partidas con semilla sean reproducibles
+        self.all_game_letters = list(dict.fromkeys(self.left_hand_keys + self.right_hand_keys))
+        self.bigramas = [b for b in dict.fromkeys(b.upper() for b in bigramas)
+                         if len(b) > 1 and all(c in self.all_game_letters for c in b)]
+        self.adaptativo = adaptativo
+        self.muestreadores = {} # "J1" / "J2" / "todas" -> AdaptiveSampler (sólo en modo adaptativo)
+        if adaptativo: self._crear_muestreadores()
         
         # Estas variables almacenarán el estado actual de las letras disponibles
         # y se inicializarán correctamente con reset_available_letters()
@@ -38,12 +59,25 @@ class KeyboardLayoutManager:
         random.shuffle(self.current_all_letters)
 
 
+    def _crear_muestreadores(self, estadisticas=None):
+        self.muestreadores = {"J1": AdaptiveSampler(self.left_hand_keys, estadisticas),
+                              "J2": AdaptiveSampler(self.right_hand_keys, estadisticas),
+                              "todas": AdaptiveSampler(self.all_game_letters + self.bigramas, estadisticas)}
+
+    def registrar_resultado(self, objetivo, acierto, reaccion=None):
+        """Anota un acierto o fallo de 'objetivo' para el modo adaptativo (sin él no hace nada)."""
+        for muestreador in self.muestreadores.values():
+            muestreador.registrar(objetivo, acierto, reaccion)
+
     def obtener_nueva_letra(self, player_id=None, num_jugadores=1):
         """
         Devuelve una nueva letra aleatoria según el modo de juego y el jugador.
         En modo 2P, selecciona del alfabeto de la mano correspondiente.
         En modo 1P, selecciona del alfabeto completo.
         """
+        if self.adaptativo:
+            clave = player_id if num_jugadores == 2 and player_id in ("J1", "J2") else "todas"
+            return self.muestreadores[clave].muestrear()
         if num_jugadores == 2 and player_id:
             if player_id == "J1":
                 # Si el pool de J1 se agota, lo recarga y lo baraja de nuevo
@@ -76,14 +110,22 @@ class KeyboardLayoutManager:
             "right_hand_keys": self.right_hand_keys, # Conservar la definición base
             "current_available_letters_j1": self.current_available_letters_j1,
             "current_available_letters_j2": self.current_available_letters_j2,
-            "current_all_letters": self.current_all_letters
+            "current_all_letters": self.current_all_letters,
+            "layout": self.layout,
+            "adaptativo": self.adaptativo,
+            "bigramas": self.bigramas,
+            # El muestreador "todas" contiene las estadísticas de todos los objetivos
+            "estadisticas_teclas": self.muestreadores["todas"].estadisticas if self.adaptativo else {}
         }
 
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, layout="en", adaptativo=False):
         """Crea una instancia del manager desde un diccionario cargado.
-        Asegura que las listas de letras estén pobladas si el estado cargado está vacío."""
-        manager = cls() # Crea una nueva instancia, que ya llama a __init__ y a reset_available_letters()
+        Asegura que las listas de letras estén pobladas si el estado cargado está vacío.
+        'layout' y 'adaptativo' sólo se usan si el estado no los trae (partidas anteriores)."""
+        # Crea una nueva instancia, que ya llama a __init__ y a reset_available_letters()
+        manager = cls(data.get("layout", layout), data.get("adaptativo", adaptativo), data.get("bigramas", ()))
+        if manager.adaptativo: manager._crear_muestreadores(data.get("estadisticas_teclas"))
 
         # Sobrescribe las listas con los datos cargados si existen
         manager.left_hand_keys = data.get("left_hand_keys", manager.left_hand_keys)
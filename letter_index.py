@@ -0,0 +1,83 @@
+# letter_index.py
+
+import heapq
+import math
+
+def tiempo_hasta_salir(x, y, vx, vy, ancho, alto):
+    """
+    Frames (a 60 FPS) que le faltan a una letra en (x, y) con velocidad (vx, vy) para salir de
+    los límites que usa GameSession._update_state (100 px fuera de la pantalla por cualquier lado).
+    """
+    tiempos = []
+    for pos, vel, minimo, maximo in ((x, vx, -100, ancho + 100), (y, vy, -100, alto + 100)):
+        if vel > 0: tiempos.append((maximo - pos) / vel)
+        elif vel < 0: tiempos.append((minimo - pos) / vel)
+    return max(0.0, min(tiempos)) if tiempos else math.inf
+
+
+class LetterIndex:
+    """
+    Letras en pantalla indexadas para que las consultas del juego no recorran la lista:
+    - en orden de aparición (para dibujar y guardar), con borrado O(1);
+    - por texto, para encontrar en O(1) la primera letra que coincide con una tecla (un
+      objetivo de varias letras nunca coincide con una sola tecla);
+    - en un montículo por instante de salida, para obtener la letra más peligrosa (la que
+      antes saldrá de la pantalla) en O(log n). Las entradas de letras ya quitadas se
+      descartan de forma perezosa cuando llegan a la cima.
+    Cada letra se identifica por una clave hashable (la ranura de la letra en LetterStore).
+    """
+    def __init__(self):
+        self._letras = {}   # clave -> char, en orden de inserción
+        self._por_char = {} # char -> {clave: None}, en orden de inserción
+        self._vigentes = {} # clave -> número de secuencia de su entrada en el montículo
+        self._monticulo = [] # (instante de salida, secuencia, clave)
+        self._secuencia = 0
+
+    def __len__(self):
+        return len(self._letras)
+
+    def __bool__(self):
+        return bool(self._letras)
+
+    def __iter__(self):
+        return iter(list(self._letras)) # Copia: se puede quitar letras mientras se recorre
+
+    def __contains__(self, clave):
+        return clave in self._letras
+
+    def agregar(self, clave, char, instante_salida):
+        """Añade la letra 'clave' con texto 'char' que saldrá de la pantalla en 'instante_salida' (tiempo simulado)."""
+        self._letras[clave] = char
+        self._por_char.setdefault(char, {})[clave] = None
+        self._secuencia += 1
+        self._vigentes[clave] = self._secuencia
+        heapq.heappush(self._monticulo, (instante_salida, self._secuencia, clave))
+
+    def quitar(self, clave):
+        char = self._letras.pop(clave)
+        del self._vigentes[clave]
+        mismas = self._por_char[char]
+        del mismas[clave]
+        if not mismas: del self._por_char[char]
+        # Si el montículo acumula demasiadas entradas muertas, se reconstruye
+        if len(self._monticulo) > 2 * len(self._letras) + 32:
+            self._monticulo = [e for e in self._monticulo if self._vigentes.get(e[2]) == e[1]]
+            heapq.heapify(self._monticulo)
+
+    def primera_con(self, char):
+        """Retorna la clave de la letra más antigua con ese carácter, o None."""
+        mismas = self._por_char.get(char)
+        return next(iter(mismas)) if mismas else None
+
+    def mas_peligrosa(self):
+        """Retorna la clave de la letra que antes saldrá de la pantalla, o None si no hay letras."""
+        monticulo = self._monticulo
+        while monticulo:
+            _, secuencia, clave = monticulo[0]
+            if self._vigentes.get(clave) == secuencia:
+                return clave
+            heapq.heappop(monticulo)
+        return None
+
+    def limpiar(self):
+        self.__init__()
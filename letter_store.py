@@ -0,0 +1,115 @@
+# letter_store.py
+
+try:
+    import numpy
+except ImportError: # NumPy es opcional: sin él los campos son listas y se integran con un bucle
+    numpy = None
+
+class LetterStore:
+    """
+    Letras que caen guardadas en arrays paralelos indexados por ranura (slot):
+    posición, velocidad, posición al inicio del último paso, fase de la animación e instante
+    de aparición (lo fija GameSession; no se guarda) en arrays
+    numéricos, y carácter, color e icono en listas. Las ranuras libres se reutilizan (lista
+    libre) y la capacidad se duplica cuando se llena.
+    Integrar el movimiento y detectar las letras fuera de los límites es un único paso
+    vectorizado. Cada ranura tiene un número de generación que cambia al reutilizarla, para
+    distinguir una letra nueva de la anterior que ocupaba el mismo hueco.
+    Las letras entran y salen en el formato de diccionario de 'letras_en_pantalla' de las
+    partidas guardadas (ver agregar y a_dict).
+    """
+    _NUMERICOS = ("x", "y", "vx", "vy", "x_previa", "y_previa", "anim_offset", "aparicion")
+
+    def __init__(self, capacidad=64):
+        self.capacidad = 0
+        self._libres = []
+        self._tope = 0 # Las ranuras >= _tope nunca se han usado
+        self._vivas = 0
+        for campo in self._NUMERICOS: setattr(self, campo, self._array(0))
+        self.vivo = self._array(0, bool)
+        self.char = []; self.color = []; self.icon_type = []; self.generacion = []
+        self._crecer(capacidad)
+
+    @staticmethod
+    def _array(n, tipo=float):
+        return numpy.zeros(n, dtype=tipo) if numpy is not None else [tipo()] * n
+
+    def _crecer(self, capacidad):
+        extra = capacidad - self.capacidad
+        for campo, tipo in [(c, float) for c in self._NUMERICOS] + [("vivo", bool)]:
+            actual = getattr(self, campo)
+            setattr(self, campo, numpy.concatenate((actual, self._array(extra, tipo))) if numpy is not None else actual + self._array(extra, tipo))
+        self.char += [None] * extra; self.color += [None] * extra; self.icon_type += [None] * extra
+        self.generacion += [0] * extra
+        self._libres.extend(range(capacidad - 1, self.capacidad - 1, -1)) # Se asignan de menor a mayor
+        self.capacidad = capacidad
+
+    def __len__(self):
+        return self._vivas
+
+    def agregar(self, letra):
+        """Añade una letra (diccionario con 'x', 'y', 'vx', 'vy', 'char', 'color'...) y retorna su ranura."""
+        if not self._libres: self._crecer(self.capacidad * 2)
+        slot = self._libres.pop()
+        self.x[slot] = self.x_previa[slot] = letra['x']; self.y[slot] = self.y_previa[slot] = letra['y']
+        self.vx[slot] = letra['vx']; self.vy[slot] = letra['vy']
+        self.anim_offset[slot] = letra.get('anim_offset', 0.0)
+        self.char[slot] = letra['char']; self.color[slot] = letra['color']
+        self.icon_type[slot] = letra.get('icon_type') if letra.get('has_icon', False) else None
+        self.vivo[slot] = True; self.generacion[slot] += 1
+        self._tope = max(self._tope, slot + 1); self._vivas += 1
+        return slot
+
+    def quitar(self, slot):
+        self.vivo[slot] = False; self.char[slot] = self.color[slot] = self.icon_type[slot] = None
+        self._libres.append(slot); self._vivas -= 1
+
+    def limpiar(self):
+        self.__init__(self.capacidad)
+
+    def a_dict(self, slot):
+        """La letra de 'slot' en el formato de las partidas guardadas."""
+        letra = {'char': self.char[slot], 'color': self.color[slot], 'anim_offset': float(self.anim_offset[slot]),
+                 'x': float(self.x[slot]), 'y': float(self.y[slot]), 'vx': float(self.vx[slot]), 'vy': float(self.vy[slot]),
+                 'has_icon': self.icon_type[slot] is not None}
+        if letra['has_icon']: letra['icon_type'] = self.icon_type[slot]
+        return letra
+
+    def guardar_previas(self):
+        """Copia las posiciones actuales como las del inicio del paso (para interpolar el dibujo)."""
+        n = self._tope
+        self.x_previa[:n] = self.x[:n]; self.y_previa[:n] = self.y[:n]
+
+    def integrar(self, factor):
+        """Avanza todas las letras: posición += velocidad * factor."""
+        n = self._tope
+        if numpy is not None:
+            self.x[:n] += self.vx[:n] * factor; self.y[:n] += self.vy[:n] * factor
+            return
+        x, y, vx, vy = self.x, self.y, self.vx, self.vy
+        for i in range(n):
+            if self.vivo[i]:
+                x[i] += vx[i] * factor; y[i] += vy[i] * factor
+
+    def fuera_de_limites(self, x_min, y_min, x_max, y_max):
+        """Retorna las ranuras de las letras vivas que están fuera del rectángulo (límites excluidos)."""
+        n = self._tope
+        if numpy is not None:
+            x, y = self.x[:n], self.y[:n]
+            fuera = self.vivo[:n] & ((x < x_min) | (x > x_max) | (y < y_min) | (y > y_max))
+            return numpy.flatnonzero(fuera).tolist()
+        return [i for i in range(n) if self.vivo[i] and not (x_min <= self.x[i] <= x_max and y_min <= self.y[i] <= y_max)]
+
+    def posiciones_interpoladas(self, alfa):
+        """Retorna (xs, ys), listas indexadas por ranura, a una fracción 'alfa' entre el paso anterior y el actual."""
+        n = self._tope
+        if numpy is not None:
+            xs = self.x_previa[:n] + (self.x[:n] - self.x_previa[:n]) * alfa
+            ys = self.y_previa[:n] + (self.y[:n] - self.y_previa[:n]) * alfa
+            return xs.tolist(), ys.tolist()
+        return ([p + (a - p) * alfa for p, a in zip(self.x_previa[:n], self.x[:n])],
+                [p + (a - p) * alfa for p, a in zip(self.y_previa[:n], self.y[:n])])
+
+    def posicion_interpolada(self, slot, alfa):
+        xp, yp = self.x_previa[slot], self.y_previa[slot]
+        return float(xp + (self.x[slot] - xp) * alfa), float(yp + (self.y[slot] - yp) * alfa)
@@ -0,0 +1,137 @@
+# particles.py
+
+import random
+import pygame
+
+try:
+    import numpy
+except ImportError: # NumPy es opcional: sin él se usa una lista de partículas
+    numpy = None
+
+# Ráfagas predefinidas por emisor: cantidad, velocidad máxima, rango de radio y vida (frames)
+EMISORES = {
+    "acierto": {"cantidad": 10, "velocidad": 2.0, "radio": (2, 5), "vida": 30},
+    "escudo": {"cantidad": 24, "velocidad": 3.0, "radio": (2, 4), "vida": 25},
+    "nivel": {"cantidad": 200, "velocidad": 6.0, "radio": (3, 6), "vida": 45},
+}
+
+class ParticleSystem:
+    """
+    Motor de partículas de capacidad fija con las partículas vivas compactadas al inicio
+    de arrays paralelos (x, y, vx, vy, radio, vida, índice de color).
+    Integrar y descartar las partículas muertas es un único paso vectorizado, y se dibujan
+    con sprites de círculo pre-renderizados por (color, radio) mediante Surface.blits.
+    """
+    def __init__(self, capacidad=4096, seed=None):
+        self.capacidad = capacidad
+        self.count = 0
+        self._paleta = []      # índice -> color
+        self._indice_color = {} # color -> índice
+        self._sprites = {}     # (índice de color, radio) -> superficie
+        if numpy is not None:
+            self.rng = numpy.random.default_rng(seed)
+            self.x = numpy.zeros(capacidad); self.y = numpy.zeros(capacidad)
+            self.vx = numpy.zeros(capacidad); self.vy = numpy.zeros(capacidad)
+            self.radio = numpy.zeros(capacidad); self.vida = numpy.zeros(capacidad, dtype=numpy.int32)
+            self.color = numpy.zeros(capacidad, dtype=numpy.int32)
+        else:
+            self._lista = [] # [x, y, vx, vy, radio, vida, índice de color]
+
+    def _color_a_indice(self, color):
+        color = tuple(color)
+        idx = self._indice_color.get(color)
+        if idx is None:
+            idx = self._indice_color[color] = len(self._paleta)
+            self._paleta.append(color)
+        return idx
+
+    def _sprite(self, idx_color, radio):
+        sprite = self._sprites.get((idx_color, radio))
+        if sprite is None:
+            sprite = pygame.Surface((radio * 2, radio * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, self._paleta[idx_color], (radio, radio), radio)
+            self._sprites[(idx_color, radio)] = sprite
+        return sprite
+
+    def emitir(self, x, y, color, cantidad=10, velocidad=2.0, radio=(2, 5), vida=30):
+        """
+        Emite una ráfaga de 'cantidad' partículas desde (x, y).
+        Si el pool está lleno, las partículas que no caben se descartan.
+        Retorna cuántas se emitieron.
+        """
+        if numpy is None:
+            libres = self.capacidad - len(self._lista)
+            n = max(0, min(cantidad, libres))
+            idx_color = self._color_a_indice(color)
+            for _ in range(n):
+                self._lista.append([x, y, random.uniform(-velocidad, velocidad), random.uniform(-velocidad, velocidad),
+                                    random.randint(radio[0], radio[1]), vida, idx_color])
+            self.count = len(self._lista)
+            return n
+
+        n = max(0, min(cantidad, self.capacidad - self.count))
+        if n == 0:
+            return 0
+        s = slice(self.count, self.count + n)
+        self.x[s] = x; self.y[s] = y
+        self.vx[s] = self.rng.uniform(-velocidad, velocidad, n)
+        self.vy[s] = self.rng.uniform(-velocidad, velocidad, n)
+        self.radio[s] = self.rng.integers(radio[0], radio[1], size=n, endpoint=True)
+        self.vida[s] = vida
+        self.color[s] = self._color_a_indice(color)
+        self.count += n
+        return n
+
+    def emitir_rafaga(self, emisor, x, y, color):
+        """Emite la ráfaga predefinida de un emisor de EMISORES (ej. "acierto", "escudo", "nivel")."""
+        return self.emitir(x, y, color, **EMISORES[emisor])
+
+    def actualizar(self):
+        """Integra todas las partículas un frame y compacta las que siguen vivas."""
+        if numpy is None:
+            vivas = []
+            for p in self._lista:
+                p[0] += p[2]; p[1] += p[3]; p[4] -= 0.1; p[5] -= 1
+                if p[5] > 0 and p[4] > 0: vivas.append(p)
+            self._lista = vivas; self.count = len(vivas)
+            return
+
+        n = self.count
+        if n == 0:
+            return
+        x, y, radio, vida = self.x[:n], self.y[:n], self.radio[:n], self.vida[:n]
+        x += self.vx[:n]; y += self.vy[:n]; radio -= 0.1; vida -= 1
+        vivas = numpy.flatnonzero((vida > 0) & (radio > 0))
+        m = len(vivas)
+        if m != n:
+            for arr in (self.x, self.y, self.vx, self.vy, self.radio, self.vida, self.color):
+                arr[:m] = arr[vivas]
+        self.count = m
+
+    def dibujar(self, destino):
+        """Dibuja las partículas vivas sobre 'destino' y retorna los rects afectados."""
+        if numpy is None:
+            secuencia = []
+            for x, y, _, _, radio, _, idx_color in self._lista:
+                r = int(radio)
+                if r > 0: secuencia.append((self._sprite(idx_color, r), (int(x) - r, int(y) - r)))
+            return destino.blits(secuencia) if secuencia else []
+
+        n = self.count
+        if n == 0:
+            return []
+        r = self.radio[:n].astype(numpy.int64)
+        visibles = numpy.flatnonzero(r > 0)
+        px = (self.x[:n].astype(numpy.int64) - r)[visibles].tolist()
+        py = (self.y[:n].astype(numpy.int64) - r)[visibles].tolist()
+        claves = zip(self.color[:n][visibles].tolist(), r[visibles].tolist())
+        sprites = self._sprites; secuencia = []
+        for clave, a, b in zip(claves, px, py):
+            sprite = sprites.get(clave)
+            if sprite is None: sprite = self._sprite(*clave)
+            secuencia.append((sprite, (a, b)))
+        return destino.blits(secuencia) if secuencia else []
+
+    def limpiar(self):
+        self.count = 0
+        if numpy is None: self._lista = []
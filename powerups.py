@@ -1,11 +1,17 @@
 import time
 
 class PowerUp:
-    def __init__(self):
+    def __init__(self, reloj=time.time, temporizador=None):
         # 'self.activos' es un diccionario para gestionar múltiples power-ups activos
         # Cada entrada es: {"tipo_powerup": {"tiempo_activado": timestamp, "duracion": segundos}}
         self.activos = {} 
         self.duracion_default = 10 # Duración predeterminada si no se especifica
+        self.reloj = reloj # Función que retorna el tiempo actual en segundos (ej. un game_clock.GameClock)
+        # Con un TimerScheduler (game_clock.py) cada vencimiento se programa al activar, en vez
+        # de revisar todos los power-ups activos en cada actualizar()
+        self.temporizador = temporizador
+        self._timers = {} # tipo -> id del temporizador de su vencimiento
+        self._terminados = []
 
     def activar(self, tipo, duracion=None):
         """
@@ -17,9 +23,10 @@ class PowerUp:
             duracion = self.duracion_default
             
         self.activos[tipo] = {
-            "tiempo_activado": time.time(),
+            "tiempo_activado": self.reloj(),
             "duracion": duracion
         }
+        self._programar_vencimiento(tipo)
         # print(f"Power-Up '{tipo}' activado por {duracion} segundos.") # Línea para depuración
 
     def actualizar(self):
@@ -28,16 +35,38 @@ class PowerUp:
         Elimina los que han excedido su duración.
         Retorna una lista de los tipos de power-ups que han terminado en este ciclo.
         """
+        if self.temporizador is not None:
+            terminados, self._terminados = self._terminados, []
+            return terminados
         terminados = []
         # Itera sobre una copia de las claves para poder modificar el diccionario mientras iteras
         for tipo in list(self.activos.keys()):
             info_pu = self.activos[tipo]
-            if (time.time() - info_pu["tiempo_activado"]) > info_pu["duracion"]:
+            if (self.reloj() - info_pu["tiempo_activado"]) > info_pu["duracion"]:
                 del self.activos[tipo] # Elimina el power-up que ha terminado
                 terminados.append(tipo)
                 # print(f"Power-Up '{tipo}' agotado por tiempo.") # Línea para depuración
         return terminados
 
+    def _programar_vencimiento(self, tipo):
+        if self.temporizador is None: return
+        info_pu = self.activos[tipo]
+        self.temporizador.cancelar(self._timers.get(tipo))
+        self._timers[tipo] = self.temporizador.programar_en(info_pu["tiempo_activado"] + info_pu["duracion"], self._vencer, tipo)
+
+    def _vencer(self, tipo):
+        del self._timers[tipo]
+        if self.activos.pop(tipo, None) is not None: self._terminados.append(tipo)
+
+    def restaurar(self, activos):
+        """
+        Restaura los power-ups de una partida guardada ('activos' con el mismo formato que
+        self.activos y tiempos del mismo reloj) y vuelve a programar sus vencimientos.
+        """
+        for tipo in list(self._timers): self.temporizador.cancelar(self._timers.pop(tipo))
+        self.activos = {tipo: dict(info_pu) for tipo, info_pu in activos.items()}
+        for tipo in self.activos: self._programar_vencimiento(tipo)
+
     def esta_activo(self, tipo):
         """ 
         Verifica si un power-up específico está actualmente activo.
@@ -54,7 +83,7 @@ class PowerUp:
         """
         if tipo in self.activos:
             info_pu = self.activos[tipo]
-            elapsed = time.time() - info_pu["tiempo_activado"]
+            elapsed = self.reloj() - info_pu["tiempo_activado"]
             remaining = info_pu["duracion"] - elapsed
             return max(0, remaining)
         return 0
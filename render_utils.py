@@ -1,56 +1,260 @@
 import pygame
 import pygame.freetype
 import math
+from collections import OrderedDict
+from functools import lru_cache
 
-def render_text_gradient(font, text, rect, surface, gradient_colors, border_color, border_thickness):
-    """
-    Renders text with a gradient fill and an optional border.
-    font: pygame.freetype.SysFont object
-    text: string to render
-    rect: pygame.Rect for positioning the text
-    surface: pygame surface to draw on
-    gradient_colors: list or tuple of two (R, G, B) colors for the gradient
-    border_color: (R, G, B) color for the border
-    border_thickness: integer for the border width
-    """
-    # Draw border first
+try:
+    import numpy
+except ImportError: # NumPy es opcional: sin él se usa el relleno por columna
+    numpy = None
+
+# Caché LRU de superficies ya compuestas por render_text_gradient.
+# Cada entrada guarda el texto con borde y degradado listo para un único blit.
+TEXT_GRADIENT_CACHE_MAX = 256
+_text_gradient_cache = OrderedDict()
+_text_gradient_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+# Caché LRU de textos simples (fuente y color, sin borde ni degradado) cuyo conjunto no está
+# acotado, como las palabras del modo de palabras: a diferencia del GlyphAtlas, que guarda para
+# toda la sesión un conjunto fijo de letras, aquí las entradas más antiguas se descartan.
+TEXT_SURFACE_CACHE_MAX = 128
+_text_surface_cache = OrderedDict()
+
+# Modos de contorno: "mask" dilata el alfa del texto una sola vez (sin re-renderizar;
+# sin NumPy, una máscara de 1 bit); "offsets" es el método original que re-renderiza el texto (2t+1)^2-1 veces.
+OUTLINE_MODES = ("mask", "offsets")
+OUTLINE_ALPHA_THRESHOLD = 64 # Sin NumPy: alfa mínimo de un píxel del glifo para entrar en la máscara
+
+def _font_key(font):
+    """Identifica una fuente por su archivo, tamaño y estilo (no por id(), que cambia
+    cada vez que se crea una SysFont nueva aunque sea la misma fuente)."""
+    return (font.path, font.size, font.style)
+
+def _color_key(color):
+    return tuple(color) if color is not None else None
+
+def _draw_outline_offsets(target, font, text, center, border_color, border_thickness):
+    """Contorno original: re-renderiza el texto en cada desplazamiento del cuadrado."""
     offsets = []
     for i in range(-border_thickness, border_thickness + 1):
         for j in range(-border_thickness, border_thickness + 1):
             if i != 0 or j != 0:
                 offsets.append((i, j))
-    
+
     for ox, oy in offsets:
         text_surf_border, text_rect_border = font.render(text, border_color)
-        text_rect_border.center = (rect.centerx + ox, rect.centery + oy)
-        surface.blit(text_surf_border, text_rect_border)  
+        text_rect_border.center = (center[0] + ox, center[1] + oy)
+        target.blit(text_surf_border, text_rect_border)
 
-    # Create a temporary surface for the gradient text
-    text_size_for_gradient = font.get_rect(text).size  
-    temp_surf_gradient = pygame.Surface(text_size_for_gradient, pygame.SRCALPHA)
-    temp_surf_gradient_rect = temp_surf_gradient.get_rect()
+def _build_outline_surface(text_surf_mask, border_color, border_thickness):
+    """
+    Construye el contorno en una sola pasada, sin re-renderizar el texto: reproduce sobre el
+    alfa del glifo el barrido de desplazamientos original. Cada copia desplazada que se mezcla
+    deja pasar (1 - alfa) de lo que hay debajo, así que el alfa del contorno es 1 menos el
+    producto de esas transmitancias en la ventana de (2t+1)x(2t+1) (salvo la del centro).
+    El producto se hace como suma de logaritmos con sumas acumuladas por filas y columnas,
+    con coste constante con el grosor, y conserva los bordes suavizados.
+    El resultado mide lo mismo que el texto más border_thickness por cada lado.
+    """
+    if numpy is None:
+        return _build_outline_surface_mask(text_surf_mask, border_color, border_thickness)
+    t = border_thickness
+    width, height = text_surf_mask.get_size()
+    with numpy.errstate(divide="ignore"):
+        log_trans = numpy.log1p(pygame.surfarray.array_alpha(text_surf_mask) / -255.0)
+    numpy.maximum(log_trans, -50.0, out=log_trans) # alfa 255 (transmitancia 0) sin -inf en las sumas
+
+    # Suma en la ventana centrada en cada píxel del resultado, que tiene t píxeles de margen
+    padded = numpy.zeros((width + 4 * t + 1, height + 4 * t + 1))
+    padded[2 * t + 1:2 * t + 1 + width, 2 * t + 1:2 * t + 1 + height] = log_trans
+    window = 2 * t + 1
+    sums = padded.cumsum(axis=0).cumsum(axis=1)
+    window_sum = sums[window:, window:] - sums[:-window, window:] - sums[window:, :-window] + sums[:-window, :-window]
+    window_sum[t:t + width, t:t + height] -= log_trans # Sin la copia sin desplazar
+
+    outline_surf = pygame.Surface(window_sum.shape, pygame.SRCALPHA)
+    outline_surf.fill((*tuple(border_color)[:3], 255))
+    surf_alpha = pygame.surfarray.pixels_alpha(outline_surf)
+    surf_alpha[:] = numpy.rint(255.0 * -numpy.expm1(window_sum))
+    del surf_alpha # Libera el bloqueo de la superficie
+    return outline_surf
+
+def _build_outline_surface_mask(text_surf_mask, border_color, border_thickness):
+    """
+    Contorno sin NumPy: umbraliza el alfa del glifo en una máscara de 1 bit y la dilata
+    con un núcleo cuadrado de (2t+1)x(2t+1). El borde queda sin suavizar.
+    """
+    glyph_mask = pygame.mask.from_surface(text_surf_mask, OUTLINE_ALPHA_THRESHOLD)
+    kernel_size = 2 * border_thickness + 1
+    kernel = pygame.mask.Mask((kernel_size, kernel_size), fill=True)
+    outline_mask = glyph_mask.convolve(kernel)
+    return outline_mask.to_surface(setcolor=(*tuple(border_color)[:3], 255), unsetcolor=(0, 0, 0, 0))
+
+def _build_text_gradient_surface(font, text, gradient_colors, border_color, border_thickness, outline_mode="mask"):
+    """Compone en una superficie SRCALPHA el borde y el relleno del texto.
+    El resultado tiene un margen de border_thickness a cada lado."""
+    text_surf_mask, _ = font.render(text, (255, 255, 255)) # Render white text to use as mask
+    width = text_surf_mask.get_width() + 2 * border_thickness
+    height = text_surf_mask.get_height() + 2 * border_thickness
+    final_surf = pygame.Surface((width, height), pygame.SRCALPHA)
+    center = (width // 2, height // 2)
+
+    # Draw border first
+    if border_thickness > 0:
+        if outline_mode == "offsets":
+            _draw_outline_offsets(final_surf, font, text, center, border_color, border_thickness)
+        else:
+            final_surf.blit(_build_outline_surface(text_surf_mask, border_color, border_thickness), (0, 0))
 
-    # Apply gradient to the temporary surface
     num_gradient_colors = len(gradient_colors)
     if num_gradient_colors < 2:
         # Fallback to solid color if not enough gradient colors are provided
         text_surf_main, text_rect_main = font.render(text, gradient_colors[0] if gradient_colors else (255,255,255))
-        text_rect_main.center = rect.center
-        surface.blit(text_surf_main, text_rect_main)
-        return
+        text_rect_main.center = center
+        final_surf.blit(text_surf_main, text_rect_main)
+        return final_surf
+
+    # Create a temporary surface for the gradient text
+    text_size_for_gradient = font.get_rect(text).size
+    temp_surf_gradient = pygame.Surface(text_size_for_gradient, pygame.SRCALPHA)
+    temp_surf_gradient_rect = temp_surf_gradient.get_rect()
 
-    for y_pixel in range(temp_surf_gradient_rect.height):
-        t = y_pixel / temp_surf_gradient_rect.height
-        r = int(gradient_colors[0][0] * (1 - t) + gradient_colors[1][0] * t)
-        g = int(gradient_colors[0][1] * (1 - t) + gradient_colors[1][1] * t)
-        b = int(gradient_colors[0][2] * (1 - t) + gradient_colors[1][2] * t)
-        current_color = (r, g, b)
-        pygame.draw.line(temp_surf_gradient, current_color, (0, y_pixel), (temp_surf_gradient_rect.width, y_pixel))
+    fill_vertical_gradient(temp_surf_gradient, gradient_colors)
 
     # Use the text as a mask to apply the gradient only to the text
-    text_surf_mask, _ = font.render(text, (255, 255, 255)) # Render white text to use as mask
     temp_surf_gradient.blit(text_surf_mask, (0,0), special_flags=pygame.BLEND_RGBA_MULT)
-    
-    # Blit the final gradient text to the main surface
-    final_text_rect = temp_surf_gradient.get_rect(center=rect.center)
-    surface.blit(temp_surf_gradient, final_text_rect)
\ No newline at end of file
+    final_surf.blit(temp_surf_gradient, temp_surf_gradient.get_rect(center=center))
+    return final_surf
+
+@lru_cache(maxsize=64)
+def _gradient_lut(colors, height):
+    """
+    Precalcula el color de cada fila de un degradado vertical.
+    colors: tupla de 2 o más colores (R, G, B) repartidos uniformemente de arriba a abajo.
+    Retorna un array (height, 3) de uint8 con NumPy, o una tupla de colores sin él.
+    """
+    segments = len(colors) - 1
+    if numpy is not None:
+        t = numpy.arange(height, dtype=numpy.float64) * (segments / height)
+        stops = numpy.arange(len(colors), dtype=numpy.float64)
+        channels = numpy.asarray(colors, dtype=numpy.float64)
+        lut = numpy.empty((height, 3), dtype=numpy.uint8)
+        for c in range(3):
+            lut[:, c] = numpy.interp(t, stops, channels[:, c]).astype(numpy.uint8)
+        lut.setflags(write=False)
+        return lut
+
+    lut = []
+    for y_pixel in range(height):
+        t = y_pixel * segments / height
+        i = min(int(t), segments - 1)
+        f = t - i
+        lut.append(tuple(int(colors[i][c] * (1 - f) + colors[i + 1][c] * f) for c in range(3)))
+    return tuple(lut)
+
+def fill_vertical_gradient(surface, gradient_colors):
+    """
+    Rellena toda la superficie con un degradado vertical opaco en una sola operación.
+    gradient_colors: lista de 2 o más colores (R, G, B).
+    """
+    width, height = surface.get_size()
+    if width == 0 or height == 0:
+        return
+    lut = _gradient_lut(tuple(tuple(c[:3]) for c in gradient_colors), height)
+    surface.fill((255, 255, 255, 255))
+    if numpy is not None:
+        pixels = pygame.surfarray.pixels3d(surface)
+        pixels[...] = lut[numpy.newaxis, :, :]
+        del pixels # Libera el bloqueo de la superficie
+        return
+
+    # Sin NumPy: se pinta una columna de 1px y se estira horizontalmente
+    column = pygame.Surface((1, height), pygame.SRCALPHA)
+    for y_pixel, color in enumerate(lut):
+        column.set_at((0, y_pixel), color)
+    pygame.transform.scale(column, (width, height), surface)
+
+def get_text_gradient_surface(font, text, gradient_colors, border_color, border_thickness, outline_mode="mask"):
+    """
+    Devuelve la superficie compuesta del texto, usando la caché LRU si ya existe.
+    """
+    if outline_mode not in OUTLINE_MODES:
+        raise ValueError(f"outline_mode desconocido: {outline_mode!r}")
+    key = (_font_key(font), text, tuple(_color_key(c) for c in gradient_colors),
+           _color_key(border_color), border_thickness, outline_mode)
+    cached = _text_gradient_cache.get(key)
+    if cached is not None:
+        _text_gradient_cache.move_to_end(key)
+        _text_gradient_cache_stats["hits"] += 1
+        return cached
+
+    _text_gradient_cache_stats["misses"] += 1
+    surf = _build_text_gradient_surface(font, text, gradient_colors, border_color, border_thickness, outline_mode)
+    _text_gradient_cache[key] = surf
+    while len(_text_gradient_cache) > TEXT_GRADIENT_CACHE_MAX:
+        _text_gradient_cache.popitem(last=False)
+        _text_gradient_cache_stats["evictions"] += 1
+    return surf
+
+def get_text_gradient_cache_stats():
+    """Retorna una copia de las estadísticas de la caché (hits, misses, evictions, size)."""
+    stats = dict(_text_gradient_cache_stats)
+    stats["size"] = len(_text_gradient_cache)
+    stats["max_size"] = TEXT_GRADIENT_CACHE_MAX
+    return stats
+
+def set_text_gradient_cache_size(max_size):
+    """Cambia el tamaño máximo de la caché, descartando las entradas más antiguas si sobra."""
+    global TEXT_GRADIENT_CACHE_MAX
+    TEXT_GRADIENT_CACHE_MAX = max(0, int(max_size))
+    while len(_text_gradient_cache) > TEXT_GRADIENT_CACHE_MAX:
+        _text_gradient_cache.popitem(last=False)
+        _text_gradient_cache_stats["evictions"] += 1
+
+def clear_text_gradient_cache():
+    """Vacía la caché y reinicia sus contadores."""
+    _text_gradient_cache.clear()
+    for k in _text_gradient_cache_stats: _text_gradient_cache_stats[k] = 0
+
+def get_text_surface(font, text, color):
+    """Devuelve la superficie de 'text' en 'color' (como font.render), usando la caché LRU de textos simples."""
+    key = (_font_key(font), text, _color_key(color))
+    surf = _text_surface_cache.get(key)
+    if surf is not None:
+        _text_surface_cache.move_to_end(key)
+        return surf
+    surf, _ = font.render(text, _color_key(color))
+    _text_surface_cache[key] = surf
+    while len(_text_surface_cache) > TEXT_SURFACE_CACHE_MAX:
+        _text_surface_cache.popitem(last=False)
+    return surf
+
+def render_text_gradient(font, text, rect, surface, gradient_colors, border_color, border_thickness, outline_mode="mask"):
+    """
+    Renders text with a gradient fill and an optional border.
+    font: pygame.freetype.SysFont object
+    text: string to render
+    rect: pygame.Rect for positioning the text
+    surface: pygame surface to draw on
+    gradient_colors: list or tuple of two or more (R, G, B) colors for the gradient
+    border_color: (R, G, B) color for the border
+    border_thickness: integer for the border width
+    outline_mode: "mask" (single dilation pass) or "offsets" (legacy re-render per offset)
+    Returns the pygame.Rect that was blitted.
+    """
+    text_surf = get_text_gradient_surface(font, text, gradient_colors, border_color, border_thickness, outline_mode)
+    return surface.blit(text_surf, text_surf.get_rect(center=rect.center))
+
+def build_ring_frames(radius, color, alpha_min, alpha_max, levels, width=3):
+    """
+    Pre-renderiza un anillo de radio 'radius' en 'levels' niveles de alfa equiespaciados
+    entre alpha_min y alpha_max. Retorna la lista de superficies (de menor a mayor alfa).
+    """
+    frames = []
+    for i in range(levels):
+        alpha = alpha_min if levels == 1 else int(alpha_min + (alpha_max - alpha_min) * i / (levels - 1))
+        surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(surf, (*tuple(color)[:3], alpha), (radius, radius), radius, width)
+        frames.append(surf)
+    return frames
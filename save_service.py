@@ -0,0 +1,133 @@
+# save_service.py
+
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+
+class SaveService:
+    """
+    Partidas guardadas (una lista JSON de {"timestamp", "mode", "state"}) con la lista en memoria
+    y la escritura en segundo plano, para que guardar o borrar no detenga el juego esperando al disco.
+    - Sólo se lee el archivo la primera vez; después se trabaja sobre la copia en memoria, que
+      guarda cada partida ya serializada: el estado se convierte a JSON en guardar(), en el hilo
+      de quien guarda, y uno que no se puede serializar se rechaza sin tocar la lista.
+    - Cada cambio marca la lista como pendiente y retorna un Future que se completa cuando
+      está en disco. Si llegan varios cambios antes de que el hilo escriba, se escriben de una vez;
+      el hilo sólo une los textos de las partidas y los escribe.
+    - Se escribe JSON compacto en un temporal del mismo directorio, con fsync, y se sustituye
+      el archivo con os.replace: un corte a mitad de escritura deja intacto el archivo anterior.
+    El hilo sólo vive mientras hay escrituras pendientes, y no es daemon: al salir del juego
+    Python espera a que termine la última.
+    """
+    def __init__(self, ruta, max_partidas=5):
+        self.ruta = ruta
+        self.max_partidas = max_partidas
+        self._partidas = None # [(timestamp, modo, JSON de la partida)]; se lee del disco la primera vez que hace falta
+        self._cerrojo = threading.Lock()
+        self._futuros = [] # Futures de los cambios que aún no están en disco
+        self._hilo = None
+
+    def _leer(self):
+        if not os.path.exists(self.ruta): return []
+        try:
+            with open(self.ruta, "r") as f:
+                content = f.read()
+                data = json.loads(content) if content else []
+        except Exception: return []
+        if isinstance(data, list): return [s for s in data if isinstance(s, dict) and 'timestamp' in s]
+        elif isinstance(data, dict): return [data] if 'timestamp' in data else [] # Formato antiguo: una sola partida
+        return []
+
+    @staticmethod
+    def _serializar(partida):
+        return json.dumps(partida, separators=(",", ":"))
+
+    def _lista(self):
+        if self._partidas is None:
+            self._partidas = [(p["timestamp"], p.get("mode"), self._serializar(p)) for p in self._leer()]
+        return self._partidas
+
+    def partidas(self):
+        """Copia de las partidas guardadas, de la más reciente a la más antigua."""
+        with self._cerrojo:
+            textos = [texto for _, _, texto in self._lista()]
+        return [json.loads(texto) for texto in textos]
+
+    def guardar(self, estado_juego, game_mode, timestamp_a_actualizar=None):
+        """
+        Guarda una partida (o actualiza la de 'timestamp_a_actualizar', si sigue guardada),
+        conservando las 'max_partidas' más recientes. Retorna un Future; si el estado no se
+        puede serializar, el Future ya trae el error y las partidas guardadas no cambian.
+        """
+        try: estado = self._serializar(estado_juego)
+        except (TypeError, ValueError) as e:
+            print(f"No se pudo guardar la partida: {e}")
+            futuro = Future(); futuro.set_exception(e)
+            return futuro
+        ahora = datetime.now().isoformat()
+        with self._cerrojo:
+            partidas = self._lista()
+            for i, (timestamp, modo, _) in enumerate(partidas if timestamp_a_actualizar else ()):
+                if timestamp == timestamp_a_actualizar:
+                    del partidas[i]; game_mode = modo; break # Se conserva el modo de la partida guardada
+            texto = '{"timestamp":%s,"mode":%s,"state":%s}' % (json.dumps(ahora), json.dumps(game_mode), estado)
+            partidas.append((ahora, game_mode, texto))
+            partidas.sort(key=lambda p: p[0], reverse=True)
+            del partidas[self.max_partidas:]
+            return self._programar_escritura()
+
+    def eliminar(self, timestamp_a_eliminar):
+        """Borra la partida con ese timestamp. Retorna un Future."""
+        with self._cerrojo:
+            self._partidas = [p for p in self._lista() if p[0] != timestamp_a_eliminar]
+            return self._programar_escritura()
+
+    def esperar(self, timeout=None):
+        """Espera a que todos los cambios hechos hasta ahora estén en disco."""
+        with self._cerrojo:
+            hilo = self._hilo
+        if hilo is not None: hilo.join(timeout)
+
+    def _programar_escritura(self):
+        # Se llama con el cerrojo tomado
+        futuro = Future()
+        self._futuros.append(futuro)
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self._escribir_pendientes, name="SaveService")
+            self._hilo.start()
+        return futuro
+
+    def _escribir_pendientes(self):
+        while True:
+            with self._cerrojo:
+                futuros, self._futuros = self._futuros, []
+                if not futuros:
+                    self._hilo = None; return
+                datos = "[" + ",".join(texto for _, _, texto in self._partidas) + "]"
+            try:
+                self._escribir_atomico(datos)
+            except OSError as e:
+                print(f"No se pudo guardar la partida: {e}")
+                for futuro in futuros: futuro.set_exception(e)
+            else:
+                for futuro in futuros: futuro.set_result(self.ruta)
+
+    def _escribir_atomico(self, datos):
+        directorio = os.path.dirname(os.path.abspath(self.ruta))
+        descriptor, temporal = tempfile.mkstemp(prefix=".partida_", suffix=".tmp", dir=directorio)
+        try:
+            with os.fdopen(descriptor, "w") as f:
+                f.write(datos); f.flush(); os.fsync(f.fileno())
+            os.replace(temporal, self.ruta)
+        except OSError:
+            try: os.remove(temporal)
+            except OSError: pass
+            raise
+        try: # Que el cambio de nombre también sobreviva a un corte (no disponible en Windows)
+            descriptor_dir = os.open(directorio, os.O_RDONLY)
+            try: os.fsync(descriptor_dir)
+            finally: os.close(descriptor_dir)
+        except (OSError, AttributeError): pass
@@ -8,6 +8,7 @@ class ScoreManager:
         self.fallos = 0
         self.racha_actual = 0
         self.is_double_score_active = is_double_score_active # Estado inicial de doble puntuación
+        self.por_tecla = {} # letra -> {"aciertos", "fallos", "reaccion_total", "reacciones"}
 
     def add_score(self):
         """Añade puntos al marcador, considerando el power-up de doble puntuación.
@@ -29,6 +30,20 @@ class ScoreManager:
             self.fallos += 1
         self.racha_actual = 0 # La racha siempre se rompe con un fallo, incluso si es absorbido
 
+    def registrar_tecla(self, letra, acierto, reaccion=None):
+        """Anota un acierto o fallo de 'letra' y, si se conoce, el tiempo de reacción (segundos)."""
+        datos = self.por_tecla.get(letra)
+        if datos is None:
+            datos = self.por_tecla[letra] = {"aciertos": 0, "fallos": 0, "reaccion_total": 0.0, "reacciones": 0}
+        datos["aciertos" if acierto else "fallos"] += 1
+        if reaccion is not None:
+            datos["reaccion_total"] += reaccion; datos["reacciones"] += 1
+
+    def get_reaccion_media(self, letra):
+        """Retorna el tiempo de reacción medio de 'letra' en segundos, o None si no hay datos."""
+        datos = self.por_tecla.get(letra)
+        return datos["reaccion_total"] / datos["reacciones"] if datos and datos["reacciones"] else None
+
     def activate_double_score(self):
         """Activa el modo de doble puntuación."""
         self.is_double_score_active = True
@@ -60,7 +75,8 @@ class ScoreManager:
             "aciertos": self.aciertos,
             "fallos": self.fallos,
             "racha_actual": self.racha_actual,
-            "is_double_score_active": self.is_double_score_active
+            "is_double_score_active": self.is_double_score_active,
+            "por_tecla": self.por_tecla
         }
 
     @classmethod
@@ -71,4 +87,5 @@ class ScoreManager:
         manager.aciertos = data.get("aciertos", 0)
         manager.fallos = data.get("fallos", 0)
         manager.racha_actual = data.get("racha_actual", 0)
+        manager.por_tecla = {letra: dict(datos) for letra, datos in data.get("por_tecla", {}).items()}
         return manager
\ No newline at end of file
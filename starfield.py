@@ -0,0 +1,77 @@
+# starfield.py
+
+import random
+import pygame
+
+try:
+    import numpy
+except ImportError: # NumPy es opcional: sin él se actualiza estrella por estrella
+    numpy = None
+
+# Capa por defecto: equivale al campo original de 100 estrellas de radio 2
+CAPAS_POR_DEFECTO = [{"cantidad": 100, "vel_min": 0.5, "vel_max": 1.5, "radio": 2, "color": (255, 255, 255)}]
+
+class _CapaEstrellas:
+    """ Una capa de parallax: posiciones y velocidades en arrays contiguos y un sprite compartido. """
+    def __init__(self, ancho, alto, cantidad, vel_min, vel_max, radio, color, rng):
+        self.ancho, self.alto = ancho, alto
+        self.radio = radio
+        self.rng = rng
+        self.sprite = pygame.Surface((radio * 2, radio * 2), pygame.SRCALPHA)
+        pygame.draw.circle(self.sprite, color, (radio, radio), radio)
+        if numpy is not None:
+            self.x = rng.integers(0, ancho, size=cantidad, endpoint=True).astype(numpy.float64)
+            self.y = rng.integers(0, alto, size=cantidad, endpoint=True).astype(numpy.float64)
+            self.vel = rng.uniform(vel_min, vel_max, size=cantidad)
+        else:
+            self.x = [float(random.randint(0, ancho)) for _ in range(cantidad)]
+            self.y = [float(random.randint(0, alto)) for _ in range(cantidad)]
+            self.vel = [random.uniform(vel_min, vel_max) for _ in range(cantidad)]
+
+    def actualizar(self, velocidad):
+        if numpy is not None:
+            self.y += self.vel * velocidad
+            salieron = self.y > self.alto
+            n = int(numpy.count_nonzero(salieron))
+            if n:
+                self.x[salieron] = self.rng.integers(0, self.ancho, size=n, endpoint=True)
+                self.y[salieron] = 0
+            return
+        for i, vel in enumerate(self.vel):
+            self.y[i] += vel * velocidad
+            if self.y[i] > self.alto:
+                self.x[i] = float(random.randint(0, self.ancho)); self.y[i] = 0.0
+
+    def secuencia_blits(self):
+        """Lista (sprite, posición) lista para Surface.blits, con la esquina del sprite en (x - r, y - r)."""
+        r = self.radio
+        if numpy is not None:
+            posiciones = numpy.stack((self.x.astype(numpy.int64) - r, self.y.astype(numpy.int64) - r), axis=1).tolist()
+        else:
+            posiciones = [(int(x) - r, int(y) - r) for x, y in zip(self.x, self.y)]
+        sprite = self.sprite
+        return [(sprite, pos) for pos in posiciones]
+
+
+class Starfield:
+    """
+    Campo de estrellas con una o varias capas de parallax.
+    Cada capa actualiza todas sus estrellas en un solo paso vectorizado y se dibuja
+    con un único Surface.blits de su sprite pre-renderizado.
+    """
+    def __init__(self, ancho, alto, capas=None, seed=None):
+        rng = numpy.random.default_rng(seed) if numpy is not None else None
+        self.capas = [_CapaEstrellas(ancho, alto, c["cantidad"], c["vel_min"], c["vel_max"], c.get("radio", 2),
+                                     c.get("color", (255, 255, 255)), rng)
+                      for c in (capas or CAPAS_POR_DEFECTO)]
+
+    def actualizar(self, velocidad=1):
+        for capa in self.capas:
+            capa.actualizar(velocidad)
+
+    def dibujar(self, destino):
+        """Dibuja todas las capas sobre 'destino' y retorna los rects afectados."""
+        rects = []
+        for capa in self.capas:
+            rects.extend(destino.blits(capa.secuencia_blits()))
+        return rects
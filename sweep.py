@@ -0,0 +1,121 @@
+# sweep.py
+"""
+Barrido de dificultad sin pantalla: juega muchas partidas simuladas (ver headless.py) para
+cada combinación de curva de niveles, duraciones de power-ups y perfil de jugador, repartidas
+en lotes entre todos los núcleos, y escribe un CSV con los agregados de cada combinación.
+
+    python sweep.py --grid grid.json --sesiones 500 --salida barrido.csv
+
+El archivo de la rejilla es un JSON con tres diccionarios de variantes con nombre (si falta
+alguno se usa sólo la configuración actual del juego):
+
+    {"curvas":   {"suave": {"1": {"threshold": 0, "speed": 3.0}, "2": {"threshold": 40, "speed": 3.5}}},
+     "powerups": {"cortos": {"ralentizar": 6, "escudo": 6, "doble_puntuacion": 3}},
+     "perfiles": {"novato": {"reaccion_media": 0.7, "reaccion_desv": 0.2, "precision": 0.85}}}
+"""
+
+import argparse
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from game_session import GameSession
+from headless import BotMecanografo, simular_sesion, OPCIONES_ARCANE, OPCIONES_VERSUS
+
+PERFILES_POR_DEFECTO = {
+    "novato": {"reaccion_media": 0.70, "reaccion_desv": 0.20, "precision": 0.85},
+    "medio": {"reaccion_media": 0.45, "reaccion_desv": 0.12, "precision": 0.93},
+    "experto": {"reaccion_media": 0.28, "reaccion_desv": 0.06, "precision": 0.98},
+}
+
+COLUMNAS = ["curva", "powerups", "perfil", "sesiones",
+            "duracion_media", "duracion_p50", "duracion_p90",
+            "nivel_medio", "frac_nivel_maximo",
+            "fallos_medio", "fallos_p10", "fallos_p50", "fallos_p90",
+            "puntaje_medio"] + [f"uptime_{tipo}" for tipo in GameSession.DURACIONES_POWERUP]
+
+def _percentil(valores_ordenados, p):
+    if not valores_ordenados: return 0
+    return valores_ordenados[min(len(valores_ordenados) - 1, int(p * len(valores_ordenados)))]
+
+def _correr_lote(lote):
+    """
+    Trabajo de un proceso: juega las sesiones de un lote de semillas para una combinación.
+    Retorna (índice de la combinación, lista de (duración, nivel, fallos, puntaje, uptime por tipo)).
+    """
+    indice, opciones, perfil, semillas, max_tiempo = lote
+    resultados = []
+    for semilla in semillas:
+        bot = BotMecanografo(seed=semilla, **perfil)
+        r = simular_sesion(opciones, bot, max_tiempo=max_tiempo, seed=semilla)
+        jugadores = r["jugadores"].values()
+        resultados.append((r["tiempo_sim"], r["nivel"], sum(j["fallos"] for j in jugadores),
+                           sum(j["score"] for j in jugadores), r["uptime_powerups"]))
+    return indice, resultados
+
+def _agregar(combinacion, resultados):
+    nombre_curva, nombre_pu, nombre_perfil, opciones = combinacion
+    n = len(resultados)
+    duraciones = sorted(r[0] for r in resultados)
+    fallos = sorted(r[2] for r in resultados)
+    nivel_maximo = max(int(k) for k in opciones["level_data"])
+    fila = {"curva": nombre_curva, "powerups": nombre_pu, "perfil": nombre_perfil, "sesiones": n,
+            "duracion_media": sum(duraciones) / n, "duracion_p50": _percentil(duraciones, 0.5), "duracion_p90": _percentil(duraciones, 0.9),
+            "nivel_medio": sum(r[1] for r in resultados) / n,
+            "frac_nivel_maximo": sum(1 for r in resultados if r[1] >= nivel_maximo) / n,
+            "fallos_medio": sum(fallos) / n, "fallos_p10": _percentil(fallos, 0.1),
+            "fallos_p50": _percentil(fallos, 0.5), "fallos_p90": _percentil(fallos, 0.9),
+            "puntaje_medio": sum(r[3] for r in resultados) / n}
+    # Fracción del tiempo de partida con cada power-up activo
+    tiempo_total = sum(duraciones) or 1
+    for tipo in GameSession.DURACIONES_POWERUP:
+        fila[f"uptime_{tipo}"] = sum(r[4].get(tipo, 0) for r in resultados) / tiempo_total
+    return fila
+
+def barrer(curvas, powerups, perfiles, sesiones, modo="arcane", procesos=None, tam_lote=50, max_tiempo=600.0, semilla=0):
+    """
+    Juega 'sesiones' partidas por cada combinación curva x power-ups x perfil y retorna
+    una fila de agregados por combinación (en el orden de COLUMNAS).
+    """
+    base = OPCIONES_ARCANE if modo == "arcane" else OPCIONES_VERSUS
+    combinaciones = [(nc, npu, np_, {**base, "level_data": curva, "powerup_durations": duraciones})
+                     for nc, curva in curvas.items() for npu, duraciones in powerups.items() for np_ in perfiles]
+    # Todas las combinaciones usan las mismas semillas: las diferencias vienen de los parámetros, no del azar
+    lotes = [(i, opciones, perfiles[np_], range(inicio, min(inicio + tam_lote, semilla + sesiones)), max_tiempo)
+             for i, (_, _, np_, opciones) in enumerate(combinaciones)
+             for inicio in range(semilla, semilla + sesiones, tam_lote)]
+
+    resultados = [[] for _ in combinaciones]
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        for indice, parcial in pool.map(_correr_lote, lotes):
+            resultados[indice].extend(parcial)
+    return [_agregar(c, r) for c, r in zip(combinaciones, resultados)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Barrido de curvas de dificultad con partidas simuladas.")
+    parser.add_argument("--grid", help="JSON con las variantes 'curvas', 'powerups' y 'perfiles'")
+    parser.add_argument("--sesiones", type=int, default=200, help="Partidas por combinación")
+    parser.add_argument("--modo", choices=["arcane", "versus"], default="arcane")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos (por defecto, todos los núcleos)")
+    parser.add_argument("--lote", type=int, default=50, help="Partidas por tarea enviada a cada proceso")
+    parser.add_argument("--max-tiempo", type=float, default=600.0, help="Tope de segundos simulados por partida")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", default="barrido.csv")
+    args = parser.parse_args()
+
+    grid = {}
+    if args.grid:
+        with open(args.grid) as f: grid = json.load(f)
+    curvas = grid.get("curvas") or {"actual": GameSession.NIVELES_POR_DEFECTO}
+    powerups = grid.get("powerups") or {"actual": GameSession.DURACIONES_POWERUP}
+    perfiles = grid.get("perfiles") or PERFILES_POR_DEFECTO
+
+    filas = barrer(curvas, powerups, perfiles, args.sesiones, args.modo, args.procesos, args.lote, args.max_tiempo, args.semilla)
+    with open(args.salida, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNAS)
+        writer.writeheader(); writer.writerows(filas)
+    print(f"{len(filas)} combinaciones x {args.sesiones} partidas -> {args.salida} ({args.procesos or os.cpu_count()} procesos)")
+
+if __name__ == "__main__":
+    main()
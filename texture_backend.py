@@ -0,0 +1,92 @@
+# texture_backend.py
+
+import weakref
+import pygame
+
+try:
+    from pygame._sdl2.video import Window, Renderer, Texture
+except ImportError: # pygame sin _sdl2: sólo queda el backend de superficies
+    Window = Renderer = Texture = None
+
+class BackendTexturas:
+    """
+    Presentación sobre pygame._sdl2.video (Window/Renderer/Texture).
+    La pantalla dibujada por software se sube a una textura de streaming (sólo las zonas
+    que cambiaron) y las superficies estáticas se suben una sola vez como texturas, de modo
+    que cada frame es una lista de copias de texturas hechas por el Renderer.
+    Con software=True usa el renderer por software de SDL (sirve con SDL_VIDEODRIVER=dummy).
+    """
+    def __init__(self, titulo, tam_ventana, tam_logico, software=False):
+        if Renderer is None:
+            raise pygame.error("pygame._sdl2.video no está disponible")
+        self.window = Window(titulo, size=tam_ventana)
+        self.renderer = Renderer(self.window, accelerated=0 if software else -1)
+        self.renderer.logical_size = tam_logico # SDL escala el frame y también las coordenadas del ratón
+        self.renderer.draw_color = (0, 0, 0, 255)
+        self.tam_logico = tam_logico
+        self._lienzo = Texture(self.renderer, tam_logico, streaming=True)
+        self._texturas = weakref.WeakKeyDictionary() # Surface -> Texture
+        self._vistas = weakref.WeakKeyDictionary()   # Surfaces blitteadas una vez (candidatas a textura)
+        self._ultimas_copias = []
+
+    def textura(self, superficie):
+        """Retorna la textura de 'superficie', subiéndola sólo la primera vez."""
+        tex = self._texturas.get(superficie)
+        if tex is None:
+            tex = self._texturas[superficie] = Texture.from_surface(self.renderer, superficie)
+        return tex
+
+    def precargar(self, superficies):
+        """Sube de antemano superficies que se sabe que son estáticas (fondos, iconos, glifos)."""
+        for superficie in superficies:
+            self.textura(superficie)
+
+    def textura_reutilizada(self, superficie):
+        """
+        Retorna la textura de 'superficie' si ya existe o si es la segunda vez que se ve.
+        Las superficies que se crean en cada frame (textos del HUD) nunca se ven dos veces,
+        así que siguen dibujándose por software en vez de subirse una y otra vez.
+        """
+        tex = self._texturas.get(superficie)
+        if tex is not None:
+            return tex
+        if superficie in self._vistas:
+            del self._vistas[superficie]
+            return self.textura(superficie)
+        self._vistas[superficie] = True
+        return None
+
+    def actualizar_lienzo(self, superficie, rects=None):
+        """Copia 'superficie' (entera o sólo 'rects') a la textura de la pantalla."""
+        if rects is None:
+            self._lienzo.update(superficie)
+            return
+        limites = superficie.get_rect()
+        for rect in rects:
+            rect = rect.clip(limites)
+            if rect.width and rect.height:
+                self._lienzo.update(superficie.subsurface(rect), rect)
+
+    def _componer(self, copias):
+        self.renderer.clear()
+        self._lienzo.draw()
+        for tex, rect in copias:
+            tex.draw(dstrect=rect)
+
+    def presentar_frame(self, copias=()):
+        """Dibuja la textura de la pantalla y encima las copias (textura, rect destino)."""
+        self._componer(copias)
+        self.renderer.present()
+        self._ultimas_copias = copias
+
+    def presentar_superficie(self, superficie, rects=None):
+        self.actualizar_lienzo(superficie, rects)
+        self.presentar_frame()
+
+    def capturar(self):
+        """Retorna una superficie del tamaño lógico con el último frame presentado."""
+        self._componer(self._ultimas_copias) # Tras present() el contenido del backbuffer no está definido
+        captura = self.renderer.to_surface()
+        if captura.get_size() != tuple(self.tam_logico):
+            captura = pygame.transform.scale(captura, self.tam_logico)
+        return captura
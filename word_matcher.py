@@ -0,0 +1,98 @@
+# word_matcher.py
+
+class _Nodo:
+    __slots__ = ("hijos", "objetivos", "terminales")
+    def __init__(self):
+        self.hijos = {}      # carácter -> _Nodo
+        self.objetivos = {}  # claves de los objetivos que pasan por este nodo, en orden de llegada
+        self.terminales = {} # claves de los objetivos que terminan aquí, en orden de llegada
+
+
+class MultiTargetMatcher:
+    """
+    Emparejador incremental de lo que se escribe contra todos los objetivos en pantalla
+    (palabras, n-gramas o letras), organizado como un trie de los objetivos activos.
+    Lo escrito hasta ahora es un prefijo común a todos los candidatos, así que un único cursor
+    (el nodo del trie de ese prefijo) sigue a la vez el avance de todos ellos: cada tecla es
+    una búsqueda en un diccionario, O(1). Añadir o quitar un objetivo cuesta O(longitud).
+    Empates: en cuanto lo escrito completa un objetivo, se lo lleva el más antiguo de los que
+    son exactamente ese texto (aunque haya objetivos más largos con el mismo prefijo).
+    Quien lo usa añade cada objetivo al aparecer y lo quita al desaparecer, también al completarlo.
+    """
+    COMPLETO, AVANCE, FALLO = "completo", "avance", "fallo"
+
+    def __init__(self):
+        self._raiz = _Nodo()
+        self._textos = {} # clave -> texto
+        self._cursor = self._raiz
+        self._escrito = ""
+
+    def __len__(self):
+        return len(self._textos)
+
+    def __contains__(self, clave):
+        return clave in self._textos
+
+    @property
+    def escrito(self):
+        """Prefijo escrito hasta ahora ("" si no hay ningún objetivo a medias)."""
+        return self._escrito
+
+    def agregar(self, clave, texto):
+        self._textos[clave] = texto
+        nodo = self._raiz
+        for char in texto:
+            nodo = nodo.hijos.setdefault(char, _Nodo())
+            nodo.objetivos[clave] = None
+        nodo.terminales[clave] = None
+
+    def quitar(self, clave):
+        texto = self._textos.pop(clave, None)
+        if texto is None: return
+        if self._cursor.objetivos.keys() == {clave}:
+            self.reiniciar() # Era el único candidato de lo escrito
+        nodo = self._raiz
+        for char in texto:
+            hijo = nodo.hijos[char]
+            del hijo.objetivos[clave]
+            if not hijo.objetivos: # Ya nadie pasa por aquí: se poda la rama
+                del nodo.hijos[char]; break
+            nodo = hijo
+        else:
+            del nodo.terminales[clave]
+
+    def reiniciar(self):
+        """Descarta lo escrito (los objetivos no cambian)."""
+        self._cursor = self._raiz; self._escrito = ""
+
+    def limpiar(self):
+        self._raiz = _Nodo(); self._textos.clear(); self.reiniciar()
+
+    def candidato(self):
+        """El objetivo más antiguo de los que empiezan por lo escrito, o None si no se ha escrito nada."""
+        return next(iter(self._cursor.objetivos)) if self._cursor is not self._raiz else None
+
+    def candidatos(self):
+        """Claves de los objetivos que empiezan por lo escrito, del más antiguo al más nuevo."""
+        return list(self._cursor.objetivos) if self._cursor is not self._raiz else []
+
+    def progreso(self, clave):
+        """Caracteres ya escritos de 'clave' (0 si no es candidato), para resaltarlos en pantalla."""
+        return len(self._escrito) if self._cursor is not self._raiz and clave in self._cursor.objetivos else 0
+
+    def pulsar(self, char):
+        """
+        Avanza el cursor con 'char'. Retorna (resultado, clave):
+        - (COMPLETO, clave): lo escrito completa 'clave' y el cursor vuelve a la raíz;
+        - (AVANCE, None): 'char' continúa al menos un objetivo;
+        - (FALLO, None): 'char' no continúa ninguno; el cursor vuelve a la raíz.
+        """
+        siguiente = self._cursor.hijos.get(char)
+        if siguiente is None:
+            self.reiniciar()
+            return self.FALLO, None
+        if siguiente.terminales:
+            self.reiniciar()
+            return self.COMPLETO, next(iter(siguiente.terminales))
+        self._cursor = siguiente; self._escrito += char
+        return self.AVANCE, None